@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+# Teste de carga em processo das duas APIs: vários clientes concorrentes
+# (threads), cada um com seu cliente de teste do framework, sem rede.
+# Mede vazão (requisições/s) e latência p50/p95/p99 de cada rota.
+#
+# Uso:
+#   python Benchmarks/carga_apis.py --clientes 8 --requisicoes 4000 --saida carga.json
+#   python Benchmarks/carga_apis.py --bordo asgi     # versão assíncrona do serviço de bordo
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+
+from comum import gerar_voos, gravar_resultado, percentis, preparar_caminhos
+
+preparar_caminhos()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+# Voo criado só para o teste de pedidos: cabine cheia e estoque que não acaba,
+# para medir o caminho de sucesso (e as recusas do plano 'Básico') sem esgotar o carrinho.
+VOO_CARGA = "CARGA01"
+PLANOS_CARGA = ("Básico", "Básico", "Básico", "Safira", "Topázio", "Diamante")
+
+
+def medir_rota(nome, abrir_cliente, requisitar, clientes, total, esperados):
+    """
+    Dispara 'total' requisições divididas entre 'clientes' threads.
+    'abrir_cliente' cria o cliente de cada thread (um context manager) e
+    'requisitar(cliente, i)' faz a i-ésima requisição e devolve o código HTTP.
+    """
+    latencias = []
+    respostas = Counter()
+    trava = threading.Lock()
+    largada = threading.Barrier(clientes + 1)
+    por_cliente = max(1, total // clientes)
+
+    def trabalhar(indice):
+        locais, codigos = [], Counter()
+        with abrir_cliente() as cliente:
+            largada.wait()
+            for i in range(indice * por_cliente, (indice + 1) * por_cliente):
+                inicio = time.perf_counter_ns()
+                codigo = requisitar(cliente, i)
+                locais.append(time.perf_counter_ns() - inicio)
+                codigos[codigo] += 1
+        with trava:
+            latencias.extend(locais)
+            respostas.update(codigos)
+
+    threads = [threading.Thread(target=trabalhar, args=(i,)) for i in range(clientes)]
+    for thread in threads:
+        thread.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    metricas = {
+        "requisicoes": len(latencias),
+        "vazao_rps": round(len(latencias) / duracao, 1),
+        "media_ms": round(statistics.fmean(latencias) / 1e6, 4),
+        **percentis(latencias),
+        "erros": sum(n for codigo, n in respostas.items() if codigo not in esperados),
+    }
+    return {
+        "id": nome,
+        "nome": nome,
+        "clientes": clientes,
+        "metricas": metricas,
+        "respostas": {str(codigo): n for codigo, n in sorted(respostas.items())},
+    }
+
+
+class _ClienteFlask:
+    # Mesmo formato do TestClient: context manager que devolve o cliente.
+    def __init__(self, app):
+        self.app = app
+
+    def __enter__(self):
+        return self.app.test_client()
+
+    def __exit__(self, *erro):
+        return False
+
+
+def carga_status_voo(clientes, total, quantidade_voos, semente):
+    import API_Status_Voo as api
+
+    if quantidade_voos:
+        api.base_voos.carregar(gerar_voos(quantidade_voos, semente))
+    codigos = [registro.codigo for registro in api.base_voos]
+    sorteio = random.Random(semente)
+    sorteados = [sorteio.choice(codigos) for _ in range(total)]
+
+    def abrir():
+        return TestClient(api.app)
+
+    etag = TestClient(api.app).get("/status/all").headers["etag"]
+    return [
+        medir_rota("GET /status/all", abrir,
+                   lambda c, i: c.get("/status/all").status_code,
+                   clientes, total, {200}),
+        medir_rota("GET /status/all (If-None-Match)", abrir,
+                   lambda c, i: c.get("/status/all", headers={"If-None-Match": etag}).status_code,
+                   clientes, total, {200, 304}),
+        medir_rota("GET /status/{codigo_voo}", abrir,
+                   lambda c, i: c.get(f"/status/{sorteados[i]}").status_code,
+                   clientes, total, {200}),
+    ]
+
+
+def carga_servico_bordo(clientes, total, versao, semente):
+    if versao == "asgi":
+        import API_Servico_de_Bordo_ASGI as api
+
+        def abrir():
+            return TestClient(api.app)
+    else:
+        import API_Servico_de_Bordo as api
+
+        def abrir():
+            return _ClienteFlask(api.app)
+
+    from dados_bordo import ARMAZENAMENTO, ASSENTOS, SNACKS
+
+    assentos = {numero: {"Status": PLANOS_CARGA[numero % len(PLANOS_CARGA)], "Pedidos": 0} for numero in range(1, 301)}
+    if ARMAZENAMENTO.voo(VOO_CARGA) is None:
+        ARMAZENAMENTO.criar_voo(VOO_CARGA, assentos, {snack_id: 10 ** 9 for snack_id in SNACKS})
+    sorteio = random.Random(semente)
+    pedidos = [{"assento_id": sorteio.choice(list(assentos)), "snack_id": sorteio.choice(list(SNACKS))}
+               for _ in range(total)]
+    pedidos_padrao = [{"assento_id": sorteio.choice(list(ASSENTOS)), "snack_id": sorteio.choice(list(SNACKS))}
+                      for _ in range(total)]
+
+    return [
+        medir_rota("GET /api/assentos", abrir,
+                   lambda c, i: c.get("/api/assentos").status_code,
+                   clientes, total, {200}),
+        # Rota por voo, no voo de carga: mede o caminho de sucesso (e as recusas do 'Básico').
+        medir_rota("POST /api/voos/{codigo_voo}/pedido", abrir,
+                   lambda c, i: c.post(f"/api/voos/{VOO_CARGA}/pedido", json=pedidos[i]).status_code,
+                   clientes, total, {200, 403}),
+        # Rota original, no voo padrão (9 assentos, estoque real): depois das primeiras
+        # vendas, mede sobretudo as recusas (plano 'Básico' e snack esgotado).
+        medir_rota("POST /api/pedido", abrir,
+                   lambda c, i: c.post("/api/pedido", json=pedidos_padrao[i]).status_code,
+                   clientes, total, {200, 403, 409}),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga em processo das APIs.")
+    parser.add_argument("--clientes", type=int, default=8, help="Clientes concorrentes (threads).")
+    parser.add_argument("--requisicoes", type=int, default=4000, help="Requisições por rota.")
+    parser.add_argument("--voos", type=int, default=0,
+                        help="Voos sintéticos adicionados à base de Status de Voo (padrão: só os voos fixos).")
+    parser.add_argument("--bordo", choices=("flask", "asgi"), default="flask",
+                        help="Versão da API do serviço de bordo a testar.")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: imprime na tela).")
+    args = parser.parse_args()
+
+    resultados = carga_status_voo(args.clientes, args.requisicoes, args.voos, args.semente)
+    resultados += carga_servico_bordo(args.clientes, args.requisicoes, args.bordo, args.semente)
+    gravar_resultado(
+        "carga_apis",
+        {"clientes": args.clientes, "requisicoes": args.requisicoes, "voos": args.voos,
+         "bordo": args.bordo, "semente": args.semente},
+        resultados,
+        args.saida,
+    )
+
+
+if __name__ == "__main__":
+    main()
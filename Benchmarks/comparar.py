@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# Compara duas execuções da suíte (JSON de micro_status_voo.py ou carga_apis.py)
+# e aponta regressões acima da tolerância. Sai com código 1 se houver alguma,
+# para poder barrar uma atualização no CI.
+#
+# Uso:
+#   python Benchmarks/comparar.py base.json atual.json --tolerancia 0.15
+
+import argparse
+import json
+import sys
+
+# Métricas em que maior é melhor; nas demais (tempos e latências), menor é melhor.
+MAIOR_MELHOR = ("vazao_rps",)
+# Métricas comparadas; contagens (requisições, chamadas) só descrevem a execução.
+COMPARADAS = ("melhor_ns", "mediana_ns", "vazao_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def carregar(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def metricas_por_id(documento):
+    return {resultado["id"]: resultado["metricas"] for resultado in documento["resultados"]}
+
+
+def variacao(metrica, antes, depois):
+    """
+    Piora relativa (positiva = pior), já considerando o sentido da métrica.
+    """
+    if not antes:
+        return 0.0
+    if metrica in MAIOR_MELHOR:
+        return (antes - depois) / antes
+    return (depois - antes) / antes
+
+
+def comparar(base, atual, tolerancia):
+    linhas, regressoes = [], []
+    for id_resultado in sorted(base.keys() & atual.keys()):
+        for metrica in COMPARADAS:
+            if metrica not in base[id_resultado] or metrica not in atual[id_resultado]:
+                continue
+            antes, depois = base[id_resultado][metrica], atual[id_resultado][metrica]
+            piora = variacao(metrica, antes, depois)
+            marca = "REGRESSÃO" if piora > tolerancia else ""
+            linhas.append(f"{id_resultado:45} {metrica:11} {antes:>14} {depois:>14} {piora:+8.1%} {marca}")
+            if marca:
+                regressoes.append((id_resultado, metrica, piora))
+    return linhas, regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dois resultados da suíte de benchmarks.")
+    parser.add_argument("base")
+    parser.add_argument("atual")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Piora relativa aceita antes de acusar regressão (padrão: 0.10 = 10%%).")
+    args = parser.parse_args()
+
+    documento_base, documento_atual = carregar(args.base), carregar(args.atual)
+    # Resultados só são comparáveis com os mesmos parâmetros (tamanhos, clientes, versão da API...).
+    if documento_base["parametros"] != documento_atual["parametros"]:
+        print(f"Atenção: parâmetros diferentes: {documento_base['parametros']} x {documento_atual['parametros']}\n")
+
+    base, atual = metricas_por_id(documento_base), metricas_por_id(documento_atual)
+    linhas, regressoes = comparar(base, atual, args.tolerancia)
+    print("\n".join(linhas))
+    for id_resultado in sorted(base.keys() ^ atual.keys()):
+        print(f"{id_resultado}: presente em apenas um dos arquivos")
+
+    if regressoes:
+        print(f"\n{len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Utilitários comuns da suíte de benchmarks: caminhos das duas APIs,
+# estatísticas de latência, voos sintéticos e gravação do resultado em JSON.
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_STATUS_VOO = os.path.join(RAIZ, "Status Voo", "API")
+DIRETORIO_SERVICO_BORDO = os.path.join(RAIZ, "Serviço de Bordo", "API")
+DIRETORIO_FERRAMENTAS = os.path.join(RAIZ, "Ferramentas")
+DIRETORIO_COMPARTILHADO = os.path.join(RAIZ, "Compartilhado")
+
+
+def preparar_caminhos():
+    """
+    Torna os módulos das duas APIs (que se importam como vizinhos), os módulos
+    comuns a elas e o gerador de dados sintéticos importáveis.
+    """
+    for diretorio in (DIRETORIO_STATUS_VOO, DIRETORIO_SERVICO_BORDO, DIRETORIO_COMPARTILHADO, DIRETORIO_FERRAMENTAS):
+        if diretorio not in sys.path:
+            sys.path.insert(0, diretorio)
+
+
+def ambiente():
+    """
+    Dados da máquina e da versão do código, para saber o que está sendo comparado.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processadores": os.cpu_count(),
+        "commit": commit,
+        "horario": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def percentis(latencias_ns):
+    """
+    p50/p95/p99 (em milissegundos) de uma lista de latências em nanossegundos.
+    """
+    if len(latencias_ns) < 2:
+        valor = latencias_ns[0] / 1e6 if latencias_ns else 0.0
+        return {"p50_ms": valor, "p95_ms": valor, "p99_ms": valor}
+    cortes = statistics.quantiles(latencias_ns, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cortes[49] / 1e6, 4),
+        "p95_ms": round(cortes[94] / 1e6, 4),
+        "p99_ms": round(cortes[98] / 1e6, 4),
+    }
+
+
+def gerar_voos(quantidade, semente=42):
+    """
+    Lista de voos sintéticos no formato de 'voos' da API de Status de Voo,
+    gerada por Ferramentas/gerar_dados.py (a mesma semente gera sempre os mesmos voos).
+    """
+    from gerar_dados import gerar_voos as gerar_escala
+
+    return list(gerar_escala(quantidade, semente))
+
+
+def gravar_resultado(suite, parametros, resultados, caminho=None):
+    """
+    Monta o documento JSON da execução e grava em 'caminho' (ou imprime).
+    Cada resultado tem um 'id' estável, usado por comparar.py.
+    """
+    documento = {
+        "suite": suite,
+        "ambiente": ambiente(),
+        "parametros": parametros,
+        "resultados": resultados,
+    }
+    texto = json.dumps(documento, ensure_ascii=False, indent=2)
+    if caminho:
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+    else:
+        print(texto)
+    return documento
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Micro-benchmarks das funções de lógica da API de Status de Voo
+# (det_status, encontrar e converter) sobre bases sintéticas de voos.
+#
+# Uso:
+#   python Benchmarks/micro_status_voo.py --voos 10000 100000 --saida micro.json
+
+import argparse
+import random
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from comum import gerar_voos, gravar_resultado, preparar_caminhos
+
+preparar_caminhos()
+
+import API_Status_Voo as api  # noqa: E402
+from base_voos import BaseVoos  # noqa: E402
+from motor_status import MotorStatus  # noqa: E402
+
+# Instante fixo: o mesmo "agora" em todas as execuções, para resultados comparáveis.
+AGORA = datetime(2025, 10, 20, 14, 30, tzinfo=ZoneInfo("America/Sao_Paulo"))
+
+
+def medir(funcao, entradas, repeticoes):
+    """
+    Executa 'funcao' sobre todas as entradas, 'repeticoes' vezes.
+    Retorna o melhor e o mediano tempo por chamada, em nanossegundos.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter_ns()
+        for entrada in entradas:
+            funcao(entrada)
+        tempos.append((time.perf_counter_ns() - inicio) / len(entradas))
+    tempos.sort()
+    return {
+        "melhor_ns": round(tempos[0], 1),
+        "mediana_ns": round(tempos[len(tempos) // 2], 1),
+        "chamadas": len(entradas),
+    }
+
+
+def executar(tamanhos, repeticoes, semente):
+    resultados = []
+    base_original = api.base_voos
+    try:
+        for quantidade in tamanhos:
+            voos = gerar_voos(quantidade, semente)
+            base = BaseVoos(voos)
+            # encontrar() consulta a base global do módulo da API.
+            api.base_voos = base
+            registros = list(base)
+
+            # Metade dos códigos existe, metade não (caminho do 404).
+            sorteio = random.Random(semente)
+            codigos = [sorteio.choice(voos)["codigo_voo"] if i % 2 else f"XX{i:06d}" for i in range(quantidade)]
+            horas = [voo["partida_programada"] for voo in voos]
+
+            # Sem 'agora', det_status() lê o relógio da API a cada chamada.
+            casos = [
+                ("converter", api.converter, horas),
+                ("encontrar", api.encontrar, codigos),
+                ("det_status(dict)", api.det_status, voos),
+                ("det_status(registro)", api.det_status, registros),
+            ]
+            for nome, funcao, entradas in casos:
+                metricas = medir(funcao, entradas, repeticoes)
+                resultados.append({"id": f"{nome}@{quantidade}", "nome": nome, "voos": quantidade, "metricas": metricas})
+
+            # Referência: o cálculo vetorizado usado por /status/all (uma chamada para todos os voos).
+            motor = MotorStatus(base)
+            colunas = motor.colunas()
+            metricas = medir(lambda _: motor.calcular(AGORA, colunas), [None], repeticoes)
+            metricas["melhor_ns"] = round(metricas["melhor_ns"] / quantidade, 1)
+            metricas["mediana_ns"] = round(metricas["mediana_ns"] / quantidade, 1)
+            metricas["chamadas"] = quantidade
+            resultados.append({"id": f"MotorStatus.calcular@{quantidade}", "nome": "MotorStatus.calcular",
+                               "voos": quantidade, "metricas": metricas})
+    finally:
+        api.base_voos = base_original
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks da API de Status de Voo.")
+    parser.add_argument("--voos", type=int, nargs="+", default=[10_000, 100_000],
+                        help="Tamanhos das bases sintéticas (padrão: 10000 100000).")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: imprime na tela).")
+    args = parser.parse_args()
+
+    resultados = executar(args.voos, args.repeticoes, args.semente)
+    gravar_resultado(
+        "micro_status_voo",
+        {"voos": args.voos, "repeticoes": args.repeticoes, "semente": args.semente},
+        resultados,
+        args.saida,
+    )
+
+
+if __name__ == "__main__":
+    main()
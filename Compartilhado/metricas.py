@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+# Métricas da API no formato texto do Prometheus (exposto em /metrics).
+# Implementação mínima, sem dependências: contadores e histogramas com rótulos,
+# cada métrica com sua própria trava. Registrar uma observação custa uma busca
+# binária no histograma e um incremento; a exportação só copia os números.
+# Os valores são por processo: com vários workers, cada um expõe os seus.
+# Módulo único, usado pelas duas APIs (Status de Voo e serviço de bordo).
+
+import bisect
+import threading
+import time
+
+# Limites padrão dos histogramas de latência, em segundos (de 50 µs a 10 s).
+LIMITES_PADRAO = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(nomes, valores, extra=""):
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Contador:
+    """
+    Contador monotônico, separado pelos valores dos rótulos.
+    """
+    tipo = "counter"
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        self._trava = threading.Lock()
+
+    def inc(self, *valores_rotulos, quantidade=1):
+        with self._trava:
+            self._valores[valores_rotulos] = self._valores.get(valores_rotulos, 0) + quantidade
+
+    def exportar(self):
+        with self._trava:
+            valores = list(self._valores.items())
+        return [f"{self.nome}{_rotulos(self.rotulos, chave)} {_numero(valor)}" for chave, valor in sorted(valores)]
+
+
+class _Cronometro:
+    __slots__ = ("histograma", "valores_rotulos", "inicio")
+
+    def __init__(self, histograma, valores_rotulos):
+        self.histograma = histograma
+        self.valores_rotulos = valores_rotulos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *erro):
+        self.histograma.observar(time.perf_counter() - self.inicio, *self.valores_rotulos)
+        return False
+
+
+class Histograma:
+    """
+    Histograma cumulativo (buckets 'le'), com soma e contagem por rótulos.
+    """
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, rotulos=(), limites=LIMITES_PADRAO):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self.limites = tuple(sorted(limites))
+        self._series = {}       # rótulos -> [contagens por bucket (+Inf no fim), soma]
+        self._trava = threading.Lock()
+
+    def observar(self, valor, *valores_rotulos):
+        indice = bisect.bisect_left(self.limites, valor)
+        with self._trava:
+            serie = self._series.get(valores_rotulos)
+            if serie is None:
+                serie = self._series[valores_rotulos] = [[0] * (len(self.limites) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def medir(self, *valores_rotulos):
+        """
+        Context manager que observa a duração do bloco, em segundos.
+        """
+        return _Cronometro(self, valores_rotulos)
+
+    def exportar(self):
+        with self._trava:
+            series = [(chave, list(contagens), soma) for chave, (contagens, soma) in self._series.items()]
+        linhas = []
+        for chave, contagens, soma in sorted(series):
+            acumulado = 0
+            for limite, contagem in zip(self.limites + (float("inf"),), contagens):
+                acumulado += contagem
+                le = "+Inf" if limite == float("inf") else _numero(limite)
+                extra = 'le="' + le + '"'
+                linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, chave, extra)} {acumulado}")
+            linhas.append(f"{self.nome}_sum{_rotulos(self.rotulos, chave)} {_numero(soma)}")
+            linhas.append(f"{self.nome}_count{_rotulos(self.rotulos, chave)} {acumulado}")
+        return linhas
+
+
+class ColetorMetricas:
+    """
+    Conjunto das métricas de um processo, exportado de uma vez em /metrics.
+    Pedir de novo uma métrica com o mesmo nome devolve a já existente.
+    """
+
+    def __init__(self):
+        self._metricas = {}
+        self._trava = threading.Lock()
+
+    def _obter(self, classe, nome, ajuda, rotulos, **opcoes):
+        with self._trava:
+            metrica = self._metricas.get(nome)
+            if metrica is None:
+                metrica = self._metricas[nome] = classe(nome, ajuda, rotulos, **opcoes)
+            return metrica
+
+    def contador(self, nome, ajuda, rotulos=()):
+        return self._obter(Contador, nome, ajuda, rotulos)
+
+    def histograma(self, nome, ajuda, rotulos=(), limites=LIMITES_PADRAO):
+        return self._obter(Histograma, nome, ajuda, rotulos, limites=limites)
+
+    def exportar(self):
+        with self._trava:
+            metricas = list(self._metricas.values())
+        linhas = []
+        for metrica in metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica.exportar())
+        return ("\n".join(linhas) + "\n").encode("utf-8")
+
+
+# Coletor único do processo, usado pelos módulos da API.
+METRICAS = ColetorMetricas()
+
+# Latência e contagem por rota, registradas pelo middleware (ou hook) de cada API.
+# A rota é o modelo declarado (ex.: /status/{codigo_voo}), não o caminho recebido,
+# para que o número de séries não cresça com cada código consultado.
+DURACAO_REQUISICAO = METRICAS.histograma(
+    "http_requisicao_duracao_segundos", "Latência das requisições, por método e rota.", ("metodo", "rota"))
+REQUISICOES = METRICAS.contador(
+    "http_requisicoes_total", "Requisições atendidas, por método, rota e código HTTP.", ("metodo", "rota", "codigo"))
+
+
+def registrar_requisicao(metodo, rota, codigo_http, duracao):
+    DURACAO_REQUISICAO.observar(duracao, metodo, rota or "desconhecida")
+    REQUISICOES.inc(metodo, rota or "desconhecida", str(codigo_http))
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+# Gerador determinístico de dados sintéticos em escala de frota:
+#   - voos (formato da lista 'voos' da API de Status de Voo): milhares de voos ao
+#     longo de vários dias, com atrasos (Adiado), cancelamentos e chegadas após a
+#     meia-noite;
+#   - cabines (formato do POST /api/voos do serviço de bordo): o mapa completo de
+#     assentos de cada aeronave, com a distribuição dos planos de fidelidade, e o
+#     estoque inicial do carrinho.
+# A saída é JSON Lines (um objeto por linha), gravada à medida que é gerada: o
+# gerador nunca mantém a frota inteira em memória. A mesma semente gera sempre
+# os mesmos arquivos.
+#
+# Uso:
+#   python Ferramentas/gerar_dados.py --voos 5000 --dias 7 --semente 42 \
+#       --saida-voos voos.jsonl --saida-cabines cabines.jsonl
+# Carregamento:
+#   STATUS_VOO_ARQUIVO_VOOS=voos.jsonl            (API de Status de Voo)
+#   SERVICO_BORDO_ARQUIVO_CABINES=cabines.jsonl   (API do serviço de bordo)
+#   STATUS_VOO_ARQUIVOS_MONITORADOS=voos.jsonl    (idem, reaplicado quando o arquivo muda)
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+# Fusos dos aeroportos: os mesmos da API de Status de Voo (Status Voo/API/base_voos.py).
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Status Voo", "API"))
+from base_voos import fuso_aeroporto
+
+# Aeroportos: (código, cidade, latitude, longitude, internacional?)
+AEROPORTOS = (
+    ("VCP", "Campinas", -23.01, -47.13, False),
+    ("GRU", "Guarulhos", -23.43, -46.47, False),
+    ("SDU", "Rio de Janeiro", -22.91, -43.16, False),
+    ("CNF", "Belo Horizonte", -19.62, -43.97, False),
+    ("BSB", "Brasília", -15.87, -47.92, False),
+    ("CWB", "Curitiba", -25.53, -49.18, False),
+    ("POA", "Porto Alegre", -29.99, -51.17, False),
+    ("FLN", "Florianópolis", -27.67, -48.55, False),
+    ("GYN", "Goiânia", -16.63, -49.22, False),
+    ("SSA", "Salvador", -12.91, -38.33, False),
+    ("REC", "Recife", -8.13, -34.92, False),
+    ("FOR", "Fortaleza", -3.78, -38.53, False),
+    ("BEL", "Belém", -1.38, -48.48, False),
+    ("MAO", "Manaus", -3.04, -60.05, False),
+    ("PVH", "Porto Velho", -8.71, -63.90, False),
+    ("MIA", "Miami", 25.79, -80.29, True),
+    ("FLL", "Fort Lauderdale", 26.07, -80.15, True),
+    ("MCO", "Orlando", 28.43, -81.31, True),
+    ("LIS", "Lisboa", 38.77, -9.13, True),
+    ("ORY", "Paris", 48.72, 2.38, True),
+    ("PTY", "Panamá", 9.07, -79.38, True),
+)
+NACIONAIS = tuple(a for a in AEROPORTOS if not a[4])
+INTERNACIONAIS = tuple(a for a in AEROPORTOS if a[4])
+# Bases de onde partem os voos internacionais.
+BASES_INTERNACIONAIS = tuple(a for a in AEROPORTOS if a[0] in ("VCP", "GRU", "CNF", "REC", "SSA"))
+
+# Aeronaves: (modelo, assentos). Voos internacionais usam o widebody.
+AERONAVES_NACIONAIS = (("E195-E2", 136), ("A320neo", 174), ("A321neo", 214))
+AERONAVE_INTERNACIONAL = ("A330neo", 298)
+
+# Distribuição dos planos de fidelidade na cabine.
+PLANOS = ("Básico", "Safira", "Topázio", "Diamante")
+PESOS_PLANOS = (0.70, 0.15, 0.10, 0.05)
+
+# Ondas de partida ao longo do dia: (minuto central, desvio padrão, peso).
+ONDAS_PARTIDA = ((7 * 60, 80, 0.35), (13 * 60, 120, 0.25), (19 * 60, 90, 0.30), (23 * 60, 40, 0.10))
+
+PROBABILIDADE_CANCELADO = 0.02
+PROBABILIDADE_ADIADO = 0.10
+
+
+def _distancia_km(origem, destino):
+    # Distância de círculo máximo (haversine) entre dois aeroportos.
+    lat1, lon1, lat2, lon2 = map(math.radians, (origem[2], origem[3], destino[2], destino[3]))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(a))
+
+
+def _duracao_min(origem, destino):
+    # Velocidade de cruzeiro ~780 km/h mais 30 min de taxi, subida e descida.
+    return int(_distancia_km(origem, destino) / 780 * 60) + 30
+
+
+def _hora(minutos):
+    minutos %= 24 * 60
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def _chegada_local(dia, partida, duracao, origem, destino):
+    # Horário de chegada no relógio do destino, como a API espera: partida em
+    # minutos do dia no fuso da origem, mais a duração em tempo absoluto.
+    saida = datetime(dia.year, dia.month, dia.day, tzinfo=fuso_aeroporto(origem[0])) + timedelta(minutes=partida)
+    chegada = saida.astimezone(timezone.utc) + timedelta(minutes=duracao)
+    return chegada.astimezone(fuso_aeroporto(destino[0])).strftime("%H:%M")
+
+
+def _minuto_partida(sorteio):
+    centro, desvio, _ = sorteio.choices(ONDAS_PARTIDA, weights=[onda[2] for onda in ONDAS_PARTIDA])[0]
+    return min(max(int(sorteio.gauss(centro, desvio)), 5 * 60), 24 * 60 - 1)
+
+
+def _rota(sorteio):
+    if sorteio.random() < 0.12:
+        base, exterior = sorteio.choice(BASES_INTERNACIONAIS), sorteio.choice(INTERNACIONAIS)
+        return (base, exterior) if sorteio.random() < 0.5 else (exterior, base)
+    origem, destino = sorteio.sample(NACIONAIS, 2)
+    return origem, destino
+
+
+def gerar_voos(quantidade, semente=42, inicio=date(2025, 10, 17), dias=7):
+    """
+    Gera 'quantidade' voos distribuídos em 'dias' dias a partir de 'inicio'.
+    Os códigos são únicos na escala inteira (a API indexa os voos pelo código) e
+    têm cinco dígitos, para não colidir com os voos fixos das APIs (ex.: AD4070).
+    A partida é local da origem e a chegada, local do destino (como na API).
+    """
+    sorteio = random.Random(semente)
+    for numero in range(quantidade):
+        origem, destino = _rota(sorteio)
+        internacional = origem[4] or destino[4]
+        partida = _minuto_partida(sorteio)
+        duracao = _duracao_min(origem, destino)
+        dia = inicio + timedelta(days=numero * dias // max(quantidade, 1))
+
+        voo = {
+            "codigo_voo": f"AD{10000 + numero}",
+            "origem": f"{origem[0]} ({origem[1]})",
+            "destino": f"{destino[0]} ({destino[1]})",
+            "voo": "Internacional" if internacional else "Nacional",
+            "dia_partida": dia.strftime("%d/%m/%Y"),
+            "partida_programada": _hora(partida),
+            "chegada_programada": _chegada_local(dia, partida, duracao, origem, destino),
+            "status": None, "nova_partida": None, "nova_chegada": None,
+        }
+        sorte = sorteio.random()
+        if sorte < PROBABILIDADE_CANCELADO:
+            voo["status"] = "Cancelado"
+        elif sorte < PROBABILIDADE_CANCELADO + PROBABILIDADE_ADIADO:
+            # Atrasos curtos são os mais comuns; a cauda chega a quatro horas.
+            atraso = min(int(sorteio.expovariate(1 / 45)) + 15, 240)
+            voo["status"] = "Adiado"
+            voo["nova_partida"] = _hora(partida + atraso)
+            voo["nova_chegada"] = _chegada_local(dia, partida + atraso, duracao, origem, destino)
+        yield voo
+
+
+def gerar_cabine(voo, semente=42, quantidade_snacks=12):
+    """
+    Mapa de assentos e estoque do carrinho de um voo, no formato do POST /api/voos.
+    Depende só da semente e do código do voo, não da ordem de geração.
+    """
+    sorteio = random.Random(f"{semente}:{voo['codigo_voo']}")
+    if voo["voo"] == "Internacional":
+        modelo, lugares = AERONAVE_INTERNACIONAL
+    else:
+        modelo, lugares = sorteio.choice(AERONAVES_NACIONAIS)
+
+    planos = sorteio.choices(PLANOS, weights=PESOS_PLANOS, k=lugares)
+    # O carrinho leva de 10% a 25% da lotação de cada snack.
+    estoque = {str(snack_id): max(1, int(lugares * sorteio.uniform(0.10, 0.25)))
+               for snack_id in range(1, quantidade_snacks + 1)}
+    return {
+        "codigo_voo": voo["codigo_voo"],
+        "aeronave": modelo,
+        "assentos": {str(numero): plano for numero, plano in enumerate(planos, start=1)},
+        "estoque": estoque,
+    }
+
+
+def _abrir(caminho):
+    return sys.stdout if caminho == "-" else open(caminho, "w", encoding="utf-8")
+
+
+def gravar(quantidade, semente, inicio, dias, caminho_voos, caminho_cabines=None, quantidade_snacks=12):
+    """
+    Gera e grava os voos (e, se pedido, as cabines) linha a linha.
+    """
+    arquivo_voos = _abrir(caminho_voos)
+    arquivo_cabines = _abrir(caminho_cabines) if caminho_cabines else None
+    try:
+        for voo in gerar_voos(quantidade, semente, inicio, dias):
+            arquivo_voos.write(json.dumps(voo, ensure_ascii=False) + "\n")
+            if arquivo_cabines is not None:
+                cabine = gerar_cabine(voo, semente, quantidade_snacks)
+                arquivo_cabines.write(json.dumps(cabine, ensure_ascii=False, separators=(",", ":")) + "\n")
+    finally:
+        for arquivo in (arquivo_voos, arquivo_cabines):
+            if arquivo is not None and arquivo is not sys.stdout:
+                arquivo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera voos e cabines sintéticos (JSON Lines).")
+    parser.add_argument("--voos", type=int, default=5000, help="Quantidade de voos (padrão: 5000).")
+    parser.add_argument("--dias", type=int, default=7, help="Dias cobertos pela escala (padrão: 7).")
+    parser.add_argument("--inicio", default="2025-10-17", help="Primeiro dia da escala (AAAA-MM-DD).")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--snacks", type=int, default=12, help="Snacks com estoque no carrinho (padrão: 12, o cardápio inteiro do serviço de bordo).")
+    parser.add_argument("--saida-voos", default="-", help="Arquivo de voos ('-' = tela).")
+    parser.add_argument("--saida-cabines", help="Arquivo de cabines (opcional).")
+    args = parser.parse_args()
+
+    inicio = datetime.strptime(args.inicio, "%Y-%m-%d").date()
+    gravar(args.voos, args.semente, inicio, args.dias, args.saida_voos, args.saida_cabines, args.snacks)
+
+
+if __name__ == "__main__":
+    main()
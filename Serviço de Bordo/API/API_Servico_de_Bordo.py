@@ -4,9 +4,22 @@
 # Flask: O núcleo do nosso micro-framework web.
 # jsonify: Para converter dicionários Python para o formato JSON, o padrão de comunicação em APIs REST.
 # request: Para acessar os dados enviados na requisição (por exemplo, o número do assento e o lanche escolhido).
-from flask import Flask, jsonify, request
+import os
+import sys
+import time
+
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS # Importa o CORS
 
+# Módulos comuns às duas APIs (ex.: metricas.py) ficam em <raiz>/Compartilhado.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Compartilhado"))
+
+# Montagem das respostas de lote e de assentos, comum às duas versões da API.
+from armazenamento import cadastrar_voo, corpo_assentos, corpo_assentos_desde, ler_versao
+from ativos import cabecalho_cache
+from metricas import METRICAS, TIPO_CONTEUDO, registrar_requisicao
+from pedidos import resumir_lote, validar_lote
+
 # --- Configuração da Aplicação ---
 # Em um ambiente de produção na Azul, usaríamos configurações mais avançadas,
 # mas para este projeto, a inicialização padrão é suficiente.
@@ -16,41 +29,102 @@ app = Flask(__name__)
 # que rodará em uma origem diferente, possa fazer requisições para esta API.
 CORS(app)
 
+# Imagens geradas pelo pipeline de ativos (ativos.py) têm o hash no nome:
+# o navegador pode guardá-las por um ano sem revalidar.
+@app.after_request
+def aplicar_cache_ativos(response):
+    cache_control = cabecalho_cache(request.path)
+    if cache_control is not None and response.status_code == 200:
+        response.headers["Cache-Control"] = cache_control
+    return response
+
+# Métricas por rota (latência e código HTTP), expostas em /metrics.
+@app.before_request
+def iniciar_medicao():
+    g.inicio_requisicao = time.perf_counter()
+
+@app.after_request
+def registrar_medicao(response):
+    inicio = g.pop("inicio_requisicao", None)
+    if inicio is not None:
+        rota = request.url_rule.rule if request.url_rule is not None else None
+        registrar_requisicao(request.method, rota, response.status_code, time.perf_counter() - inicio)
+    return response
+
 
 # --- Camada de Dados ---
-# Em um sistema real, esses dados viriam de um banco de dados (ex: PostgreSQL, Oracle).
-# Para este protótipo, vamos mantê-los em memória como variáveis globais.
-# Isso simula o "estado" do nosso serviço de bordo.
-
-SNACKS = {
-    1: {"name": 'Amendoim', "image_url": '/static/IMG/Amendoim.png'},
-    2: {"name": 'Aviõezinhos', "image_url": '/static/IMG/Aviaozin.png'}, 
-    3: {"name": 'Bolinho', "image_url": '/static/IMG/bolo.png'},
-    4: {"name": 'Bolinho Sabor Laranja', "image_url": '/static/IMG/Bolinho.png'},
-    5: {"name": 'Batatinhas Chips', "image_url": '/static/IMG/Chips.png'},
-    6: {"name": 'Cookie Integral', "image_url": '/static/IMG/Cookie.png'},
-    7: {"name": 'Goiabinha Integral', "image_url": '/static/IMG/Goiabinha.png'},
-    8: {"name": 'Maçã', "image_url": '/static/IMG/Maca.png'},
-    9: {"name": 'Pão na Chapa', "image_url": '/static/IMG/Pao.png'},
-    10: {"name": 'Polvilho Salgado', "image_url": '/static/IMG/Polvilho.png'},
-    11: {"name": 'Queijo Integral', "image_url": '/static/IMG/Queijo.png'},
-    12: {"name": 'Torresminho', "image_url": '/static/IMG/Torresminho.png'}
-}
-
-# Estrutura de dados otimizada. Usar um dicionário com o número do assento como chave
-# permite acesso direto e mais rápido (O(1)) do que percorrer uma lista (O(n)).
-# Isso é uma otimização de performance importante em sistemas de larga escala.
-ASSENTOS = {
-    1: {"Status": 'Topázio', "Pedidos": 0},
-    2: {"Status": 'Básico', "Pedidos": 0},
-    3: {"Status": 'Básico', "Pedidos": 0},
-    4: {"Status": 'Diamante', "Pedidos": 0},
-    5: {"Status": 'Safira', "Pedidos": 0},
-    6: {"Status": 'Safira', "Pedidos": 0},
-    10: {"Status": 'Básico', "Pedidos": 0},
-    22: {"Status": 'Topázio', "Pedidos": 0},
-    23: {"Status": 'Topázio', "Pedidos": 0}
-}
+# Snacks, assentos, estoque e a configuração do armazenamento ficam em dados_bordo.py,
+# compartilhado por esta API (Flask) e pela versão assíncrona (API_Servico_de_Bordo_ASGI.py).
+from dados_bordo import (
+    ARMAZENAMENTO, ASSENTOS, ESPERA_MAXIMA, ESTOQUE, LIMITE_LOTE, PROCESSADOR, SNACKS, VOO_PADRAO,
+)
+
+
+# --- Funções Auxiliares ---
+
+def voo_nao_encontrado(codigo_voo):
+    return jsonify({"status": "erro", "mensagem": f"Voo {codigo_voo} não encontrado."}), 404
+
+def responder_pedido(voo):
+    """
+    Lê o corpo JSON de um pedido, valida e processa no voo informado.
+    Compartilhado pela rota original e pela rota por voo.
+    """
+    # Extrai os dados JSON enviados pelo cliente (front-end).
+    dados_pedido = request.get_json()
+
+    # --- Validação de Entrada ---
+    # É fundamental validar os dados recebidos para garantir a integridade do sistema.
+    if not dados_pedido or "assento_id" not in dados_pedido or "snack_id" not in dados_pedido:
+        # Retornamos um código de status HTTP 400 (Bad Request) para indicar um erro do cliente.
+        return jsonify({"status": "erro", "mensagem": "Estrutura da requisição inválida."}), 400
+
+    assento_id = dados_pedido["assento_id"]
+    snack_id = dados_pedido["snack_id"]
+
+    # --- Lógica de Negócio ---
+    # Existência do assento/snack, o estoque, a regra do plano 'Básico' e o incremento
+    # ficam no processador, que garante a consistência sob concorrência.
+    resultado = PROCESSADOR.processar(voo, assento_id, snack_id)
+
+    # Sucesso retorna 200 (OK); recusas retornam 403/409; erros retornam 400/404.
+    return jsonify(resultado.como_dict()), resultado.codigo_http
+
+
+def responder_assentos(voo):
+    """
+    Responde a consulta de assentos de um voo.
+    Sem parâmetros: todos os assentos e a versão atual do voo.
+    Com ?since=<versao>: apenas os assentos alterados depois dessa versão
+    (ou o mapa completo, com "completo": true, se a versão não for reconhecida).
+    Com ?since=<versao>&espera=<segundos>: long-poll, aguarda até haver mudança.
+    """
+    since = request.args.get("since")
+    if since is None:
+        return jsonify(corpo_assentos(voo))
+
+    desde = ler_versao(voo, since)
+    espera = min(request.args.get("espera", default=0.0, type=float), ESPERA_MAXIMA)
+    # Versão não reconhecida: o mapa completo já é a novidade, sem esperar.
+    if espera > 0 and desde is not None:
+        voo.aguardar_mudanca(desde, espera)
+
+    return jsonify(corpo_assentos_desde(voo, since))
+
+def responder_lote(voo):
+    """
+    Processa um lote de pedidos (ex.: uma fileira inteira na passagem do carrinho)
+    em uma única requisição. A regra do plano 'Básico' e as validações são
+    aplicadas a cada item, e a resposta traz o resultado de cada um, na mesma ordem.
+    """
+    itens, erro = validar_lote(request.get_json(), LIMITE_LOTE)
+    if erro is not None:
+        return jsonify(erro.como_dict()), erro.codigo_http
+
+    resultados = PROCESSADOR.processar_lote(voo, itens)
+
+    # O lote em si foi aceito (200); o resultado de cada pedido vem item a item.
+    return jsonify(resumir_lote(itens, resultados))
 
 
 # --- Definição dos Endpoints da API (Nossas "Rotas") ---
@@ -60,19 +134,20 @@ def get_snacks():
     """
     Endpoint para listar todos os snacks disponíveis.
     Método HTTP: GET
-    Retorno: Um objeto JSON com a lista de snacks.
+    Retorno: Um objeto JSON com a lista de snacks, incluindo o estoque restante.
     """
     # A boa prática é sempre retornar uma resposta JSON estruturada.
-    return jsonify({"snacks": SNACKS})
+    return jsonify({"snacks": ARMAZENAMENTO.voo(VOO_PADRAO).listar_snacks()})
 
 @app.route('/api/assentos', methods=['GET'])
 def get_assentos():
     """
     Endpoint para consultar o status de todos os assentos.
     Método HTTP: GET
-    Retorno: Um objeto JSON com os dados dos assentos.
+    Parâmetros opcionais: since=<versao> (somente o que mudou) e espera=<segundos> (long-poll).
+    Retorno: Um objeto JSON com os dados dos assentos e a versão atual.
     """
-    return jsonify({"assentos": ASSENTOS})
+    return responder_assentos(ARMAZENAMENTO.voo(VOO_PADRAO))
 
 @app.route('/api/pedido', methods=['POST'])
 def realizar_pedido():
@@ -85,45 +160,101 @@ def realizar_pedido():
         "snack_id": <numero>
     }
     """
-    # Extrai os dados JSON enviados pelo cliente (front-end).
-    dados_pedido = request.get_json()
+    return responder_pedido(ARMAZENAMENTO.voo(VOO_PADRAO))
 
-    # --- Validação de Entrada ---
-    # É fundamental validar os dados recebidos para garantir a integridade do sistema.
-    if not dados_pedido or "assento_id" not in dados_pedido or "snack_id" not in dados_pedido:
-        # Retornamos um código de status HTTP 400 (Bad Request) para indicar um erro do cliente.
-        return jsonify({"status": "erro", "mensagem": "Estrutura da requisição inválida."}), 400
+@app.route('/api/pedidos/lote', methods=['POST'])
+def realizar_pedidos_lote():
+    """
+    Endpoint para processar vários pedidos de snack de uma só vez.
+    Método HTTP: POST
+    Corpo da Requisição (JSON esperado):
+    {
+        "pedidos": [
+            {"assento_id": <numero>, "snack_id": <numero>},
+            [<assento_id>, <snack_id>],
+            ...
+        ]
+    }
+    Retorno: o resultado de cada pedido (mesmo formato de /api/pedido, com
+    'codigo_http', 'assento_id' e 'snack_id') e um resumo por status.
+    """
+    return responder_lote(ARMAZENAMENTO.voo(VOO_PADRAO))
 
-    assento_id = dados_pedido["assento_id"]
-    snack_id = dados_pedido["snack_id"]
+# --- Endpoints por Voo (Frota) ---
+# Cada voo tem seu próprio mapa de assentos e estoque; pedidos de um voo
+# nunca disputam travas com os de outro.
 
-    # Verifica se o assento e o snack existem em nossa "base de dados".
-    if assento_id not in ASSENTOS:
-        return jsonify({"status": "erro", "mensagem": f"Assento {assento_id} não encontrado."}), 404 # Not Found
-    if snack_id not in SNACKS:
-        return jsonify({"status": "erro", "mensagem": f"Snack com ID {snack_id} é inválido."}), 400
+@app.route('/api/voos', methods=['GET'])
+def get_voos():
+    """
+    Endpoint para listar os códigos dos voos atendidos.
+    Método HTTP: GET
+    """
+    return jsonify({"voos": ARMAZENAMENTO.listar_voos()})
 
-    # --- Lógica de Negócio ---
-    # Esta é a lógica principal do seu sistema, agora adaptada para o contexto da API.
-    assento = ASSENTOS[assento_id]
-    
-    # A regra para clientes 'Básico'
-    if assento["Status"] == 'Básico' and assento["Pedidos"] > 0:
-        return jsonify({
-            "status": "recusado",
-            "mensagem": "Seu plano de fidelidade permite apenas um snack por viagem."
-        }), 403 # Forbidden
-
-    # Se a regra de negócio permitir, o pedido é processado.
-    assento["Pedidos"] += 1
-    
-    # --- Resposta de Sucesso ---
-    # Retornamos um código de status HTTP 200 (OK) e uma mensagem de sucesso.
-    return jsonify({
-        "status": "sucesso",
-        "mensagem": f"Pedido do snack '{SNACKS[snack_id]["name"]}' para o assento {assento_id} realizado com sucesso!",
-        "dados_assento": assento
-    })
+@app.route('/api/voos', methods=['POST'])
+def criar_voo():
+    """
+    Endpoint para cadastrar o mapa de assentos de um voo.
+    Método HTTP: POST
+    Corpo da Requisição (JSON esperado):
+    {
+        "codigo_voo": "AD2550",
+        "assentos": {"<numero>": "<plano>", ...},
+        "estoque": {"<snack_id>": <quantidade>, ...}   (opcional)
+    }
+    """
+    corpo, codigo_http = cadastrar_voo(ARMAZENAMENTO, request.get_json(silent=True))
+    return jsonify(corpo), codigo_http
+
+@app.route('/api/voos/<codigo_voo>/snacks', methods=['GET'])
+def get_snacks_voo(codigo_voo):
+    """
+    Snacks com o estoque restante no carrinho do voo informado.
+    """
+    voo = ARMAZENAMENTO.voo(codigo_voo.upper())
+    if voo is None:
+        return voo_nao_encontrado(codigo_voo)
+    return jsonify({"snacks": voo.listar_snacks()})
+
+@app.route('/api/voos/<codigo_voo>/assentos', methods=['GET'])
+def get_assentos_voo(codigo_voo):
+    """
+    Status dos assentos do voo informado (aceita since/espera como /api/assentos).
+    """
+    voo = ARMAZENAMENTO.voo(codigo_voo.upper())
+    if voo is None:
+        return voo_nao_encontrado(codigo_voo)
+    return responder_assentos(voo)
+
+@app.route('/api/voos/<codigo_voo>/pedido', methods=['POST'])
+def realizar_pedido_voo(codigo_voo):
+    """
+    Mesmo contrato de /api/pedido, aplicado ao voo informado.
+    """
+    voo = ARMAZENAMENTO.voo(codigo_voo.upper())
+    if voo is None:
+        return voo_nao_encontrado(codigo_voo)
+    return responder_pedido(voo)
+
+@app.route('/api/voos/<codigo_voo>/pedidos/lote', methods=['POST'])
+def realizar_pedidos_lote_voo(codigo_voo):
+    """
+    Mesmo contrato de /api/pedidos/lote, aplicado ao voo informado.
+    """
+    voo = ARMAZENAMENTO.voo(codigo_voo.upper())
+    if voo is None:
+        return voo_nao_encontrado(codigo_voo)
+    return responder_lote(voo)
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Métricas no formato texto do Prometheus: latência por rota, pedidos por
+    resultado (inclusive recusas da regra do plano 'Básico') e tempo da
+    operação atômica de registro do pedido.
+    """
+    return Response(METRICAS.exportar(), content_type=TIPO_CONTEUDO)
 
 # --- Ponto de Entrada da Aplicação ---
 # Este bloco garante que o servidor de desenvolvimento do Flask só será iniciado
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+# Versão assíncrona (ASGI) da API do serviço de bordo.
+# Mesmos endpoints e mesmo contrato JSON da versão Flask (API_Servico_de_Bordo.py),
+# mas rodando em um event loop (FastAPI + uvicorn, como a API de Status de Voo).
+# Um único processo atende muitas conexões lentas (Wi-Fi de bordo) sem precisar
+# de uma thread por conexão, e o long-poll de assentos não prende threads.
+#
+# Execução (um processo com event loop por núcleo):
+#   uvicorn API_Servico_de_Bordo_ASGI:app --port 5000 --workers 4
+# Com mais de um worker, use SERVICO_BORDO_DIRETORIO_BANCO (SQLite) para que
+# todos os processos enxerguem o mesmo estado.
+
+import asyncio
+import os
+import sys
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+
+# Módulos comuns às duas APIs (ex.: metricas.py) ficam em <raiz>/Compartilhado.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Compartilhado"))
+
+from armazenamento import ArmazenamentoMemoria, cadastrar_voo, corpo_assentos, corpo_assentos_desde, ler_versao
+from ativos import cabecalho_cache
+from dados_bordo import ARMAZENAMENTO, ESPERA_MAXIMA, LIMITE_LOTE, PROCESSADOR, VOO_PADRAO
+from metricas import METRICAS, TIPO_CONTEUDO, registrar_requisicao
+from pedidos import resumir_lote, validar_lote
+
+# --- Configuração da Aplicação ---
+app = FastAPI(
+    title="Azul Serviço de Bordo API",
+    description="Versão assíncrona da API de pedidos de snacks do serviço de bordo.",
+    version="1.0.0"
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# As imagens dos snacks, servidas em /static como no Flask.
+# Imagens geradas pelo pipeline de ativos (ativos.py): hash no nome, cache de um ano.
+@app.middleware("http")
+async def aplicar_cache_ativos(request: Request, call_next):
+    response = await call_next(request)
+    cache_control = cabecalho_cache(request.url.path)
+    if cache_control is not None and response.status_code == 200:
+        response.headers["Cache-Control"] = cache_control
+    return response
+
+# Métricas por rota (latência e código HTTP), expostas em /metrics.
+@app.middleware("http")
+async def medir_requisicao(request: Request, call_next):
+    inicio = time.perf_counter()
+    response = await call_next(request)
+    # Rotas declaradas têm modelo (ex.: /api/voos/{codigo_voo}/pedido); em /static,
+    # montado como sub-aplicação, usamos o prefixo da montagem.
+    rota = request.scope.get("route")
+    rota = rota.path if rota is not None else request.scope.get("root_path")
+    registrar_requisicao(request.method, rota, response.status_code, time.perf_counter() - inicio)
+    return response
+
+app.mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(__file__), "static")), name="static")
+
+# --- Acesso ao Estado sem Bloquear o Event Loop ---
+# Em memória, cada operação dura microssegundos e nunca espera por outra
+# corrotina (as travas são liberadas antes de qualquer 'await'), então roda
+# direto no loop. No SQLite há I/O de disco: a operação vai para o pool de threads.
+EM_MEMORIA = isinstance(ARMAZENAMENTO, ArmazenamentoMemoria)
+# No SQLite, outros workers também alteram o voo sem passar por este processo:
+# o long-poll confere a versão no banco a cada INTERVALO_ESPERA segundos.
+# Em memória, só os pedidos deste processo mudam o voo e a espera é por evento.
+INTERVALO_ESPERA = None if EM_MEMORIA else 0.2
+
+# Um asyncio.Event por voo com clientes esperando. Um pedido aceito dispara o
+# evento (acordando todos os long-polls do voo) e o troca por um novo.
+_MUDANCAS = {}
+
+
+async def executar(funcao, *args):
+    if EM_MEMORIA:
+        return funcao(*args)
+    return await run_in_threadpool(funcao, *args)
+
+
+def avisar_mudanca(voo):
+    evento = _MUDANCAS.pop(voo.codigo, None)
+    if evento is not None:
+        evento.set()
+
+
+async def aguardar_mudanca(voo, versao, espera):
+    loop = asyncio.get_running_loop()
+    limite = loop.time() + espera
+    while True:
+        # O evento é obtido antes de ler a versão: um pedido entre as duas
+        # leituras dispara este mesmo evento, e a mudança não se perde.
+        evento = _MUDANCAS.setdefault(voo.codigo, asyncio.Event())
+        if await executar(voo.versao_atual) > versao:
+            return True
+        restante = limite - loop.time()
+        if restante <= 0:
+            return False
+        if INTERVALO_ESPERA is not None:
+            restante = min(INTERVALO_ESPERA, restante)
+        try:
+            await asyncio.wait_for(evento.wait(), restante)
+        except asyncio.TimeoutError:
+            pass
+
+
+def ler_espera(texto):
+    # Mesmo contrato da versão Flask: valor inválido vale 0 (sem espera).
+    try:
+        return min(max(float(texto), 0.0), ESPERA_MAXIMA)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+async def ler_json(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+def erro(mensagem, codigo_http):
+    return JSONResponse({"status": "erro", "mensagem": mensagem}, status_code=codigo_http)
+
+
+async def obter_voo(codigo_voo):
+    return await executar(ARMAZENAMENTO.voo, codigo_voo.upper())
+
+
+# --- Respostas Compartilhadas pelas Rotas ---
+
+async def responder_assentos(voo, since, espera):
+    if since is None:
+        return JSONResponse(await executar(corpo_assentos, voo))
+
+    desde = await executar(ler_versao, voo, since)
+    espera = ler_espera(espera)
+    # Versão não reconhecida: o mapa completo já é a novidade, sem esperar.
+    if espera > 0 and desde is not None:
+        await aguardar_mudanca(voo, desde, espera)
+    return JSONResponse(await executar(corpo_assentos_desde, voo, since))
+
+
+async def responder_pedido(voo, request):
+    dados_pedido = await ler_json(request)
+    if not isinstance(dados_pedido, dict) or "assento_id" not in dados_pedido or "snack_id" not in dados_pedido:
+        return erro("Estrutura da requisição inválida.", 400)
+
+    resultado = await executar(PROCESSADOR.processar, voo, dados_pedido["assento_id"], dados_pedido["snack_id"])
+    if resultado.status == "sucesso":
+        avisar_mudanca(voo)
+    return JSONResponse(resultado.como_dict(), status_code=resultado.codigo_http)
+
+
+async def responder_lote(voo, request):
+    itens, falha = validar_lote(await ler_json(request), LIMITE_LOTE)
+    if falha is not None:
+        return JSONResponse(falha.como_dict(), status_code=falha.codigo_http)
+
+    resultados = await executar(PROCESSADOR.processar_lote, voo, itens)
+    if any(resultado.status == "sucesso" for resultado in resultados):
+        avisar_mudanca(voo)
+    return JSONResponse(resumir_lote(itens, resultados))
+
+
+# --- Endpoints (mesmas rotas da versão Flask) ---
+
+@app.get("/api/snacks")
+async def get_snacks():
+    voo = await obter_voo(VOO_PADRAO)
+    return JSONResponse({"snacks": await executar(voo.listar_snacks)})
+
+@app.get("/api/assentos")
+async def get_assentos(since: str = None, espera: str = None):
+    return await responder_assentos(await obter_voo(VOO_PADRAO), since, espera)
+
+@app.post("/api/pedido")
+async def realizar_pedido(request: Request):
+    return await responder_pedido(await obter_voo(VOO_PADRAO), request)
+
+@app.post("/api/pedidos/lote")
+async def realizar_pedidos_lote(request: Request):
+    return await responder_lote(await obter_voo(VOO_PADRAO), request)
+
+@app.get("/api/voos")
+async def get_voos():
+    return JSONResponse({"voos": await executar(ARMAZENAMENTO.listar_voos)})
+
+@app.post("/api/voos")
+async def criar_voo(request: Request):
+    corpo, codigo_http = await executar(cadastrar_voo, ARMAZENAMENTO, await ler_json(request))
+    return JSONResponse(corpo, status_code=codigo_http)
+
+@app.get("/api/voos/{codigo_voo}/snacks")
+async def get_snacks_voo(codigo_voo: str):
+    voo = await obter_voo(codigo_voo)
+    if voo is None:
+        return erro(f"Voo {codigo_voo} não encontrado.", 404)
+    return JSONResponse({"snacks": await executar(voo.listar_snacks)})
+
+@app.get("/api/voos/{codigo_voo}/assentos")
+async def get_assentos_voo(codigo_voo: str, since: str = None, espera: str = None):
+    voo = await obter_voo(codigo_voo)
+    if voo is None:
+        return erro(f"Voo {codigo_voo} não encontrado.", 404)
+    return await responder_assentos(voo, since, espera)
+
+@app.post("/api/voos/{codigo_voo}/pedido")
+async def realizar_pedido_voo(codigo_voo: str, request: Request):
+    voo = await obter_voo(codigo_voo)
+    if voo is None:
+        return erro(f"Voo {codigo_voo} não encontrado.", 404)
+    return await responder_pedido(voo, request)
+
+@app.post("/api/voos/{codigo_voo}/pedidos/lote")
+async def realizar_pedidos_lote_voo(codigo_voo: str, request: Request):
+    voo = await obter_voo(codigo_voo)
+    if voo is None:
+        return erro(f"Voo {codigo_voo} não encontrado.", 404)
+    return await responder_lote(voo, request)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(METRICAS.exportar(), media_type=TIPO_CONTEUDO)
+
+
+# --- Execução da API ---
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=5000)
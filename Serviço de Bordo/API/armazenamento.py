@@ -0,0 +1,599 @@
+# -*- coding: utf-8 -*-
+
+# Camada de armazenamento do serviço de bordo.
+# Os endpoints não acessam mais os dicionários globais diretamente: eles falam com
+# um "armazenamento", que guarda o estado de cada voo da frota separadamente
+# (um "shard" por voo: pedidos de um voo nunca disputam travas ou arquivos com outro).
+#   - ArmazenamentoMemoria: dados em memória; cada voo tem um MapaAssentos compacto,
+#     travas listradas por assento e uma trava por snack no estoque;
+#   - ArmazenamentoSQLite: um arquivo SQLite (modo WAL) por voo, que sobrevive a
+#     reinicializações e pode ser compartilhado por vários workers (ex.: gunicorn).
+# Nos dois casos, a verificação do limite do plano, a baixa no estoque do snack e
+# o incremento de "Pedidos" são uma única operação atômica.
+
+import json
+import os
+import queue
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from mapa_assentos import PLANOS, SEM_POSICAO, MapaAssentos
+
+# Situações possíveis ao registrar um pedido.
+SUCESSO = "sucesso"
+RECUSADO = "recusado"
+ASSENTO_INEXISTENTE = "assento_inexistente"
+SNACK_INEXISTENTE = "snack_inexistente"
+SEM_ESTOQUE = "sem_estoque"
+
+# Quantos snacks cada plano de fidelidade pode pedir por viagem (ausente = sem limite).
+LIMITES_POR_PLANO = {'Básico': 1}
+# Mesmo limite, indexado pelo código do plano usado no MapaAssentos.
+_LIMITES_POR_CODIGO = tuple(LIMITES_POR_PLANO.get(plano) for plano in PLANOS)
+
+# Maior número de assento aceito em POST /api/voos: o índice do MapaAssentos usa posições de 16 bits.
+MAXIMO_ASSENTOS = 32767
+
+# Códigos de voo aceitos (ex.: AD4070). Também evita nomes de arquivo indevidos no SQLite.
+_PADRAO_CODIGO_VOO = re.compile(r"^[A-Z0-9]{2,10}$")
+
+
+def codigo_voo_valido(codigo_voo):
+    return isinstance(codigo_voo, str) and _PADRAO_CODIGO_VOO.match(codigo_voo) is not None
+
+
+def nova_epoca():
+    # Identifica a "vida" do contador de versões de um voo (ver formatar_versao).
+    return secrets.token_hex(4)
+
+
+class Voo:
+    """
+    Contrato do estado de um único voo (um shard).
+    """
+
+    codigo = None
+    # Época do contador de versões: muda quando o contador recomeça do zero
+    # (em memória, a cada inicialização; no SQLite, só com um arquivo novo).
+    epoca = None
+
+    def listar_snacks(self):
+        """Retorna {snack_id: {"name": ..., "image_url": ..., "estoque": ...}} (estoque None = sem controle)."""
+        raise NotImplementedError
+
+    def nome_snack(self, snack_id):
+        """Retorna o nome de um snack existente (usado nas mensagens da API)."""
+        raise NotImplementedError
+
+    def listar_assentos(self):
+        """Retorna {assento_id: {"Status": ..., "Pedidos": ...}}."""
+        raise NotImplementedError
+
+    def assentos_desde(self, versao=None):
+        """
+        Retorna (versao_atual, assentos). Com versao=None traz todos os assentos;
+        caso contrário, apenas os alterados depois dessa versão.
+        A versão do voo cresce a cada pedido aceito.
+        """
+        raise NotImplementedError
+
+    def versao_atual(self):
+        """Versão atual do voo (leitura rápida, usada pelo long-poll assíncrono)."""
+        raise NotImplementedError
+
+    def aguardar_mudanca(self, versao, timeout):
+        """
+        Bloqueia até a versão do voo passar de 'versao' ou o tempo acabar.
+        Retorna True se houve mudança (usado no long-poll).
+        """
+        raise NotImplementedError
+
+    def registrar_pedido(self, assento_id, snack_id):
+        """
+        Verifica o estoque e o limite do plano, baixa uma unidade do snack e
+        incrementa os pedidos do assento, tudo de forma atômica.
+        Retorna (situacao, dados_assento), onde dados_assento é uma cópia do
+        assento após a operação (ou None se ele não existir).
+        """
+        raise NotImplementedError
+
+
+def formatar_versao(voo, versao):
+    """
+    Versão entregue aos clientes: "<epoca>:<numero>". Com a época, um ?since=
+    guardado antes de um reinício nunca é confundido com a contagem nova.
+    """
+    return f"{voo.epoca}:{versao}"
+
+
+def ler_versao(voo, texto):
+    """
+    Número da versão de um ?since=<epoca>:<numero> deste voo, ou None se o
+    valor estiver malformado, for de outra época ou estiver à frente do contador
+    (a versão só cresce: esse número nunca foi entregue por este voo).
+    """
+    epoca, separador, numero = (texto or "").partition(":")
+    if not separador or epoca != voo.epoca or not numero.isdigit():
+        return None
+    numero = int(numero)
+    if numero > voo.versao_atual():
+        return None
+    return numero
+
+
+def corpo_assentos(voo):
+    versao, assentos = voo.assentos_desde(None)
+    return {"assentos": assentos, "versao": formatar_versao(voo, versao)}
+
+
+def corpo_assentos_desde(voo, since):
+    """
+    Corpo da resposta de uma consulta incremental de assentos (?since=<versao>).
+    """
+    desde = ler_versao(voo, since)
+    if desde is not None:
+        versao, assentos = voo.assentos_desde(desde)
+        if desde <= versao:
+            return {"assentos": assentos, "versao": formatar_versao(voo, versao), "completo": False}
+    # Versão desconhecida (malformada, de outra época ou à frente do contador): mapa completo.
+    return {**corpo_assentos(voo), "completo": True}
+
+
+def cadastrar_voo(armazenamento, dados):
+    """
+    Cadastra um voo a partir do corpo JSON de POST /api/voos.
+    Retorna (corpo da resposta, código HTTP).
+    """
+    if not isinstance(dados, dict) or not isinstance(dados.get("assentos"), dict):
+        return {"status": "erro", "mensagem": "Estrutura da requisição inválida."}, 400
+
+    codigo_voo = str(dados.get("codigo_voo", "")).upper()
+    if armazenamento.voo(codigo_voo) is not None:
+        return {"status": "erro", "mensagem": f"Voo {codigo_voo} já cadastrado."}, 409
+
+    try:
+        # Chaves JSON são sempre texto: convertemos para os números de assento/snack.
+        assentos = {int(numero): {"Status": plano, "Pedidos": 0} for numero, plano in dados["assentos"].items()}
+        # "1" e "01" são o mesmo assento.
+        if len(assentos) != len(dados["assentos"]):
+            raise ValueError("assentos repetidos (mesmo número escrito de formas diferentes)")
+        # Numeração livre (cabines com lacunas, como a do AD4070), mas dentro do que o
+        # MapaAssentos indexa: igual nos dois armazenamentos (o SQLite aceitaria qualquer número).
+        fora = sorted(numero for numero in assentos if not 1 <= numero <= MAXIMO_ASSENTOS)
+        if fora:
+            raise ValueError(f"os assentos devem ser numerados de 1 a {MAXIMO_ASSENTOS}; fora da faixa: "
+                             + ", ".join(map(str, fora[:5])) + (", ..." if len(fora) > 5 else ""))
+        estoque = {int(snack_id): int(qtd) for snack_id, qtd in (dados.get("estoque") or {}).items()}
+        # Estoque só para snacks do cardápio (um snack desconhecido não tem nome para a resposta).
+        fora_cardapio = sorted(set(estoque) - set(armazenamento.snacks))
+        if fora_cardapio:
+            raise ValueError("estoque de snacks fora do cardápio: " + ", ".join(map(str, fora_cardapio)))
+        armazenamento.criar_voo(codigo_voo, assentos, estoque)
+    except (KeyError, TypeError, ValueError, OverflowError) as erro:
+        return {"status": "erro", "mensagem": f"Dados do voo inválidos: {erro}"}, 400
+
+    return {"status": "sucesso", "mensagem": f"Voo {codigo_voo} cadastrado.", "assentos": len(assentos)}, 201
+
+
+def carregar_cabines(armazenamento, caminho):
+    """
+    Cadastra os voos de um arquivo JSON Lines, uma cabine por linha no formato do
+    POST /api/voos (ex.: gerado por Ferramentas/gerar_dados.py). Voos já
+    existentes são mantidos como estão. Retorna a quantidade de voos criados.
+    """
+    criados = 0
+    with open(caminho, encoding="utf-8") as arquivo:
+        for numero_linha, linha in enumerate(arquivo, start=1):
+            if not linha.strip():
+                continue
+            corpo, codigo_http = cadastrar_voo(armazenamento, json.loads(linha))
+            if codigo_http == 400:
+                raise ValueError(f"{caminho}, linha {numero_linha}: {corpo['mensagem']}")
+            criados += codigo_http == 201
+    return criados
+
+
+class Armazenamento:
+    """
+    Contrato comum dos armazenamentos: um conjunto de voos independentes.
+    """
+
+    def voo(self, codigo_voo):
+        """Retorna o Voo com esse código, ou None se ele não existir."""
+        raise NotImplementedError
+
+    def criar_voo(self, codigo_voo, assentos, estoque=None):
+        """
+        Cria o voo se ele ainda não existir e o retorna. Se já existir,
+        o estado atual é mantido (reinícios não zeram os pedidos).
+        """
+        raise NotImplementedError
+
+    def listar_voos(self):
+        """Retorna a lista ordenada dos códigos de voo existentes."""
+        raise NotImplementedError
+
+
+# --- Armazenamento em Memória ---
+
+class VooMemoria(Voo):
+    """
+    Estado de um voo em memória, com os assentos em um MapaAssentos compacto.
+    O estoque é um contador por snack, cada um com sua própria trava: pedidos de
+    snacks diferentes não disputam a mesma trava.
+    """
+
+    def __init__(self, codigo, snacks, assentos, estoque=None, num_travas=16):
+        self.codigo = codigo
+        self.epoca = nova_epoca()
+        self.snacks = snacks
+        self.mapa = MapaAssentos(assentos)
+        # Snacks ausentes do estoque não têm controle de quantidade.
+        self.estoque = dict(estoque or {})
+        # Travas listradas: cada assento usa sempre a mesma trava do conjunto.
+        self._travas = [threading.Lock() for _ in range(num_travas)]
+        self._travas_estoque = {snack_id: threading.Lock() for snack_id in self.estoque}
+        # Versão do voo: protegida por uma trava curta, usada também para acordar o long-poll.
+        self.versao = 0
+        self._mudancas = threading.Condition()
+
+    def listar_snacks(self):
+        return {
+            snack_id: {**snack, "estoque": self.estoque.get(snack_id)}
+            for snack_id, snack in self.snacks.items()
+        }
+
+    def nome_snack(self, snack_id):
+        return self.snacks[snack_id]["name"]
+
+    def listar_assentos(self):
+        return self.mapa.como_dict()
+
+    def assentos_desde(self, versao=None):
+        with self._mudancas:
+            atual = self.versao
+            if versao is None:
+                return atual, self.mapa.como_dict()
+            return atual, self.mapa.desde(versao)
+
+    def versao_atual(self):
+        return self.versao
+
+    def aguardar_mudanca(self, versao, timeout):
+        with self._mudancas:
+            return self._mudancas.wait_for(lambda: self.versao > versao, timeout)
+
+    def registrar_pedido(self, assento_id, snack_id):
+        # IDs que não são inteiros (ex.: listas vindas de um lote malformado) não existem.
+        if type(snack_id) is not int:
+            sem_assento = self.mapa.posicao(assento_id) == SEM_POSICAO
+            return (ASSENTO_INEXISTENTE if sem_assento else SNACK_INEXISTENTE), None
+        # Caminho rápido: snack (do cardápio) esgotado é recusado antes das demais verificações.
+        existe = snack_id in self.snacks
+        if existe and self.estoque.get(snack_id, 1) <= 0:
+            return SEM_ESTOQUE, None
+        mapa = self.mapa
+        posicao = mapa.posicao(assento_id)
+        if posicao == SEM_POSICAO:
+            return ASSENTO_INEXISTENTE, None
+        if not existe:
+            return SNACK_INEXISTENTE, None
+
+        limite = _LIMITES_POR_CODIGO[mapa.planos[posicao]]
+        trava_estoque = self._travas_estoque.get(snack_id)
+
+        # Verificação e incremento acontecem dentro da mesma trava do assento.
+        # A trava do estoque é sempre obtida depois da do assento (ordem fixa, sem deadlock).
+        with self._travas[posicao % len(self._travas)]:
+            if limite is not None and mapa.pedidos[posicao] >= limite:
+                return RECUSADO, mapa.assento(posicao)
+            if trava_estoque is not None:
+                with trava_estoque:
+                    if self.estoque[snack_id] <= 0:
+                        return SEM_ESTOQUE, mapa.assento(posicao)
+                    self.estoque[snack_id] -= 1
+            mapa.pedidos[posicao] += 1
+            with self._mudancas:
+                self.versao += 1
+                mapa.versoes[posicao] = self.versao
+                self._mudancas.notify_all()
+            # Cópia feita ainda dentro da trava, para a resposta não ver um estado intermediário.
+            return SUCESSO, mapa.assento(posicao)
+
+
+class ArmazenamentoMemoria(Armazenamento):
+    """
+    Voos em memória do processo. A trava do armazenamento só é usada ao criar
+    voos; pedidos usam apenas as travas do próprio voo.
+    """
+
+    def __init__(self, snacks):
+        self.snacks = snacks
+        self._voos = {}
+        self._trava = threading.Lock()
+
+    def voo(self, codigo_voo):
+        return self._voos.get(codigo_voo)
+
+    def criar_voo(self, codigo_voo, assentos, estoque=None):
+        if not codigo_voo_valido(codigo_voo):
+            raise ValueError(f"Código de voo inválido: {codigo_voo!r}")
+        with self._trava:
+            voo = self._voos.get(codigo_voo)
+            if voo is None:
+                voo = VooMemoria(codigo_voo, self.snacks, assentos, estoque)
+                self._voos[codigo_voo] = voo
+            return voo
+
+    def listar_voos(self):
+        return sorted(self._voos)
+
+
+# --- Armazenamento em SQLite ---
+
+class VooSQLite(Voo):
+    """
+    Estado de um voo em um arquivo SQLite próprio (modo WAL), com um pool de conexões.
+    O pedido é inserido, o estoque baixado e o contador do assento atualizado
+    na mesma transação.
+    """
+
+    # Comandos SQL fixos: o sqlite3 mantém cada um já compilado (prepared) por conexão.
+    _SQL_TABELAS = """
+        CREATE TABLE IF NOT EXISTS snacks (
+            snack_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            image_url TEXT NOT NULL,
+            estoque INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS assentos (
+            assento_id INTEGER PRIMARY KEY,
+            status TEXT NOT NULL,
+            pedidos INTEGER NOT NULL DEFAULT 0,
+            limite INTEGER,
+            versao INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS versao_voo (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            versao INTEGER NOT NULL,
+            epoca TEXT
+        );
+        INSERT OR IGNORE INTO versao_voo (id, versao) VALUES (1, 0);
+        CREATE TABLE IF NOT EXISTS pedidos (
+            pedido_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            assento_id INTEGER NOT NULL REFERENCES assentos(assento_id),
+            snack_id INTEGER NOT NULL REFERENCES snacks(snack_id),
+            criado_em REAL NOT NULL
+        );
+    """
+    # Nome e imagem acompanham o cardápio atual (ex.: novas URLs do manifesto de ativos);
+    # o estoque de um snack já cadastrado é preservado.
+    _SQL_INSERIR_SNACK = (
+        "INSERT INTO snacks (snack_id, name, image_url, estoque) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(snack_id) DO UPDATE SET name = excluded.name, image_url = excluded.image_url"
+    )
+    _SQL_INSERIR_ASSENTO = "INSERT OR IGNORE INTO assentos (assento_id, status, pedidos, limite) VALUES (?, ?, ?, ?)"
+    _SQL_SNACKS = "SELECT snack_id, name, image_url FROM snacks ORDER BY snack_id"
+    _SQL_ESTOQUES = "SELECT snack_id, estoque FROM snacks"
+    _SQL_ASSENTOS = "SELECT assento_id, status, pedidos FROM assentos ORDER BY assento_id"
+    _SQL_ASSENTO = "SELECT status, pedidos FROM assentos WHERE assento_id = ?"
+    _SQL_ASSENTOS_DESDE = "SELECT assento_id, status, pedidos FROM assentos WHERE versao > ? ORDER BY assento_id"
+    _SQL_VERSAO = "SELECT versao FROM versao_voo WHERE id = 1"
+    # A época é sorteada uma vez, quando o arquivo do voo é criado (o primeiro worker vence).
+    _SQL_DEFINIR_EPOCA = "UPDATE versao_voo SET epoca = ? WHERE id = 1 AND epoca IS NULL"
+    _SQL_EPOCA = "SELECT epoca FROM versao_voo WHERE id = 1"
+    # A versão do voo e a do assento mudam na mesma transação do pedido.
+    _SQL_AVANCAR_VERSAO = "UPDATE versao_voo SET versao = versao + 1 WHERE id = 1"
+    _SQL_VERSIONAR_ASSENTO = "UPDATE assentos SET versao = (SELECT versao FROM versao_voo WHERE id = 1) WHERE assento_id = ?"
+    _SQL_ESTOQUE = "SELECT estoque FROM snacks WHERE snack_id = ?"
+    # Compare-and-increment: só incrementa se o limite do plano ainda não foi atingido.
+    _SQL_INCREMENTAR = """
+        UPDATE assentos SET pedidos = pedidos + 1
+        WHERE assento_id = ? AND (limite IS NULL OR pedidos < limite)
+    """
+    # Baixa no estoque somente se ainda houver unidades (estoque NULL = sem controle).
+    _SQL_BAIXAR_ESTOQUE = """
+        UPDATE snacks SET estoque = estoque - 1
+        WHERE snack_id = ? AND (estoque IS NULL OR estoque > 0)
+    """
+    _SQL_INSERIR_PEDIDO = "INSERT INTO pedidos (assento_id, snack_id, criado_em) VALUES (?, ?, ?)"
+
+    def __init__(self, codigo, caminho, snacks=None, assentos=None, estoque=None, tamanho_pool=4):
+        self.codigo = codigo
+        self.caminho = caminho
+        # Conexões abertas sob demanda, até 'tamanho_pool' por voo.
+        self._pool = queue.LifoQueue()
+        self._tamanho_pool = tamanho_pool
+        self._abertas = 0
+        self._trava_pool = threading.Lock()
+
+        with self._conexao() as con:
+            con.executescript(self._SQL_TABELAS)
+            # Dados iniciais: só entram se ainda não existirem (reinícios preservam o estado).
+            con.execute("BEGIN IMMEDIATE")
+            if snacks:
+                con.executemany(self._SQL_INSERIR_SNACK, [
+                    (snack_id, s["name"], s["image_url"], (estoque or {}).get(snack_id))
+                    for snack_id, s in snacks.items()
+                ])
+            if assentos:
+                con.executemany(self._SQL_INSERIR_ASSENTO, [
+                    (assento_id, a["Status"], a.get("Pedidos", 0), LIMITES_POR_PLANO.get(a["Status"]))
+                    for assento_id, a in assentos.items()
+                ])
+            con.execute(self._SQL_DEFINIR_EPOCA, (nova_epoca(),))
+            con.execute("COMMIT")
+            self.epoca = con.execute(self._SQL_EPOCA).fetchone()[0]
+            # O cardápio não é alterado pela API: fica em memória para não consultar o banco a cada pedido.
+            self._snacks = {
+                snack_id: {"name": name, "image_url": image_url}
+                for snack_id, name, image_url in con.execute(self._SQL_SNACKS)
+            }
+
+    def _conectar(self):
+        # isolation_level=None: as transações são controladas explicitamente (BEGIN/COMMIT).
+        con = sqlite3.connect(self.caminho, isolation_level=None, check_same_thread=False, timeout=5.0)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("PRAGMA foreign_keys=ON")
+        return con
+
+    @contextmanager
+    def _conexao(self):
+        try:
+            con = self._pool.get_nowait()
+        except queue.Empty:
+            with self._trava_pool:
+                abrir = self._abertas < self._tamanho_pool
+                if abrir:
+                    self._abertas += 1
+            con = self._conectar() if abrir else self._pool.get()
+        try:
+            yield con
+        finally:
+            self._pool.put(con)
+
+    def listar_snacks(self):
+        # Nome e imagem vêm da memória; o estoque é lido do banco (compartilhado entre workers).
+        with self._conexao() as con:
+            estoques = dict(con.execute(self._SQL_ESTOQUES).fetchall())
+        return {
+            snack_id: {**snack, "estoque": estoques.get(snack_id)}
+            for snack_id, snack in self._snacks.items()
+        }
+
+    def nome_snack(self, snack_id):
+        return self._snacks[snack_id]["name"]
+
+    def listar_assentos(self):
+        with self._conexao() as con:
+            return {
+                assento_id: {"Status": status, "Pedidos": pedidos}
+                for assento_id, status, pedidos in con.execute(self._SQL_ASSENTOS)
+            }
+
+    def assentos_desde(self, versao=None):
+        with self._conexao() as con:
+            # Transação de leitura: versão e assentos vêm da mesma fotografia do banco (WAL).
+            con.execute("BEGIN")
+            try:
+                atual = con.execute(self._SQL_VERSAO).fetchone()[0]
+                if versao is None:
+                    linhas = con.execute(self._SQL_ASSENTOS)
+                else:
+                    linhas = con.execute(self._SQL_ASSENTOS_DESDE, (versao,))
+                assentos = {
+                    assento_id: {"Status": status, "Pedidos": pedidos}
+                    for assento_id, status, pedidos in linhas
+                }
+            finally:
+                con.execute("COMMIT")
+            return atual, assentos
+
+    def versao_atual(self):
+        with self._conexao() as con:
+            return con.execute(self._SQL_VERSAO).fetchone()[0]
+
+    def aguardar_mudanca(self, versao, timeout, intervalo=0.2):
+        # Outros workers também alteram o arquivo: a espera é feita consultando a versão.
+        limite = time.monotonic() + timeout
+        while True:
+            if self.versao_atual() > versao:
+                return True
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return False
+            time.sleep(min(intervalo, restante))
+
+    def registrar_pedido(self, assento_id, snack_id):
+        # O SQLite converteria "2" em 2; em memória só números inteiros são aceitos.
+        if type(assento_id) is not int:
+            return ASSENTO_INEXISTENTE, None
+        if type(snack_id) is not int:
+            return SNACK_INEXISTENTE, None
+
+        with self._conexao() as con:
+            # Caminho rápido: leitura sem trava de escrita; snack esgotado é recusado antes da transação.
+            linha = con.execute(self._SQL_ESTOQUE, (snack_id,)).fetchone()
+            if linha is not None and linha[0] is not None and linha[0] <= 0:
+                return SEM_ESTOQUE, None
+
+            # BEGIN IMMEDIATE reserva a escrita já no início, evitando conflitos entre workers.
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                linha = con.execute(self._SQL_ASSENTO, (assento_id,)).fetchone()
+                if linha is None:
+                    con.execute("ROLLBACK")
+                    return ASSENTO_INEXISTENTE, None
+                if con.execute(self._SQL_ESTOQUE, (snack_id,)).fetchone() is None:
+                    con.execute("ROLLBACK")
+                    return SNACK_INEXISTENTE, None
+
+                status, pedidos = linha
+                if con.execute(self._SQL_INCREMENTAR, (assento_id,)).rowcount == 0:
+                    con.execute("ROLLBACK")
+                    return RECUSADO, {"Status": status, "Pedidos": pedidos}
+                if con.execute(self._SQL_BAIXAR_ESTOQUE, (snack_id,)).rowcount == 0:
+                    con.execute("ROLLBACK")
+                    return SEM_ESTOQUE, {"Status": status, "Pedidos": pedidos}
+
+                con.execute(self._SQL_AVANCAR_VERSAO)
+                con.execute(self._SQL_VERSIONAR_ASSENTO, (assento_id,))
+                con.execute(self._SQL_INSERIR_PEDIDO, (assento_id, snack_id, time.time()))
+                con.execute("COMMIT")
+                return SUCESSO, {"Status": status, "Pedidos": pedidos + 1}
+            except BaseException:
+                if con.in_transaction:
+                    con.execute("ROLLBACK")
+                raise
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """
+    Um arquivo SQLite por voo (<diretorio>/<codigo_voo>.db). Como cada arquivo
+    tem sua própria trava de escrita, pedidos de voos diferentes não se bloqueiam.
+    """
+
+    def __init__(self, diretorio, snacks):
+        self.diretorio = diretorio
+        self.snacks = snacks
+        self._voos = {}
+        self._trava = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, codigo_voo):
+        return os.path.join(self.diretorio, f"{codigo_voo}.db")
+
+    def voo(self, codigo_voo):
+        voo = self._voos.get(codigo_voo)
+        if voo is not None or not codigo_voo_valido(codigo_voo):
+            return voo
+        # Voo criado por outro worker: abre o arquivo existente.
+        if os.path.exists(self._caminho(codigo_voo)):
+            return self.criar_voo(codigo_voo, None)
+        return None
+
+    def criar_voo(self, codigo_voo, assentos, estoque=None):
+        if not codigo_voo_valido(codigo_voo):
+            raise ValueError(f"Código de voo inválido: {codigo_voo!r}")
+        # Valida os planos antes de criar o arquivo do voo (mesmo erro do MapaAssentos).
+        planos_invalidos = {a["Status"] for a in (assentos or {}).values()} - set(PLANOS)
+        if planos_invalidos:
+            raise KeyError(", ".join(sorted(planos_invalidos)))
+        with self._trava:
+            voo = self._voos.get(codigo_voo)
+            if voo is None:
+                voo = VooSQLite(codigo_voo, self._caminho(codigo_voo), self.snacks, assentos, estoque)
+                self._voos[codigo_voo] = voo
+            return voo
+
+    def listar_voos(self):
+        codigos = {
+            nome[:-3] for nome in os.listdir(self.diretorio)
+            if nome.endswith(".db") and codigo_voo_valido(nome[:-3])
+        }
+        return sorted(codigos | set(self._voos))
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# Pipeline de imagens (ativos estáticos) dos snacks.
+# Os PNGs originais em static/IMG/ somam ~600 KB e eram baixados inteiros a cada
+# abertura do cardápio. Este módulo gera, para cada imagem, uma miniatura em WebP
+# com o hash do conteúdo no nome (ex.: Amendoim.3f9a0c1b2d.webp) em static/ativos/,
+# e um manifesto (manifesto.json) ligando o caminho original ao gerado.
+# Como o nome muda sempre que o conteúdo muda, esses arquivos podem ser servidos
+# com cache "immutable" de um ano: o tablet só baixa de novo o que de fato mudou.
+# PNG e WebP já são comprimidos; gzip/brotli por cima não reduz o tamanho, então
+# a economia vem da própria recodificação (WebP com perdas e miniatura).
+#
+# Gerar (requer Pillow, só na hora de gerar; a API só lê o manifesto):
+#   python ativos.py
+
+import hashlib
+import json
+import os
+
+DIRETORIO_STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIRETORIO_ORIGEM = os.path.join(DIRETORIO_STATIC, "IMG")
+DIRETORIO_ATIVOS = os.path.join(DIRETORIO_STATIC, "ativos")
+CAMINHO_MANIFESTO = os.path.join(DIRETORIO_ATIVOS, "manifesto.json")
+
+# URLs sob este prefixo têm hash no nome e nunca mudam de conteúdo.
+PREFIXO_ATIVOS = "/static/ativos/"
+CACHE_IMUTAVEL = "public, max-age=31536000, immutable"
+
+# Maior lado da miniatura, em pixels: o card mostra a imagem em metade da sua largura.
+TAMANHO_MINIATURA = 256
+QUALIDADE_WEBP = 80
+
+
+def impressao_digital(conteudo):
+    """
+    Hash curto do conteúdo, usado no nome do arquivo gerado.
+    """
+    return hashlib.blake2b(conteudo, digest_size=5).hexdigest()
+
+
+def gerar_ativos(origem=DIRETORIO_ORIGEM, destino=DIRETORIO_ATIVOS, tamanho=TAMANHO_MINIATURA):
+    """
+    Gera as miniaturas WebP com impressão digital e grava o manifesto.
+    Retorna o manifesto: {"/static/IMG/x.png": "/static/ativos/x.<hash>.webp"}.
+    """
+    import io
+
+    from PIL import Image
+
+    os.makedirs(destino, exist_ok=True)
+    manifesto = {}
+    for nome in sorted(os.listdir(origem)):
+        if not nome.lower().endswith(".png"):
+            continue
+        with Image.open(os.path.join(origem, nome)) as imagem:
+            imagem.thumbnail((tamanho, tamanho))
+            saida = io.BytesIO()
+            imagem.save(saida, "WEBP", quality=QUALIDADE_WEBP, method=6)
+        conteudo = saida.getvalue()
+
+        base = os.path.splitext(nome)[0]
+        nome_gerado = f"{base}.{impressao_digital(conteudo)}.webp"
+        caminho_gerado = os.path.join(destino, nome_gerado)
+        if not os.path.exists(caminho_gerado):
+            with open(caminho_gerado, "wb") as arquivo:
+                arquivo.write(conteudo)
+        manifesto[f"/static/IMG/{nome}"] = PREFIXO_ATIVOS + nome_gerado
+
+    # Remove versões antigas que não estão mais no manifesto.
+    em_uso = {os.path.basename(url) for url in manifesto.values()}
+    for nome in os.listdir(destino):
+        if nome.endswith(".webp") and nome not in em_uso:
+            os.remove(os.path.join(destino, nome))
+
+    with open(os.path.join(destino, "manifesto.json"), "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2, sort_keys=True)
+        arquivo.write("\n")
+    return manifesto
+
+
+def carregar_manifesto(caminho=CAMINHO_MANIFESTO):
+    """
+    Lê o manifesto gerado; sem manifesto, as imagens originais continuam em uso.
+    """
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except FileNotFoundError:
+        return {}
+
+
+def aplicar_manifesto(snacks, manifesto):
+    """
+    Troca o image_url de cada snack pela versão com impressão digital, quando houver.
+    """
+    for snack in snacks.values():
+        snack["image_url"] = manifesto.get(snack["image_url"], snack["image_url"])
+    return snacks
+
+
+def cabecalho_cache(caminho):
+    """
+    Cache-Control para um caminho servido em /static, ou None para o padrão.
+    """
+    if caminho.startswith(PREFIXO_ATIVOS) and not caminho.endswith(".json"):
+        return CACHE_IMUTAVEL
+    return None
+
+
+if __name__ == "__main__":
+    for original, gerado in gerar_ativos().items():
+        print(f"{original} -> {gerado}")
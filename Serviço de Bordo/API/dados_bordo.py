@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Dados e configuração do serviço de bordo, compartilhados pela API Flask
+# (API_Servico_de_Bordo.py) e pela API assíncrona (API_Servico_de_Bordo_ASGI.py).
+
+import atexit
+import os
+
+# Camada de armazenamento (memória ou SQLite) e núcleo de processamento de pedidos.
+from armazenamento import ArmazenamentoMemoria, ArmazenamentoSQLite, carregar_cabines
+from ativos import aplicar_manifesto, carregar_manifesto
+from pedidos import ProcessadorPedidos
+from registro_pedidos import RegistroPedidos
+
+# --- Camada de Dados ---
+# Em um sistema real, esses dados viriam de um banco de dados (ex: PostgreSQL, Oracle).
+# Para este protótipo, vamos mantê-los em memória como variáveis globais.
+# Isso simula o "estado" do nosso serviço de bordo.
+
+SNACKS = {
+    1: {"name": 'Amendoim', "image_url": '/static/IMG/Amendoim.png'},
+    2: {"name": 'Aviõezinhos', "image_url": '/static/IMG/Aviaozin.png'}, 
+    3: {"name": 'Bolinho', "image_url": '/static/IMG/bolo.png'},
+    4: {"name": 'Bolinho Sabor Laranja', "image_url": '/static/IMG/Bolinho.png'},
+    5: {"name": 'Batatinhas Chips', "image_url": '/static/IMG/Chips.png'},
+    6: {"name": 'Cookie Integral', "image_url": '/static/IMG/Cookie.png'},
+    7: {"name": 'Goiabinha Integral', "image_url": '/static/IMG/Goiabinha.png'},
+    8: {"name": 'Maçã', "image_url": '/static/IMG/Maca.png'},
+    9: {"name": 'Pão na Chapa', "image_url": '/static/IMG/Pao.png'},
+    10: {"name": 'Polvilho Salgado', "image_url": '/static/IMG/Polvilho.png'},
+    11: {"name": 'Queijo Integral', "image_url": '/static/IMG/Queijo.png'},
+    12: {"name": 'Torresminho', "image_url": '/static/IMG/Torresminho.png'}
+}
+
+# Se as miniaturas já foram geradas (python ativos.py), o cardápio aponta para
+# elas (WebP com hash no nome, cache longo); senão, para os PNGs originais.
+aplicar_manifesto(SNACKS, carregar_manifesto())
+
+# Estoque inicial do carrinho para este voo (unidades por snack_id).
+# Snacks fora deste dicionário não têm controle de quantidade.
+ESTOQUE = {
+    1: 30, 2: 30, 3: 20, 4: 20, 5: 30, 6: 25,
+    7: 25, 8: 15, 9: 15, 10: 30, 11: 20, 12: 20
+}
+
+# Estrutura de dados otimizada. Usar um dicionário com o número do assento como chave
+# permite acesso direto e mais rápido (O(1)) do que percorrer uma lista (O(n)).
+# Isso é uma otimização de performance importante em sistemas de larga escala.
+ASSENTOS = {
+    1: {"Status": 'Topázio', "Pedidos": 0},
+    2: {"Status": 'Básico', "Pedidos": 0},
+    3: {"Status": 'Básico', "Pedidos": 0},
+    4: {"Status": 'Diamante', "Pedidos": 0},
+    5: {"Status": 'Safira', "Pedidos": 0},
+    6: {"Status": 'Safira', "Pedidos": 0},
+    10: {"Status": 'Básico', "Pedidos": 0},
+    22: {"Status": 'Topázio', "Pedidos": 0},
+    23: {"Status": 'Topázio', "Pedidos": 0}
+}
+
+# Voo atendido pelas rotas originais (/api/assentos e /api/pedido), que não
+# informam o voo. Os dicionários acima são o mapa de assentos e o estoque dele.
+VOO_PADRAO = "AD4070"
+
+# Por padrão o estado fica em memória, como antes. Definindo a variável de ambiente
+# SERVICO_BORDO_DIRETORIO_BANCO com um diretório, cada voo passa a ter seu próprio
+# arquivo SQLite ali: o estado sobrevive a reinícios e pode ser compartilhado entre
+# vários workers (ex.: gunicorn -w 4).
+DIRETORIO_BANCO = os.environ.get("SERVICO_BORDO_DIRETORIO_BANCO")
+if DIRETORIO_BANCO:
+    ARMAZENAMENTO = ArmazenamentoSQLite(DIRETORIO_BANCO, SNACKS)
+else:
+    ARMAZENAMENTO = ArmazenamentoMemoria(SNACKS)
+ARMAZENAMENTO.criar_voo(VOO_PADRAO, ASSENTOS, ESTOQUE)
+
+# Voos adicionais em JSON Lines (ex.: cabines geradas por Ferramentas/gerar_dados.py),
+# indicados pela variável de ambiente SERVICO_BORDO_ARQUIVO_CABINES.
+ARQUIVO_CABINES = os.environ.get("SERVICO_BORDO_ARQUIVO_CABINES")
+if ARQUIVO_CABINES:
+    carregar_cabines(ARMAZENAMENTO, ARQUIVO_CABINES)
+
+# Registro de auditoria dos pedidos (voo, assento, snack, plano, horário, resultado e situação).
+# Ativado com SERVICO_BORDO_REGISTRO=<arquivo .jsonl>; a gravação é feita em lotes
+# por uma thread de fundo, a cada SERVICO_BORDO_REGISTRO_INTERVALO segundos, com a
+# política de fsync de SERVICO_BORDO_REGISTRO_FSYNC ('nunca', 'lote' ou 'fechar').
+CAMINHO_REGISTRO = os.environ.get("SERVICO_BORDO_REGISTRO")
+if CAMINHO_REGISTRO:
+    REGISTRO = RegistroPedidos(
+        CAMINHO_REGISTRO,
+        intervalo=float(os.environ.get("SERVICO_BORDO_REGISTRO_INTERVALO", "1.0")),
+        fsync=os.environ.get("SERVICO_BORDO_REGISTRO_FSYNC", "lote"),
+    )
+    # Garante que os pedidos ainda na fila sejam gravados ao encerrar o servidor.
+    atexit.register(REGISTRO.fechar)
+else:
+    REGISTRO = None
+
+# O processador aplica a regra de negócio de forma atômica por assento,
+# evitando que dois pedidos simultâneos do mesmo assento 'Básico' sejam aceitos.
+PROCESSADOR = ProcessadorPedidos(REGISTRO)
+
+# Tempo máximo (segundos) que um long-poll de assentos pode ficar aguardando.
+ESPERA_MAXIMA = 30.0
+
+# Quantidade máxima de itens em um pedido em lote (uma seção inteira da cabine).
+LIMITE_LOTE = 500
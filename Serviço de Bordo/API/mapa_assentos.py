@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Mapa de assentos compacto de um voo.
+# Em vez de um dicionário de dicionários ({assento: {"Status": ..., "Pedidos": ...}}),
+# cada voo guarda arrays contíguos: o plano de fidelidade vira um código de 1 byte
+# e os pedidos um contador inteiro, ambos indexados pela posição do assento.
+# Um índice direto (número do assento -> posição) mantém o acesso O(1).
+# Cada assento guarda também a versão do voo em que mudou pela última vez,
+# o que permite responder apenas "o que mudou desde a versão N".
+# Para aeronaves de 180 a 300 assentos isso ocupa poucos kilobytes por voo.
+
+from array import array
+
+# Planos de fidelidade conhecidos; o código de cada plano é sua posição na tupla.
+PLANOS = ('Básico', 'Safira', 'Topázio', 'Diamante')
+CODIGO_PLANO = {plano: codigo for codigo, plano in enumerate(PLANOS)}
+
+SEM_POSICAO = -1
+
+
+class MapaAssentos:
+    """
+    Assentos de um voo em arrays indexados por posição.
+    """
+
+    __slots__ = ("numeros", "planos", "pedidos", "versoes", "_indice")
+
+    def __init__(self, assentos):
+        """
+        'assentos' segue o formato original: {numero: {"Status": plano, "Pedidos": n}}.
+        """
+        numeros = sorted(assentos)
+        self.numeros = array('H', numeros)
+        self.planos = array('B', (CODIGO_PLANO[assentos[n]["Status"]] for n in numeros))
+        self.pedidos = array('I', (assentos[n].get("Pedidos", 0) for n in numeros))
+        self.versoes = array('Q', bytes(8 * len(numeros)))
+        # Índice direto: a posição de um assento é lida sem hash nem busca.
+        self._indice = array('h', [SEM_POSICAO]) * ((numeros[-1] + 1) if numeros else 0)
+        for posicao, numero in enumerate(numeros):
+            self._indice[numero] = posicao
+
+    def posicao(self, assento_id):
+        """
+        Posição do assento nos arrays, ou SEM_POSICAO se ele não existir.
+        """
+        if type(assento_id) is not int or not 0 <= assento_id < len(self._indice):
+            return SEM_POSICAO
+        return self._indice[assento_id]
+
+    def plano(self, posicao):
+        return PLANOS[self.planos[posicao]]
+
+    def assento(self, posicao):
+        # Mesmo formato de antes, para manter o contrato JSON da API.
+        return {"Status": PLANOS[self.planos[posicao]], "Pedidos": self.pedidos[posicao]}
+
+    def como_dict(self):
+        return {
+            numero: {"Status": PLANOS[plano], "Pedidos": pedidos}
+            for numero, plano, pedidos in zip(self.numeros, self.planos, self.pedidos)
+        }
+
+    def desde(self, versao):
+        """
+        Assentos alterados depois da versão informada (no formato de como_dict()).
+        """
+        return {
+            self.numeros[posicao]: self.assento(posicao)
+            for posicao, versao_assento in enumerate(self.versoes)
+            if versao_assento > versao
+        }
+
+    def __len__(self):
+        return len(self.numeros)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+# Núcleo de processamento de pedidos do serviço de bordo.
+# A regra de negócio (um snack por viagem para o plano 'Básico') faz uma
+# verificação seguida de um incremento. Essa operação é delegada ao
+# armazenamento (ver armazenamento.py), que a executa de forma atômica:
+# travas listradas por assento em memória, ou um UPDATE condicional no SQLite.
+# Aqui ficam apenas as mensagens e os códigos HTTP de cada situação, além do
+# envio de cada tentativa para o registro de pedidos (quando configurado).
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from armazenamento import ASSENTO_INEXISTENTE, RECUSADO, SEM_ESTOQUE, SNACK_INEXISTENTE
+from metricas import METRICAS
+
+# Resultado de cada pedido (status da resposta e situação no armazenamento, ex.:
+# recusado/recusado = regra do plano 'Básico', recusado/sem_estoque = snack esgotado)
+# e tempo da operação atômica no armazenamento (ver /metrics).
+PEDIDOS = METRICAS.contador(
+    "pedidos_total", "Pedidos processados, por status da resposta e situação.", ("status", "situacao"))
+TEMPO_REGISTRO = METRICAS.histograma(
+    "pedido_registro_segundos", "Duração da operação atômica de registro do pedido no armazenamento.")
+
+
+@dataclass
+class ResultadoPedido:
+    """
+    Resultado do processamento de um pedido, independente do framework web.
+    """
+    status: str                 # 'sucesso', 'recusado' ou 'erro'
+    mensagem: str
+    codigo_http: int = 200
+    dados_assento: Optional[dict] = field(default=None)
+
+    def como_dict(self):
+        corpo = {"status": self.status, "mensagem": self.mensagem}
+        if self.dados_assento is not None:
+            corpo["dados_assento"] = self.dados_assento
+        return corpo
+
+
+def validar_lote(dados, limite):
+    """
+    Valida o corpo de um pedido em lote ({"pedidos": [...]}).
+    Retorna (itens, None) ou (None, ResultadoPedido com o erro).
+    """
+    itens = dados.get("pedidos") if isinstance(dados, dict) else None
+    if not isinstance(itens, list) or not itens:
+        return None, ResultadoPedido("erro", "Estrutura da requisição inválida.", 400)
+    if len(itens) > limite:
+        return None, ResultadoPedido("erro", f"O lote aceita no máximo {limite} pedidos.", 413)
+    return itens, None
+
+
+def resumir_lote(itens, resultados):
+    """
+    Monta o corpo da resposta de um lote: o resultado de cada item, na ordem
+    recebida, e um resumo com a quantidade por status.
+    """
+    resumo = {"sucesso": 0, "recusado": 0, "erro": 0}
+    corpo_resultados = []
+    for item, resultado in zip(itens, resultados):
+        resumo[resultado.status] += 1
+        corpo = resultado.como_dict()
+        corpo["codigo_http"] = resultado.codigo_http
+        if isinstance(item, dict):
+            corpo["assento_id"], corpo["snack_id"] = item.get("assento_id"), item.get("snack_id")
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            corpo["assento_id"], corpo["snack_id"] = item
+        corpo_resultados.append(corpo)
+    return {"status": "processado", "resumo": resumo, "resultados": corpo_resultados}
+
+
+class ProcessadorPedidos:
+    """
+    Aplica a regra de pedidos sobre o estado de um voo e traduz o resultado
+    para a resposta da API.
+    """
+
+    def __init__(self, registro=None):
+        # Registro opcional (ver registro_pedidos.py) para a trilha de auditoria.
+        self.registro = registro
+
+    def processar(self, voo, assento_id, snack_id):
+        with TEMPO_REGISTRO.medir():
+            situacao, dados_assento = voo.registrar_pedido(assento_id, snack_id)
+        resultado = self._resultado(voo, situacao, dados_assento, assento_id, snack_id)
+        PEDIDOS.inc(resultado.status, situacao)
+
+        if self.registro is not None:
+            plano = dados_assento["Status"] if dados_assento else None
+            self.registro.registrar(voo.codigo, assento_id, snack_id, plano, resultado.status, situacao)
+        return resultado
+
+    def processar_lote(self, voo, itens):
+        """
+        Processa uma lista de pedidos em uma única passada, na ordem recebida.
+        Cada item pode ser {"assento_id": ..., "snack_id": ...} ou um par [assento_id, snack_id].
+        Retorna um ResultadoPedido por item; itens malformados não interrompem o lote.
+        """
+        resultados = []
+        for item in itens:
+            if isinstance(item, dict) and "assento_id" in item and "snack_id" in item:
+                assento_id, snack_id = item["assento_id"], item["snack_id"]
+            elif isinstance(item, (list, tuple)) and len(item) == 2:
+                assento_id, snack_id = item
+            else:
+                PEDIDOS.inc("erro", "item_invalido")
+                resultados.append(ResultadoPedido("erro", "Estrutura do item inválida.", 400))
+                continue
+            resultados.append(self.processar(voo, assento_id, snack_id))
+        return resultados
+
+    def _resultado(self, voo, situacao, dados_assento, assento_id, snack_id):
+        # Snack esgotado no carrinho: 409 (Conflict), o pedido não pode ser atendido agora.
+        if situacao == SEM_ESTOQUE:
+            nome_snack = voo.nome_snack(snack_id)
+            return ResultadoPedido("recusado", f"O snack '{nome_snack}' está esgotado.", 409)
+
+        # Verifica se o assento e o snack existem em nossa "base de dados".
+        if situacao == ASSENTO_INEXISTENTE:
+            return ResultadoPedido("erro", f"Assento {assento_id} não encontrado.", 404)
+        if situacao == SNACK_INEXISTENTE:
+            return ResultadoPedido("erro", f"Snack com ID {snack_id} é inválido.", 400)
+
+        # A regra para clientes 'Básico'
+        if situacao == RECUSADO:
+            return ResultadoPedido(
+                "recusado",
+                "Seu plano de fidelidade permite apenas um snack por viagem.",
+                403,
+            )
+
+        nome_snack = voo.nome_snack(snack_id)
+        return ResultadoPedido(
+            "sucesso",
+            f"Pedido do snack '{nome_snack}' para o assento {assento_id} realizado com sucesso!",
+            200,
+            dados_assento,
+        )
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Livro de registro (ledger) dos pedidos do serviço de bordo.
+# Cada tentativa de pedido gera uma linha (voo, assento, snack, plano, horário,
+# resultado e situação) em um arquivo JSON Lines, somente de acréscimo
+# (append-only), usado na conciliação do estoque do carrinho. O resultado é o
+# status da resposta ('sucesso', 'recusado', 'erro'); a situação diz o motivo
+# (ex.: 'recusado' = limite do plano 'Básico', 'sem_estoque' = snack esgotado).
+# Para não fazer uma escrita em disco a cada pedido, os registros entram em uma
+# fila em memória e uma thread de fundo grava em lotes, a cada 'intervalo'
+# segundos ou quando o lote atinge 'tamanho_lote'.
+
+import json
+import os
+import queue
+import threading
+import time
+
+# Políticas de fsync: nunca (deixa a cargo do sistema operacional),
+# a cada lote gravado, ou ao fechar o registro.
+FSYNC_NUNCA = "nunca"
+FSYNC_LOTE = "lote"
+FSYNC_FECHAR = "fechar"
+
+# Colocado na fila por fechar(): acorda a thread de fundo sem esperar o intervalo.
+_FIM = object()
+
+
+class RegistroPedidos:
+    """
+    Registro de pedidos com escrita assíncrona em lotes (write-behind).
+    """
+
+    def __init__(self, caminho, intervalo=1.0, tamanho_lote=500, fsync=FSYNC_LOTE):
+        if fsync not in (FSYNC_NUNCA, FSYNC_LOTE, FSYNC_FECHAR):
+            raise ValueError(f"Política de fsync inválida: {fsync}")
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.tamanho_lote = tamanho_lote
+        self.fsync = fsync
+        self._fila = queue.SimpleQueue()
+        self._parar = threading.Event()
+        self._arquivo = open(caminho, "ab")
+        self._thread = threading.Thread(target=self._gravar_continuamente, name="registro-pedidos", daemon=True)
+        self._thread.start()
+
+    def registrar(self, codigo_voo, assento_id, snack_id, plano, resultado, situacao):
+        # Só coloca o registro na fila; a gravação acontece na thread de fundo.
+        self._fila.put({
+            "codigo_voo": codigo_voo,
+            "assento_id": assento_id,
+            "snack_id": snack_id,
+            "plano": plano,
+            "horario": time.time(),
+            "resultado": resultado,
+            "situacao": situacao,
+        })
+
+    def _coletar_lote(self, prazo):
+        lote = []
+        while len(lote) < self.tamanho_lote:
+            restante = prazo - time.monotonic()
+            try:
+                if restante > 0:
+                    item = self._fila.get(timeout=restante)
+                else:
+                    item = self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is _FIM:
+                break
+            lote.append(item)
+        return lote
+
+    def _gravar(self, lote):
+        if not lote:
+            return
+        linhas = b"".join(
+            json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            for item in lote
+        )
+        self._arquivo.write(linhas)
+        self._arquivo.flush()
+        if self.fsync == FSYNC_LOTE:
+            os.fsync(self._arquivo.fileno())
+
+    def _gravar_continuamente(self):
+        while not self._parar.is_set():
+            self._gravar(self._coletar_lote(time.monotonic() + self.intervalo))
+        # Esvazia o que sobrou na fila antes de encerrar.
+        while True:
+            lote = self._coletar_lote(time.monotonic())
+            if not lote:
+                break
+            self._gravar(lote)
+
+    def fechar(self):
+        """
+        Grava os registros pendentes e fecha o arquivo.
+        """
+        self._parar.set()
+        self._fila.put(_FIM)
+        self._thread.join()
+        if self.fsync != FSYNC_NUNCA:
+            os.fsync(self._arquivo.fileno())
+        self._arquivo.close()
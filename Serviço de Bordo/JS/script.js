@@ -7,6 +7,9 @@ document.addEventListener('DOMContentLoaded', () => {
     const urlParams = new URLSearchParams(window.location.search);
     // Pega o valor do parâmetro 'assento'. Será null se não existir.
     const MEU_ASSENTO_ID = urlParams.get('assento');
+    // Parâmetro opcional 'voo' (ex: ...?assento=4&voo=AD2550). Sem ele, a API usa o voo padrão.
+    const CODIGO_VOO = urlParams.get('voo');
+    const API_VOO = CODIGO_VOO ? `${API_URL}/voos/${encodeURIComponent(CODIGO_VOO)}` : API_URL;
 
     // Referências aos elementos HTML que vamos manipular.
     const snacksContainer = document.getElementById('snacks-container');
@@ -31,16 +34,18 @@ document.addEventListener('DOMContentLoaded', () => {
      */
     async function carregarSnacks() {
         try {
-            const response = await fetch(`${API_URL}/snacks`);
+            const response = await fetch(`${API_VOO}/snacks`);
             const data = await response.json();
             snacksContainer.innerHTML = ''; // Limpa a mensagem "Carregando...".
 
             for (const id in data.snacks) {
-                // Agora 'snack' é um objeto com 'name' e 'image_url'
+                // Agora 'snack' é um objeto com 'name', 'image_url' e 'estoque'
                 const snack = data.snacks[id];
+                // estoque null = sem controle de quantidade; 0 = esgotado no carrinho.
+                const esgotado = snack.estoque === 0;
                 
                 const card = document.createElement('div');
-                card.className = 'snack-card';
+                card.className = esgotado ? 'snack-card esgotado' : 'snack-card';
                 
                 // Usamos 'dataset' para armazenar o ID do snack.
                 card.dataset.snackId = id;
@@ -49,11 +54,12 @@ document.addEventListener('DOMContentLoaded', () => {
                 // Usamos template literals (crases ``) para facilitar a montagem.
                 card.innerHTML = `
                     <img src="${API_URL.replace('/api', '')}${snack.image_url}" alt="${snack.name}">
-                    <span>${snack.name}</span>
+                    <span>${snack.name}${esgotado ? ' (esgotado)' : ''}</span>
                 `;
 
                 // Adiciona o evento de clique para a seleção.
                 card.addEventListener('click', () => {
+                    if (esgotado) return;
                     const currentSelected = document.querySelector('.snack-card.selected');
                     if (currentSelected) {
                         currentSelected.classList.remove('selected');
@@ -70,17 +76,27 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Última versão do mapa de assentos recebida. Depois da primeira carga,
+    // pedimos à API apenas os assentos que mudaram desde essa versão.
+    let versaoAssentos = null;
+
     /**
-     * Função para buscar os dados de todos os assentos, mas renderizar apenas o assento atual.
+     * Função para buscar os dados dos assentos, mas renderizar apenas o assento atual.
      */
     async function carregarMeuAssento() {
         if (!MEU_ASSENTO_ID) return;
 
         try {
-            const response = await fetch(`${API_URL}/assentos`);
+            const consulta = versaoAssentos === null ? '' : `?since=${encodeURIComponent(versaoAssentos)}`;
+            const response = await fetch(`${API_VOO}/assentos${consulta}`);
             const data = await response.json();
+            const recebeuMapaCompleto = versaoAssentos === null || data.completo;
+            versaoAssentos = data.versao;
             const meuAssento = data.assentos[MEU_ASSENTO_ID];
 
+            // Resposta parcial sem o meu assento: nada mudou para ele.
+            if (!meuAssento && !recebeuMapaCompleto) return;
+
             if (meuAssento) {
                 meuAssentoContainer.innerHTML = '';
                 const card = document.createElement('div');
@@ -127,7 +143,7 @@ document.addEventListener('DOMContentLoaded', () => {
         const snackId = selectedCard.dataset.snackId;
 
         try {
-            const response = await fetch(`${API_URL}/pedido`, {
+            const response = await fetch(`${API_VOO}/pedido`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
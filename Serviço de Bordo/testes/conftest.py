@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Os módulos da API se importam como vizinhos (sem pacote): basta pôr API/ no caminho.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "API"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Compartilhado"))
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import httpx
+
+import API_Servico_de_Bordo_ASGI as api
+
+
+def cliente():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://teste")
+
+
+def test_long_poll_acorda_com_o_pedido():
+    async def executar():
+        async with cliente() as http:
+            versao = (await http.get("/api/assentos")).json()["versao"]
+            inicio = time.monotonic()
+            espera = asyncio.create_task(http.get("/api/assentos", params={"since": versao, "espera": "10"}))
+            await asyncio.sleep(0.2)
+            assert not espera.done()
+            # Assento 4 é 'Diamante' (sem limite de pedidos).
+            pedido = await http.post("/api/pedido", json={"assento_id": 4, "snack_id": 1})
+            assert pedido.status_code == 200
+            corpo = (await asyncio.wait_for(espera, 2.0)).json()
+            # Só acorda por evento: sem o aviso do pedido, o long-poll seguiria até os 10 s.
+            assert time.monotonic() - inicio < 2.0
+            assert corpo["completo"] is False
+            assert list(corpo["assentos"]) == ["4"]
+
+    asyncio.run(executar())
+
+
+def test_long_poll_sem_mudanca_espera_o_prazo():
+    async def executar():
+        async with cliente() as http:
+            versao = (await http.get("/api/assentos")).json()["versao"]
+            inicio = time.monotonic()
+            corpo = (await http.get("/api/assentos", params={"since": versao, "espera": "0.3"})).json()
+            assert time.monotonic() - inicio >= 0.3
+            assert corpo["assentos"] == {}
+
+    asyncio.run(executar())
+
+
+def test_since_e_espera_invalidos_recebem_o_mapa_completo():
+    async def executar():
+        async with cliente() as http:
+            resposta = await http.get("/api/assentos", params={"since": "abc", "espera": "abc"})
+            assert resposta.status_code == 200
+            assert resposta.json()["completo"] is True
+
+    asyncio.run(executar())
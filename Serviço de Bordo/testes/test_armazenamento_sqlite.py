@@ -0,0 +1,82 @@
+import sqlite3
+import threading
+from collections import Counter
+
+from armazenamento import RECUSADO, SEM_ESTOQUE, SUCESSO, ArmazenamentoSQLite
+
+SNACKS = {1: {"name": "Amendoim", "image_url": "/static/amendoim.webp"},
+          2: {"name": "Cookie", "image_url": "/static/cookie.webp"}}
+
+
+def _concorrentes(quantidade, tarefa):
+    # Dispara 'quantidade' threads ao mesmo tempo e junta os resultados de tarefa(indice).
+    largada = threading.Barrier(quantidade)
+    resultados = []
+    trava = threading.Lock()
+
+    def executar(indice):
+        largada.wait()
+        resultado = tarefa(indice)
+        with trava:
+            resultados.extend(resultado)
+
+    threads = [threading.Thread(target=executar, args=(indice,)) for indice in range(quantidade)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return Counter(resultados)
+
+
+def test_estoque_nunca_fica_negativo_entre_workers(tmp_path):
+    assentos = {numero: {"Status": "Diamante", "Pedidos": 0} for numero in range(1, 201)}
+    primeiro = ArmazenamentoSQLite(str(tmp_path), SNACKS).criar_voo("AD9999", assentos, {1: 50})
+    # Segundo "worker": outro armazenamento (outro pool) sobre o mesmo arquivo.
+    segundo = ArmazenamentoSQLite(str(tmp_path), SNACKS).voo("AD9999")
+
+    def pedir(indice):
+        voo = (primeiro, segundo)[indice % 2]
+        return [voo.registrar_pedido(1 + (indice * 25 + i) % 200, 1)[0] for i in range(25)]
+
+    situacoes = _concorrentes(8, pedir)
+    assert situacoes == {SUCESSO: 50, SEM_ESTOQUE: 150}
+    assert primeiro.listar_snacks()[1]["estoque"] == 0
+    assert sum(assento["Pedidos"] for assento in segundo.listar_assentos().values()) == 50
+    with sqlite3.connect(primeiro.caminho) as con:
+        assert con.execute("SELECT COUNT(*) FROM pedidos").fetchone()[0] == 50
+        assert con.execute("SELECT versao FROM versao_voo").fetchone()[0] == 50
+
+
+def test_basico_pede_uma_vez_sob_concorrencia(tmp_path):
+    assentos = {1: {"Status": "Básico", "Pedidos": 0}, 2: {"Status": "Diamante", "Pedidos": 0}}
+    voo = ArmazenamentoSQLite(str(tmp_path), SNACKS).criar_voo("AD9999", assentos)
+
+    situacoes = _concorrentes(16, lambda indice: [voo.registrar_pedido(1, 1 + indice % 2)[0] for _ in range(3)])
+    assert situacoes == {SUCESSO: 1, RECUSADO: 47}
+    assert voo.listar_assentos()[1]["Pedidos"] == 1
+    # A recusa não baixou estoque nem avançou a versão.
+    versao, _ = voo.assentos_desde(None)
+    assert versao == 1
+
+
+def test_pool_reaproveita_conexoes(tmp_path):
+    voo = ArmazenamentoSQLite(str(tmp_path), SNACKS).criar_voo(
+        "AD9999", {numero: {"Status": "Diamante", "Pedidos": 0} for numero in range(1, 9)})
+    # Uso sequencial: sempre a mesma conexão.
+    for _ in range(20):
+        voo.registrar_pedido(1, 2)
+        voo.listar_assentos()
+    assert voo._abertas == 1
+
+    _concorrentes(12, lambda indice: [voo.registrar_pedido(1 + indice % 8, 2)[0] for _ in range(10)])
+    assert 1 <= voo._abertas <= voo._tamanho_pool
+    assert voo._pool.qsize() == voo._abertas
+
+
+def test_modo_wal(tmp_path):
+    voo = ArmazenamentoSQLite(str(tmp_path), SNACKS).criar_voo("AD9999", {1: {"Status": "Safira", "Pedidos": 0}})
+    with voo._conexao() as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    # O modo WAL fica gravado no arquivo: vale também para conexões de fora do pool.
+    with sqlite3.connect(voo.caminho) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
@@ -0,0 +1,38 @@
+from armazenamento import MAXIMO_ASSENTOS, SUCESSO, ArmazenamentoMemoria, ArmazenamentoSQLite, cadastrar_voo
+from dados_bordo import ASSENTOS
+
+SNACKS = {1: {"name": "Amendoim", "image_url": "/static/amendoim.webp"}}
+
+
+def _cadastrar(armazenamento, assentos, codigo_voo="AD9999"):
+    return cadastrar_voo(armazenamento, {"codigo_voo": codigo_voo, "assentos": assentos})
+
+
+def test_numeracao_dos_assentos_igual_nos_dois_armazenamentos(tmp_path):
+    for armazenamento in (ArmazenamentoMemoria(SNACKS), ArmazenamentoSQLite(str(tmp_path), SNACKS)):
+        for invalidos in ({"70000": "Básico"}, {str(MAXIMO_ASSENTOS + 1): "Básico"}, {"-1": "Básico"},
+                          {"0": "Básico"}):
+            corpo, codigo_http = _cadastrar(armazenamento, invalidos)
+            assert codigo_http == 400
+            assert f"numerados de 1 a {MAXIMO_ASSENTOS}" in corpo["mensagem"]
+            assert armazenamento.voo("AD9999") is None
+
+        corpo, codigo_http = _cadastrar(armazenamento, {"1": "Básico", "01": "Safira"})
+        assert codigo_http == 400
+        assert "repetidos" in corpo["mensagem"]
+
+        # Cabines com lacunas na numeração são aceitas.
+        corpo, codigo_http = _cadastrar(armazenamento, {"3": "Básico", "1": "Safira", str(MAXIMO_ASSENTOS): "Diamante"})
+        assert codigo_http == 201
+        voo = armazenamento.voo("AD9999")
+        assert sorted(voo.listar_assentos()) == [1, 3, MAXIMO_ASSENTOS]
+        assert voo.registrar_pedido(MAXIMO_ASSENTOS, 1)[0] == SUCESSO
+        assert voo.registrar_pedido(2, 1)[0] != SUCESSO
+
+
+def test_cabine_padrao_passa_pela_validacao_do_cadastro(tmp_path):
+    # A cabine do AD4070 (1-6, 10, 22, 23) tem lacunas e segue a mesma regra do POST /api/voos.
+    for armazenamento in (ArmazenamentoMemoria(SNACKS), ArmazenamentoSQLite(str(tmp_path), SNACKS)):
+        assentos = {str(numero): assento["Status"] for numero, assento in ASSENTOS.items()}
+        assert _cadastrar(armazenamento, assentos, "AD4070")[1] == 201
+        assert sorted(armazenamento.voo("AD4070").listar_assentos()) == sorted(ASSENTOS)
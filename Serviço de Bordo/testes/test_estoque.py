@@ -0,0 +1,55 @@
+import API_Servico_de_Bordo as api
+from armazenamento import (
+    ArmazenamentoMemoria, ArmazenamentoSQLite, ASSENTO_INEXISTENTE, SEM_ESTOQUE, SNACK_INEXISTENTE, SUCESSO,
+    cadastrar_voo,
+)
+
+SNACKS = {1: {"name": "Amendoim", "image_url": "/static/amendoim.webp"},
+          2: {"name": "Cookie", "image_url": "/static/cookie.webp"}}
+ASSENTOS = {numero: {"Status": "Diamante", "Pedidos": 0} for numero in range(1, 6)}
+
+
+def _armazenamentos(tmp_path):
+    return ArmazenamentoMemoria(SNACKS), ArmazenamentoSQLite(str(tmp_path), SNACKS)
+
+
+def test_estoque_esgota_sem_ficar_negativo(tmp_path):
+    for armazenamento in _armazenamentos(tmp_path):
+        voo = armazenamento.criar_voo("AD9999", ASSENTOS, {1: 2})
+        situacoes = [voo.registrar_pedido(1, 1)[0] for _ in range(4)]
+        assert situacoes == [SUCESSO, SUCESSO, SEM_ESTOQUE, SEM_ESTOQUE]
+        assert voo.listar_snacks()[1]["estoque"] == 0
+        assert voo.listar_assentos()[1]["Pedidos"] == 2
+        # Snack sem controle de quantidade continua disponível.
+        assert voo.registrar_pedido(1, 2)[0] == SUCESSO
+
+
+def test_snack_inexistente_igual_nos_dois_armazenamentos(tmp_path):
+    for armazenamento in _armazenamentos(tmp_path):
+        # Estoque de um snack fora do cardápio (criar_voo direto, sem a validação do cadastro).
+        voo = armazenamento.criar_voo("AD9999", ASSENTOS, {1: 0, 99: 0})
+        assert voo.registrar_pedido(1, 99) == (SNACK_INEXISTENTE, None)
+        assert voo.registrar_pedido(99, 99) == (ASSENTO_INEXISTENTE, None)
+        assert voo.registrar_pedido(1, 1) == (SEM_ESTOQUE, None)
+
+
+def test_cadastro_recusa_estoque_de_snack_fora_do_cardapio(tmp_path):
+    for armazenamento in _armazenamentos(tmp_path):
+        corpo, codigo_http = cadastrar_voo(
+            armazenamento, {"codigo_voo": "AD9999", "assentos": {"1": "Básico"}, "estoque": {"99": 0}})
+        assert codigo_http == 400
+        assert "fora do cardápio: 99" in corpo["mensagem"]
+        assert armazenamento.voo("AD9999") is None
+
+
+def test_pedido_de_snack_inexistente_pela_api():
+    cliente = api.app.test_client()
+    resposta = cliente.post("/api/voos", json={"codigo_voo": "AD8009", "assentos": {"1": "Diamante"},
+                                               "estoque": {"1": 0}})
+    assert resposta.status_code == 201
+    resposta = cliente.post("/api/voos/AD8009/pedido", json={"assento_id": 1, "snack_id": 99})
+    assert resposta.status_code == 400
+    assert resposta.get_json()["status"] == "erro"
+    resposta = cliente.post("/api/voos/AD8009/pedido", json={"assento_id": 1, "snack_id": 1})
+    assert resposta.status_code == 409
+    assert "esgotado" in resposta.get_json()["mensagem"]
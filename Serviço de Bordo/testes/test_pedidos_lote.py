@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+
+import API_Servico_de_Bordo as api_flask
+import API_Servico_de_Bordo_ASGI as api_asgi
+from dados_bordo import LIMITE_LOTE
+from pedidos import validar_lote
+
+CABINE = {"assentos": {"1": "Diamante", "2": "Básico", "3": "Safira"}, "estoque": {"1": 1}}
+LOTE = [
+    {"assento_id": 1, "snack_id": 1},       # sucesso (última unidade do snack 1)
+    [3, 1],                                 # snack 1 esgotado
+    {"assento_id": 2, "snack_id": 5},       # sucesso
+    {"assento_id": 2, "snack_id": 6},       # 'Básico' já pediu
+    {"assento_id": 99, "snack_id": 5},      # assento inexistente
+    {"assento_id": 3},                      # item malformado
+]
+
+
+def test_validar_lote():
+    assert validar_lote({"pedidos": [[1, 1]]}, 10) == ([[1, 1]], None)
+    for dados in (None, [], {}, {"pedidos": []}, {"pedidos": "1,1"}):
+        assert validar_lote(dados, 10)[1].codigo_http == 400
+    assert validar_lote({"pedidos": [[1, 1]] * 11}, 10)[1].codigo_http == 413
+
+
+def _conferir(corpo):
+    assert corpo["status"] == "processado"
+    assert corpo["resumo"] == {"sucesso": 2, "recusado": 2, "erro": 2}
+    resultados = corpo["resultados"]
+    assert [r["codigo_http"] for r in resultados] == [200, 409, 200, 403, 404, 400]
+    assert [r["status"] for r in resultados] == ["sucesso", "recusado", "sucesso", "recusado", "erro", "erro"]
+    # Cada resultado identifica o item, inclusive os enviados como par [assento, snack].
+    assert [(r.get("assento_id"), r.get("snack_id")) for r in resultados[:5]] == [
+        (1, 1), (3, 1), (2, 5), (2, 6), (99, 5)]
+    assert resultados[0]["dados_assento"] == {"Status": "Diamante", "Pedidos": 1}
+
+
+def test_lote_misto_flask():
+    cliente = api_flask.app.test_client()
+    assert cliente.post("/api/voos", json={"codigo_voo": "AD8011", **CABINE}).status_code == 201
+    resposta = cliente.post("/api/voos/AD8011/pedidos/lote", json={"pedidos": LOTE})
+    assert resposta.status_code == 200
+    _conferir(resposta.get_json())
+    assert cliente.get("/api/voos/AD8011/snacks").get_json()["snacks"]["1"]["estoque"] == 0
+
+
+def test_lote_misto_asgi():
+    async def executar():
+        transporte = httpx.ASGITransport(app=api_asgi.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as http:
+            assert (await http.post("/api/voos", json={"codigo_voo": "AD8012", **CABINE})).status_code == 201
+            resposta = await http.post("/api/voos/AD8012/pedidos/lote", json={"pedidos": LOTE})
+            assert resposta.status_code == 200
+            _conferir(resposta.json())
+
+    asyncio.run(executar())
+
+
+@pytest.mark.parametrize("quantidade, codigo_http", [(LIMITE_LOTE + 1, 413), (0, 400)])
+def test_lote_fora_do_limite_nao_processa_nada(quantidade, codigo_http):
+    cliente = api_flask.app.test_client()
+    assentos = cliente.get("/api/assentos").get_json()["assentos"]
+    resposta = cliente.post("/api/pedidos/lote", json={"pedidos": [{"assento_id": 4, "snack_id": 2}] * quantidade})
+    assert resposta.status_code == codigo_http
+    assert resposta.get_json()["status"] == "erro"
+    assert cliente.get("/api/assentos").get_json()["assentos"] == assentos
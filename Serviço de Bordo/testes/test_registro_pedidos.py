@@ -0,0 +1,114 @@
+import json
+import time
+
+import pytest
+
+import registro_pedidos
+from armazenamento import ArmazenamentoMemoria
+from pedidos import ProcessadorPedidos
+from registro_pedidos import FSYNC_FECHAR, FSYNC_LOTE, FSYNC_NUNCA, RegistroPedidos
+
+SNACKS = {1: {"name": "Amendoim", "image_url": "/static/amendoim.webp"},
+          2: {"name": "Cookie", "image_url": "/static/cookie.webp"}}
+
+
+def _linhas(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return [json.loads(linha) for linha in arquivo]
+
+
+def _aguardar(condicao, prazo=2.0):
+    limite = time.monotonic() + prazo
+    while not condicao() and time.monotonic() < limite:
+        time.sleep(0.01)
+    return condicao()
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    # Conta as chamadas de fsync sem depender do disco.
+    chamadas = []
+    monkeypatch.setattr(registro_pedidos.os, "fsync", chamadas.append)
+    return chamadas
+
+
+def _registrar(registro, quantidade):
+    for numero in range(quantidade):
+        registro.registrar("AD4070", numero, 1, "Safira", "sucesso", "sucesso")
+
+
+def test_grava_em_lotes(tmp_path, fsyncs):
+    caminho = tmp_path / "pedidos.jsonl"
+    registro = RegistroPedidos(str(caminho), intervalo=30.0, tamanho_lote=3)
+    _registrar(registro, 7)
+    # Dois lotes cheios saem logo; o sétimo aguarda o intervalo (ou o fechamento).
+    assert _aguardar(lambda: len(_linhas(caminho)) == 6)
+    time.sleep(0.1)
+    assert len(_linhas(caminho)) == 6
+    assert len(fsyncs) == 2
+    registro.fechar()
+    assert [linha["assento_id"] for linha in _linhas(caminho)] == list(range(7))
+
+
+def test_grava_no_intervalo_sem_fechar(tmp_path, fsyncs):
+    caminho = tmp_path / "pedidos.jsonl"
+    registro = RegistroPedidos(str(caminho), intervalo=0.05, tamanho_lote=500)
+    _registrar(registro, 2)
+    assert _aguardar(lambda: len(_linhas(caminho)) == 2)
+    registro.fechar()
+
+
+@pytest.mark.parametrize("politica, antes, depois", [
+    (FSYNC_NUNCA, 0, 0),
+    (FSYNC_LOTE, 1, 2),
+    (FSYNC_FECHAR, 0, 1),
+])
+def test_politicas_de_fsync(tmp_path, fsyncs, politica, antes, depois):
+    caminho = tmp_path / "pedidos.jsonl"
+    registro = RegistroPedidos(str(caminho), intervalo=30.0, tamanho_lote=2, fsync=politica)
+    _registrar(registro, 2)
+    assert _aguardar(lambda: len(_linhas(caminho)) == 2)
+    time.sleep(0.05)
+    assert len(fsyncs) == antes
+    registro.fechar()
+    assert len(fsyncs) == depois
+
+
+def test_politica_invalida(tmp_path):
+    with pytest.raises(ValueError):
+        RegistroPedidos(str(tmp_path / "pedidos.jsonl"), fsync="sempre")
+
+
+def test_fechar_grava_tudo_e_encerra(tmp_path, fsyncs):
+    caminho = tmp_path / "pedidos.jsonl"
+    registro = RegistroPedidos(str(caminho), intervalo=30.0, tamanho_lote=64)
+    _registrar(registro, 1000)
+    inicio = time.monotonic()
+    registro.fechar()
+    # Fechar não espera o intervalo de gravação terminar.
+    assert time.monotonic() - inicio < 5.0
+    assert not registro._thread.is_alive()
+    assert registro._arquivo.closed
+    linhas = _linhas(caminho)
+    assert [linha["assento_id"] for linha in linhas] == list(range(1000))
+    assert set(linhas[0]) == {"codigo_voo", "assento_id", "snack_id", "plano", "horario", "resultado", "situacao"}
+
+    # Reabrir acrescenta ao fim do arquivo (append-only).
+    registro = RegistroPedidos(str(caminho))
+    _registrar(registro, 1)
+    registro.fechar()
+    assert len(_linhas(caminho)) == 1001
+
+
+def test_situacao_distingue_esgotado_do_limite_do_plano(tmp_path, fsyncs):
+    caminho = tmp_path / "pedidos.jsonl"
+    registro = RegistroPedidos(str(caminho))
+    voo = ArmazenamentoMemoria(SNACKS).criar_voo(
+        "AD9999", {1: {"Status": "Básico", "Pedidos": 0}, 2: {"Status": "Safira", "Pedidos": 0}}, {1: 1})
+    processador = ProcessadorPedidos(registro)
+    # Snack 1 tem uma unidade; o snack 2 não tem controle de estoque.
+    for assento_id, snack_id in ((1, 1), (1, 2), (2, 1)):
+        processador.processar(voo, assento_id, snack_id)
+    registro.fechar()
+    assert [(linha["resultado"], linha["situacao"]) for linha in _linhas(caminho)] == [
+        ("sucesso", "sucesso"), ("recusado", "recusado"), ("recusado", "sem_estoque")]
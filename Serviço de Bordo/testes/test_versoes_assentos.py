@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import httpx
+
+import API_Servico_de_Bordo as api_flask
+import API_Servico_de_Bordo_ASGI as api_asgi
+from armazenamento import ArmazenamentoMemoria, ArmazenamentoSQLite, SUCESSO, corpo_assentos, corpo_assentos_desde
+
+SNACKS = {1: {"name": "Amendoim", "image_url": "/static/amendoim.webp"}}
+ASSENTOS = {numero: {"Status": "Diamante", "Pedidos": 0} for numero in range(1, 101)}
+
+
+def _pedir(voo, assentos):
+    for assento_id in assentos:
+        assert voo.registrar_pedido(assento_id, 1)[0] == SUCESSO
+
+
+def test_since_de_antes_do_reinicio_recebe_mapa_completo():
+    antes = ArmazenamentoMemoria(SNACKS).criar_voo("AD4070", ASSENTOS)
+    _pedir(antes, range(1, 51))
+    since = corpo_assentos(antes)["versao"]
+
+    # "Reinício": novo processo, contador recomeça e passa da versão que o tablet guardou.
+    depois = ArmazenamentoMemoria(SNACKS).criar_voo("AD4070", ASSENTOS)
+    _pedir(depois, range(1, 61))
+    corpo = corpo_assentos_desde(depois, since)
+    assert corpo["completo"] is True
+    assert len(corpo["assentos"]) == len(ASSENTOS)
+
+
+def test_since_da_mesma_epoca_traz_so_as_mudancas():
+    voo = ArmazenamentoMemoria(SNACKS).criar_voo("AD4070", ASSENTOS)
+    _pedir(voo, [1, 2])
+    since = corpo_assentos(voo)["versao"]
+    _pedir(voo, [7])
+    corpo = corpo_assentos_desde(voo, since)
+    assert corpo["completo"] is False
+    assert list(corpo["assentos"]) == [7]
+
+
+def test_since_malformado_recebe_mapa_completo():
+    voo = ArmazenamentoMemoria(SNACKS).criar_voo("AD4070", ASSENTOS)
+    for since in ("abc", "5", ":5", f"{voo.epoca}:x", f"{voo.epoca}:99"):
+        assert corpo_assentos_desde(voo, since)["completo"] is True
+
+
+def test_epoca_do_sqlite_sobrevive_ao_reinicio(tmp_path):
+    voo = ArmazenamentoSQLite(str(tmp_path), SNACKS).criar_voo("AD4070", ASSENTOS)
+    _pedir(voo, [3])
+    since = corpo_assentos(voo)["versao"]
+    _pedir(voo, [4])
+
+    reaberto = ArmazenamentoSQLite(str(tmp_path), SNACKS).voo("AD4070")
+    assert reaberto.epoca == voo.epoca
+    corpo = corpo_assentos_desde(reaberto, since)
+    assert corpo["completo"] is False
+    assert list(corpo["assentos"]) == [4]
+
+
+def test_since_a_frente_do_contador_nao_espera():
+    voo = ArmazenamentoMemoria(SNACKS).criar_voo("AD4070", ASSENTOS)
+    assert corpo_assentos_desde(voo, f"{voo.epoca}:99")["completo"] is True
+
+    # Mesma época, número que o voo ainda não emitiu: mapa completo na hora, sem long-poll.
+    epoca = corpo_assentos(api_flask.ARMAZENAMENTO.voo(api_flask.VOO_PADRAO))["versao"].partition(":")[0]
+    parametros = {"since": f"{epoca}:999999", "espera": "2"}
+    inicio = time.monotonic()
+    resposta = api_flask.app.test_client().get("/api/assentos", query_string=parametros)
+    assert time.monotonic() - inicio < 1.0
+    assert resposta.get_json()["completo"] is True
+
+    async def pelo_asgi():
+        transporte = httpx.ASGITransport(app=api_asgi.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as http:
+            return (await http.get("/api/assentos", params=parametros)).json()
+
+    inicio = time.monotonic()
+    corpo = asyncio.run(pelo_asgi())
+    assert time.monotonic() - inicio < 1.0
+    assert corpo["completo"] is True
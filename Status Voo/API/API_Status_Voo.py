@@ -1,10 +1,27 @@
+import atexit
+import os
+import sys
+import time
+
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime
 from typing import Optional, List
 
+# Módulos comuns às duas APIs (ex.: metricas.py) ficam em <raiz>/Compartilhado.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Compartilhado"))
+
+from base_voos import BaseVoos, RegistroVoo, calcular_status, compilar_voo, ler_voos_jsonl
+from cache_status import TEMPO_ETAPA, CacheStatus
+from indices_voos import IndicesVoos, ler_data, status_corresponde
+from ingestao_voos import MonitorArquivosVoos
+from metricas import METRICAS, TIPO_CONTEUDO, registrar_requisicao
+from motor_status import MotorStatus
+from resposta_status import RespostaStatusTodos, etag_corresponde, serializar_pagina
+from transmissao_status import TransmissorStatus
+
 # --- 1. Inicialização da API ---
 app = FastAPI(
     title="Azul Status Voo API",
@@ -28,6 +45,18 @@ app.add_middleware(
     allow_headers=["*"], # Permite todos os headers
 )
 
+# --- 1.2. Métricas por Rota ---
+# Latência e código HTTP de cada requisição, expostos em /metrics.
+
+@app.middleware("http")
+async def medir_requisicao(request: Request, call_next):
+    inicio = time.perf_counter()
+    response = await call_next(request)
+    rota = request.scope.get("route")
+    registrar_requisicao(request.method, rota.path if rota is not None else None,
+                         response.status_code, time.perf_counter() - inicio)
+    return response
+
 
 # --- 2. Base de Dados (Atualizada com MAIS VOOS) ---
 # Data de referência atual: 17/10/2025 (Sexta-feira)
@@ -94,6 +123,42 @@ voos = [
     },
 ]
 
+# Base pré-compilada: parsing feito uma vez no carregamento e índice pelo código do voo.
+base_voos = BaseVoos(voos)
+# Voos adicionais em JSON Lines (ex.: escala gerada por Ferramentas/gerar_dados.py),
+# indicados pela variável de ambiente STATUS_VOO_ARQUIVO_VOOS.
+ARQUIVO_VOOS = os.environ.get("STATUS_VOO_ARQUIVO_VOOS")
+if ARQUIVO_VOOS:
+    base_voos.carregar(ler_voos_jsonl(ARQUIVO_VOOS))
+# Escalas em CSV/JSON observadas em tempo de execução: atrasos, novos horários e
+# cancelamentos gravados nesses arquivos entram na base sem reiniciar a API.
+# STATUS_VOO_ARQUIVOS_MONITORADOS lista os arquivos (separados por os.pathsep) e
+# STATUS_VOO_INTERVALO_MONITORAMENTO o intervalo da verificação, em segundos.
+ARQUIVOS_MONITORADOS = [caminho for caminho in
+                        os.environ.get("STATUS_VOO_ARQUIVOS_MONITORADOS", "").split(os.pathsep) if caminho]
+if ARQUIVOS_MONITORADOS:
+    # A primeira leitura é feita aqui, antes de montar índices e caches.
+    monitor_voos = MonitorArquivosVoos(
+        base_voos, ARQUIVOS_MONITORADOS,
+        intervalo=float(os.environ.get("STATUS_VOO_INTERVALO_MONITORAMENTO", "1.0")),
+    )
+else:
+    monitor_voos = None
+# Índices por origem, destino, data e tipo de voo, usados por /status/busca.
+indices_voos = IndicesVoos(base_voos)
+# Motor vetorizado usado para calcular o status de todos os voos de uma vez.
+motor_status = MotorStatus(base_voos)
+# Cache dos status calculados, válido até o próximo instante de mudança.
+cache_status = CacheStatus(base_voos, motor_status)
+# Corpo JSON de /status/all pré-serializado (com ETag) por época de status.
+resposta_todos = RespostaStatusTodos(cache_status)
+# Transmissão (SSE) dos deltas de status para os painéis conectados.
+transmissor_status = TransmissorStatus(base_voos, cache_status)
+# Só agora, com todos os observadores da base registrados, a verificação periódica começa.
+if monitor_voos is not None:
+    monitor_voos.iniciar()
+    atexit.register(monitor_voos.fechar)
+
 # --- 3. Modelos de Dados (Pydantic - Inalterados) ---
 
 class Voo(BaseModel):
@@ -112,7 +177,7 @@ class VooStatusResponse(BaseModel):
     info_voo: Voo
     status_calculado: str
 
-# --- 4. Funções de Lógica (Inalteradas - Funcionam perfeitamente) ---
+# --- 4. Funções de Lógica (Sobre a base pré-compilada) ---
 
 def converter(hora):
     h, m = map(int, hora.split(':'))
@@ -128,77 +193,14 @@ def converterdata(data, txt):
         return a
 
 def encontrar(codigo):
-    for voo in voos:
-        if codigo.upper() == voo["codigo_voo"]:
-            return voo
-    return None
-
-def det_status(voo):
-    atraso = False
-    if voo["status"]:
-        if voo["status"] == "Adiado":
-            retorno = voo["status"] + ' - '
-            atraso = True
-            n_part = converter(voo["nova_partida"])
-            n_cheg = converter(voo["nova_chegada"])
-        else:
-            return voo["status"]
-    else:
-        retorno = ''
-    
-    dia = datetime.now().day
-    mes = datetime.now().month
-    ano = datetime.now().year
-    min = datetime.now().hour * 60 + datetime.now().minute
-    part_min = converter(voo["partida_programada"])
-    cheg_min = converter(voo["chegada_programada"])
-    
-    if atraso:
-        diff = n_part - min
-    else:
-        diff = part_min - min 
-    if atraso:
-        if min > n_cheg:
-            difer = min - n_cheg
-        else:
-            difer = n_cheg - min
-    else: 
-        if min > cheg_min:
-            difer = min - cheg_min
-        else:
-            difer = cheg_min - min
-    
-    part_d = converterdata(voo["dia_partida"], "d")
-    part_m = converterdata(voo["dia_partida"], "m")
-    part_a = converterdata(voo["dia_partida"], "a")
-    
-    # Verificando se a data/hora da partida já passou
-    partida_passou = False
-    if part_a < ano:
-        partida_passou = True
-    elif part_a == ano:
-        if part_m < mes:
-            partida_passou = True
-        elif part_m == mes:
-            if part_d < dia:
-                partida_passou = True
-            elif part_d == dia:
-                if (atraso and n_part <= min) or (not atraso and part_min <= min):
-                    partida_passou = True
-    
-    # Lógica de status
-    if partida_passou:
-        if difer > 0 and difer < 30 and difer > diff:
-            return retorno + "Aterrissando"
-        elif difer > 30 and difer > diff:
-            return retorno + "Aterrissado"
-        else:
-            return retorno + "Decolado"
-    # Lógica de embarcando: mesmo dia, e faltando 30 min ou menos para partir
-    elif part_a == ano and part_m == mes and part_d == dia and diff <= 30:
-        return retorno + "Embarcando"
-    else:
-        return retorno + "Programado"
+    registro = base_voos.obter(codigo)
+    return registro.dados if registro else None
+
+def det_status(voo, agora=None):
+    # Aceita tanto o dicionário do voo quanto o registro já compilado.
+    # 'agora' é o instante da consulta; sem ele, lê o relógio da API uma vez.
+    registro = voo if isinstance(voo, RegistroVoo) else compilar_voo(voo)
+    return calcular_status(registro, agora or cache_status.relogio())
 
 # --- 5. Endpoints da API (Inalterados) ---
 
@@ -207,32 +209,102 @@ def read_root():
     return {"ola": "Bem-vindo à API de Status de Voos da Azul"}
 
 @app.get("/status/all", response_model=List[VooStatusResponse])
-def get_all_flight_statuses():
+def get_all_flight_statuses(request: Request):
     """
-    Retorna uma lista com todos os voos e seus status calculados
+    Retorna uma lista com todos os voos e seus status calculados.
+    O corpo é pré-serializado e acompanha um ETag; se o cliente enviar
+    If-None-Match com o mesmo ETag, a resposta é 304 Not Modified.
     """
-    all_statuses = []
-    for voo_dict in voos:
-        status_calculado = det_status(voo_dict)
-        voo_obj = Voo(**voo_dict)
-        response_obj = VooStatusResponse(info_voo=voo_obj, status_calculado=status_calculado)
-        all_statuses.append(response_obj)
-    
-    return all_statuses
+    corpo, etag = resposta_todos.obter(cache_status.relogio())
+    cabecalhos = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_corresponde(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cabecalhos)
+
+    # O response_model continua documentando o formato; os bytes já estão prontos.
+    return Response(content=corpo, media_type="application/json", headers=cabecalhos)
+
+@app.get("/status/stream")
+async def stream_status():
+    """
+    Fluxo Server-Sent Events: envia um snapshot ao conectar ('snapshot') e,
+    depois, apenas os voos cujo status mudou ('status').
+    Declarado antes de /status/{codigo_voo} para não ser tratado como código.
+    """
+    return StreamingResponse(
+        transmissor_status.assinar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/status/busca")
+def buscar_voos(
+    origem: Optional[str] = None,
+    destino: Optional[str] = None,
+    aeroporto: Optional[str] = None,
+    data: Optional[str] = None,
+    voo: Optional[str] = None,
+    status: Optional[str] = None,
+    pagina: int = Query(1, ge=1),
+    por_pagina: int = Query(50, ge=1, le=500),
+):
+    """
+    Busca de voos por origem, destino, aeroporto (partidas e chegadas), dia de
+    partida (DD/MM/AAAA ou AAAA-MM-DD), tipo ('Nacional'/'Internacional') e
+    status calculado, com paginação. Os voos saem ordenados pela partida.
+    Declarado antes de /status/{codigo_voo} para não ser tratado como código.
+    """
+    try:
+        dia = ler_data(data) if data else None
+    except ValueError as erro:
+        raise HTTPException(status_code=422, detail=str(erro))
+
+    agora = cache_status.relogio()
+    with TEMPO_ETAPA.medir("busca"):
+        registros = [base_voos.obter(codigo) for codigo in
+                     indices_voos.buscar(origem, destino, aeroporto, dia, voo)]
+        if status:
+            encontrados = []
+            for registro in registros:
+                status_calculado = cache_status.status(registro, agora)
+                if status_corresponde(status_calculado, status):
+                    encontrados.append((registro, status_calculado))
+            total = len(encontrados)
+            pagina_atual = encontrados[(pagina - 1) * por_pagina:pagina * por_pagina]
+        else:
+            # Sem filtro de status, só a página pedida tem o status calculado.
+            total = len(registros)
+            pagina_atual = [(registro, cache_status.status(registro, agora))
+                            for registro in registros[(pagina - 1) * por_pagina:pagina * por_pagina]]
+
+    corpo = serializar_pagina(total, pagina, por_pagina,
+                              [registro for registro, _ in pagina_atual],
+                              [status_calculado for _, status_calculado in pagina_atual])
+    return Response(content=corpo, media_type="application/json", headers={"Cache-Control": "no-cache"})
 
 @app.get("/status/{codigo_voo}", response_model=VooStatusResponse)
 def get_status_voo(codigo_voo: str):
-    voo_dict = encontrar(codigo_voo)
+    registro = base_voos.obter(codigo_voo)
     
-    if not voo_dict:
+    if not registro:
         raise HTTPException(status_code=404, detail="Voo não encontrado")
 
-    status_calculado = det_status(voo_dict)
+    status_calculado = cache_status.status(registro, cache_status.relogio())
     
     # O Pydantic valida se o dicionário do voo tem a estrutura correta
-    voo_obj = Voo(**voo_dict)
+    with TEMPO_ETAPA.medir("modelo"):
+        voo_obj = Voo(**registro.dados)
+        resposta = VooStatusResponse(info_voo=voo_obj, status_calculado=status_calculado)
+
+    return resposta
 
-    return VooStatusResponse(info_voo=voo_obj, status_calculado=status_calculado)
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """
+    Métricas no formato texto do Prometheus: latência por rota, tempo das etapas
+    de status (cálculo, serialização, modelos Pydantic) e acertos do cache.
+    """
+    return Response(content=METRICAS.exportar(), media_type=TIPO_CONTEUDO)
 
 # --- 6. Execução da API ---
 if __name__ == "__main__":
@@ -0,0 +1,266 @@
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+from zoneinfo import ZoneInfo
+
+# --- Base de Voos Pré-compilada ---
+# Cada voo é normalizado uma única vez, no carregamento, em um registro compacto
+# com as datas/horas já convertidas. Assim, as consultas em /status/* não
+# precisam mais fazer split de strings nem percorrer a lista inteira de voos.
+#
+# Os horários de um voo são locais: a partida no fuso da origem e a chegada no
+# fuso do destino (ex.: GRU 23:59 -> LIS 10:00 do dia seguinte). Na compilação
+# eles viram instantes absolutos (segundos desde a época, UTC), e a chegada é
+# levada para o dia seguinte quando cai antes da partida (voos noturnos).
+# O status passa a ser uma máquina de estados sobre esses instantes:
+#
+#   Programado | P-30min | Embarcando | P | Decolado | C-30min | Aterrissando | C+30min | Aterrissado
+#
+# (P = partida, C = chegada). Calcular o status é comparar o instante atual com
+# quatro limites inteiros já prontos no registro.
+
+# Fuso horário de cada aeroporto (código IATA no início de "origem"/"destino").
+# Em Windows, o banco de fusos vem do pacote 'tzdata' (pip install tzdata).
+FUSOS_AEROPORTOS = {
+    "VCP": "America/Sao_Paulo", "GRU": "America/Sao_Paulo", "CGH": "America/Sao_Paulo",
+    "SDU": "America/Sao_Paulo", "GIG": "America/Sao_Paulo", "CNF": "America/Sao_Paulo",
+    "CWB": "America/Sao_Paulo", "POA": "America/Sao_Paulo", "FLN": "America/Sao_Paulo",
+    "BSB": "America/Sao_Paulo", "GYN": "America/Sao_Paulo",
+    "SSA": "America/Bahia", "REC": "America/Recife", "FOR": "America/Fortaleza",
+    "BEL": "America/Belem", "MAO": "America/Manaus", "PVH": "America/Porto_Velho",
+    "MIA": "America/New_York", "FLL": "America/New_York", "MCO": "America/New_York",
+    "PTY": "America/Panama", "LIS": "Europe/Lisbon", "ORY": "Europe/Paris",
+}
+# Aeroportos fora da tabela usam o horário de Brasília.
+FUSO_PADRAO = "America/Sao_Paulo"
+
+ROTULOS = ["Programado", "Embarcando", "Decolado", "Aterrissando", "Aterrissado"]
+PROGRAMADO, EMBARCANDO, DECOLADO, ATERRISSANDO, ATERRISSADO = range(len(ROTULOS))
+
+# Antecedência do embarque e janela de aproximação/pouso, em segundos.
+JANELA = 30 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class RegistroVoo:
+    codigo: str
+    dados: dict                    # Dicionário original (usado na resposta da API)
+    status_fixo: Optional[str]     # Ex.: "Cancelado" - quando definido, dispensa o cálculo
+    adiado: bool
+    partida: datetime              # Partida efetiva, com o fuso da origem
+    chegada: datetime              # Chegada efetiva, com o fuso do destino
+    limites: tuple                 # (P-30, P, max(P, C-30), C+30) em segundos UTC
+
+
+def relogio_sistema():
+    """
+    Instante atual, em UTC. É o relógio padrão da API (ver CacheStatus.relogio);
+    testes podem trocá-lo por um relógio fixo.
+    """
+    return datetime.now(timezone.utc)
+
+
+def codigo_aeroporto(texto):
+    # "VCP (Campinas)" -> "VCP"
+    return texto.split(" ", 1)[0].upper() if texto else ""
+
+
+def fuso_aeroporto(texto):
+    return ZoneInfo(FUSOS_AEROPORTOS.get(codigo_aeroporto(texto), FUSO_PADRAO))
+
+
+def _hora(texto):
+    h, m = texto.split(':')
+    return int(h), int(m)
+
+
+def _instante(dia, hora, fuso):
+    return datetime(dia.year, dia.month, dia.day, *_hora(hora), tzinfo=fuso)
+
+
+def _depois_de(instante, referencia):
+    # Avança o instante de dia em dia (no relógio local) até passar da referência.
+    while instante <= referencia:
+        instante += timedelta(days=1)
+    return instante
+
+
+def instantes_mudanca(partida, chegada):
+    """
+    Limites da máquina de estados, em segundos UTC: início do embarque,
+    partida, início da aproximação e fim da janela de pouso.
+    Funciona com inteiros ou com arrays NumPy.
+    """
+    aproximacao = chegada - JANELA
+    # Voos com menos de 30 min passam direto de Embarcando para Aterrissando.
+    if isinstance(aproximacao, int):
+        aproximacao = max(aproximacao, partida)
+    else:
+        aproximacao = aproximacao.clip(min=partida)
+    return (partida - JANELA, partida, aproximacao, chegada + JANELA)
+
+
+def compilar_voo(voo):
+    """
+    Converte o dicionário de um voo em um RegistroVoo, fazendo todo o parsing
+    de strings (data, horários e fusos) uma única vez.
+    """
+    # O código indexado é o mesmo da resposta (e dos deltas do SSE): "ad4070 " vira "AD4070".
+    codigo = voo["codigo_voo"].strip().upper()
+    if codigo != voo["codigo_voo"]:
+        voo = {**voo, "codigo_voo": codigo}
+    status = voo.get("status")
+    adiado = status == "Adiado"
+
+    d, m, a = map(int, voo["dia_partida"].split('/'))
+    dia = datetime(a, m, d)
+    fuso_origem = fuso_aeroporto(voo.get("origem"))
+    fuso_destino = fuso_aeroporto(voo.get("destino"))
+
+    partida = _instante(dia, voo["partida_programada"], fuso_origem)
+    chegada = _depois_de(_instante(dia, voo["chegada_programada"], fuso_destino), partida)
+
+    # Um voo adiado sem os novos horários mantém os horários programados.
+    # O novo horário nunca é anterior ao programado: "08:00" para um voo das
+    # 23:00 significa 08:00 do dia seguinte.
+    if adiado and voo.get("nova_partida") and voo.get("nova_chegada"):
+        programada = partida
+        partida = _instante(dia, voo["nova_partida"], fuso_origem)
+        if partida < programada:
+            partida = _depois_de(partida, programada)
+        chegada = _depois_de(_instante(partida, voo["nova_chegada"], fuso_destino), partida)
+
+    partida_ts = int(partida.timestamp())
+    chegada_ts = int(chegada.timestamp())
+    return RegistroVoo(
+        codigo=codigo,
+        dados=voo,
+        status_fixo=status if status and not adiado else None,
+        adiado=adiado,
+        partida=partida,
+        chegada=chegada,
+        limites=instantes_mudanca(partida_ts, chegada_ts),
+    )
+
+
+def calcular_status(registro, agora):
+    """
+    Calcula o status de um voo já compilado para o instante 'agora'
+    (datetime com fuso, lido uma única vez por requisição).
+    """
+    if registro.status_fixo:
+        return registro.status_fixo
+    t = agora.timestamp()
+    embarque, partida, aproximacao, fim_pouso = registro.limites
+    if t < partida:
+        codigo = EMBARCANDO if t >= embarque else PROGRAMADO
+    elif t < aproximacao:
+        codigo = DECOLADO
+    else:
+        codigo = ATERRISSANDO if t < fim_pouso else ATERRISSADO
+    return ("Adiado - " if registro.adiado else '') + ROTULOS[codigo]
+
+
+def proxima_mudanca(registro, agora):
+    """
+    Retorna o próximo instante em que o status do voo muda, ou None se ele não
+    muda mais (status fixo ou já Aterrissado). Até lá o status é constante.
+    """
+    if registro.status_fixo:
+        return None
+    t = agora.timestamp()
+    futuros = [limite for limite in registro.limites if limite > t]
+    if not futuros:
+        return None
+    return datetime.fromtimestamp(min(futuros), timezone.utc)
+
+
+def ler_voos_jsonl(caminho):
+    """
+    Lê voos de um arquivo JSON Lines (um voo por linha, no formato de 'voos'),
+    um de cada vez, sem carregar o arquivo inteiro em memória.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield json.loads(linha)
+
+
+class BaseVoos:
+    """
+    Armazena os voos compilados com um índice (hash) pelo código do voo,
+    garantindo busca O(1) em /status/{codigo_voo}.
+    A ordem de inserção é preservada para a listagem em /status/all.
+    O atributo 'versao' é incrementado a cada alteração, permitindo que
+    estruturas derivadas (ex.: colunas do motor de status) saibam quando refazer.
+    Os ouvintes comuns são avisados antes do incremento: quem vê a nova versão
+    já recebeu todos os registros alterados até ela. Os registrados com
+    apos_versao=True são avisados depois, quando a nova versão já é visível
+    (ex.: para acordar quem vai recalcular a partir dela).
+    """
+
+    def __init__(self, voos: Iterable[dict] = ()):
+        self._registros: Dict[str, RegistroVoo] = {}
+        self.versao = 0
+        self._ouvintes = []
+        self._ouvintes_apos_versao = []
+        self._trava_escrita = threading.Lock()
+        self.carregar(voos)
+
+    def carregar(self, voos: Iterable[dict]):
+        for voo in voos:
+            self.inserir(voo)
+
+    def inserir(self, voo: dict) -> RegistroVoo:
+        # Inserir um código já existente substitui o registro (atualização).
+        registro = compilar_voo(voo)
+        with self._trava_escrita:
+            self._registros[registro.codigo] = registro
+            self._avisar(self._ouvintes, [registro])
+            self.versao += 1
+            self._avisar(self._ouvintes_apos_versao, [registro])
+        return registro
+
+    def aplicar(self, voos: Iterable[dict]) -> List[RegistroVoo]:
+        """
+        Insere/atualiza um lote de voos de forma atômica: todos são compilados
+        antes (um voo inválido descarta o lote inteiro) e o índice é trocado
+        de uma vez por uma cópia já atualizada. Leitores nunca esperam: veem
+        a base anterior ou a nova, nunca um lote pela metade.
+        """
+        registros = [compilar_voo(voo) for voo in voos]
+        if not registros:
+            return registros
+        with self._trava_escrita:
+            novos = dict(self._registros)
+            for registro in registros:
+                novos[registro.codigo] = registro
+            self._registros = novos
+            self._avisar(self._ouvintes, registros)
+            self.versao += 1
+            self._avisar(self._ouvintes_apos_versao, registros)
+        return registros
+
+    @staticmethod
+    def _avisar(ouvintes, registros):
+        for registro in registros:
+            for ouvinte in ouvintes:
+                ouvinte(registro)
+
+    def observar(self, ouvinte, apos_versao=False):
+        """
+        Registra uma função chamada com o novo RegistroVoo após cada alteração,
+        antes do incremento da versão (ou depois, com apos_versao=True).
+        """
+        (self._ouvintes_apos_versao if apos_versao else self._ouvintes).append(ouvinte)
+
+    def obter(self, codigo: str) -> Optional[RegistroVoo]:
+        return self._registros.get(codigo.upper())
+
+    def __iter__(self) -> Iterator[RegistroVoo]:
+        return iter(list(self._registros.values()))
+
+    def __len__(self):
+        return len(self._registros)
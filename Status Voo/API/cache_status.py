@@ -0,0 +1,100 @@
+import threading
+
+from base_voos import calcular_status, proxima_mudanca, relogio_sistema
+from metricas import METRICAS
+
+# --- Cache de Status por Faixa de Tempo ---
+# O status de um voo só muda em instantes conhecidos (30 min antes da partida,
+# partida, chegada +/- 30 min). Guardamos o status calculado junto com o instante
+# do cálculo e o próximo instante em que ele pode mudar, e servimos do cache só
+# entre os dois: se o relógio voltar (relógio de teste, ajuste do NTP), recalcula.
+# Quando o registro do voo é editado, a base cria um novo RegistroVoo, e a
+# comparação de identidade invalida a entrada automaticamente.
+# O cache também guarda o relógio da API: todos (rotas, transmissão SSE) leem o
+# instante atual por cache.relogio(), uma vez por requisição, e um teste pode
+# trocá-lo por um relógio fixo.
+
+# Tempo de cada etapa do cálculo de status e aproveitamento do cache (ver /metrics).
+TEMPO_ETAPA = METRICAS.histograma(
+    "status_etapa_segundos", "Duração das etapas do cálculo e da serialização de status.", ("etapa",))
+CONSULTAS_CACHE = METRICAS.contador(
+    "status_cache_total", "Consultas ao cache de status, por tipo e resultado.", ("consulta", "resultado"))
+
+
+def _no_intervalo(agora, calculado_em, valido_ate):
+    # Válido de 'calculado_em' (inclusive) até 'valido_ate' (exclusive; None = para sempre).
+    return calculado_em <= agora and (valido_ate is None or agora < valido_ate)
+
+
+class CacheStatus:
+    """
+    Cache de status por código de voo (/status/{codigo_voo}) e da lista
+    completa (/status/all), com invalidação pela fronteira de tempo e pela
+    versão da base.
+    """
+
+    def __init__(self, base, motor, relogio=relogio_sistema):
+        self.base = base
+        self.motor = motor
+        self.relogio = relogio
+        self._por_voo = {}      # codigo -> (registro, status, calculado_em, valido_ate)
+        self._todos = None      # (versao, registros, status, calculado_em, valido_ate)
+        self._trava_todos = threading.Lock()
+
+    def status(self, registro, agora):
+        entrada = self._por_voo.get(registro.codigo)
+        if entrada is not None and entrada[0] is registro and _no_intervalo(agora, entrada[2], entrada[3]):
+            CONSULTAS_CACHE.inc("voo", "acerto")
+            return entrada[1]
+
+        CONSULTAS_CACHE.inc("voo", "falha")
+        with TEMPO_ETAPA.medir("voo"):
+            status = calcular_status(registro, agora)
+            valido_ate = proxima_mudanca(registro, agora)
+        self._por_voo[registro.codigo] = (registro, status, agora, valido_ate)
+        return status
+
+    def todos(self, agora):
+        """
+        Retorna (registros, status) de todos os voos, recalculando apenas
+        quando a base muda ou quando algum voo atinge uma fronteira.
+        """
+        entrada = self._todos
+        if entrada is not None and self._valida(entrada, agora):
+            CONSULTAS_CACHE.inc("todos", "acerto")
+            return entrada[1], entrada[2]
+
+        # Apenas uma thread recalcula; as demais aguardam e reaproveitam o resultado.
+        with self._trava_todos:
+            entrada = self._todos
+            if entrada is not None and self._valida(entrada, agora):
+                CONSULTAS_CACHE.inc("todos", "acerto")
+                return entrada[1], entrada[2]
+
+            CONSULTAS_CACHE.inc("todos", "falha")
+            versao = self.base.versao
+            with TEMPO_ETAPA.medir("colunas"):
+                colunas = self.motor.colunas()
+            with TEMPO_ETAPA.medir("motor"):
+                registros, status = self.motor.calcular(agora, colunas)
+                valido_ate = self.motor.proxima_mudanca(colunas, agora)
+            self._todos = (versao, registros, status, agora, valido_ate)
+            return registros, status
+
+    @property
+    def valido_ate(self):
+        # Fronteira da lista atual (None se não houver lista ou se nada pode mudar).
+        entrada = self._todos
+        return entrada[4] if entrada is not None else None
+
+    def _valida(self, entrada, agora):
+        versao, _, _, calculado_em, valido_ate = entrada
+        return versao == self.base.versao and _no_intervalo(agora, calculado_em, valido_ate)
+
+    def invalidar(self, codigo=None):
+        # Invalidação explícita (ex.: após uma edição feita fora da base).
+        if codigo is None:
+            self._por_voo.clear()
+        else:
+            self._por_voo.pop(codigo.upper(), None)
+        self._todos = None
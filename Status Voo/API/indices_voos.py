@@ -0,0 +1,164 @@
+import bisect
+import heapq
+import threading
+from datetime import date, datetime
+
+from base_voos import codigo_aeroporto
+
+# --- Índices Secundários da Base de Voos ---
+# Além do índice pelo código (BaseVoos), mantemos "baldes" por aeroporto de
+# origem, aeroporto de destino, dia de partida e tipo de voo (Nacional /
+# Internacional). Cada balde é uma lista de (partida, codigo) ordenada pelo
+# instante de partida, mantida com bisect a cada inserção/atualização da base.
+# Uma busca parte do menor balde que atende aos filtros e só confere os demais
+# atributos dos voos desse balde; o resultado já sai ordenado pela partida.
+
+
+def ler_data(texto):
+    """
+    Converte "DD/MM/AAAA" (formato de dia_partida) ou "AAAA-MM-DD" em date.
+    """
+    for formato in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(texto.strip(), formato).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Data inválida: {texto!r} (use DD/MM/AAAA ou AAAA-MM-DD)")
+
+
+def _chaves(registro):
+    # Atributos indexados de um voo: (origem, destino, dia, tipo).
+    dados = registro.dados
+    d, m, a = map(int, dados["dia_partida"].split('/'))
+    return (
+        codigo_aeroporto(dados.get("origem")),
+        codigo_aeroporto(dados.get("destino")),
+        date(a, m, d),
+        (dados.get("voo") or "").casefold(),
+    )
+
+
+class IndicesVoos:
+    """
+    Índices por origem, destino, data e tipo, atualizados pela própria base
+    (BaseVoos.observar) sempre que um voo é inserido ou editado.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self._por_origem = {}
+        self._por_destino = {}
+        self._por_data = {}
+        self._por_tipo = {}
+        self._todos = []            # Todos os voos, ordenados pela partida
+        self._indexado = {}         # codigo -> (entrada, chaves) usadas na indexação
+        self._trava = threading.Lock()
+        self._montar(base)
+        base.observar(self.atualizar)
+
+    def _montar(self, registros):
+        # Carga inicial: monta os baldes de uma vez e ordena cada um no fim,
+        # em vez de uma inserção ordenada por voo.
+        for registro in registros:
+            entrada = (registro.limites[1], registro.codigo)
+            chaves = _chaves(registro)
+            for indice, chave in self._baldes(chaves):
+                indice.setdefault(chave, []).append(entrada)
+            self._todos.append(entrada)
+            self._indexado[registro.codigo] = (entrada, chaves)
+        for indice in (self._por_origem, self._por_destino, self._por_data, self._por_tipo):
+            for balde in indice.values():
+                balde.sort()
+        self._todos.sort()
+
+    def _baldes(self, chaves):
+        origem, destino, dia, tipo = chaves
+        return (
+            (self._por_origem, origem),
+            (self._por_destino, destino),
+            (self._por_data, dia),
+            (self._por_tipo, tipo),
+        )
+
+    def atualizar(self, registro):
+        """
+        (Re)indexa um voo: remove as entradas antigas do código e insere as novas.
+        """
+        entrada = (registro.limites[1], registro.codigo)
+        chaves = _chaves(registro)
+        with self._trava:
+            anterior = self._indexado.get(registro.codigo)
+            if anterior is not None:
+                entrada_antiga, chaves_antigas = anterior
+                for indice, chave in self._baldes(chaves_antigas):
+                    self._remover(indice[chave], entrada_antiga)
+                    if not indice[chave]:
+                        del indice[chave]
+                self._remover(self._todos, entrada_antiga)
+
+            for indice, chave in self._baldes(chaves):
+                bisect.insort(indice.setdefault(chave, []), entrada)
+            bisect.insort(self._todos, entrada)
+            self._indexado[registro.codigo] = (entrada, chaves)
+
+    @staticmethod
+    def _remover(balde, entrada):
+        posicao = bisect.bisect_left(balde, entrada)
+        if posicao < len(balde) and balde[posicao] == entrada:
+            del balde[posicao]
+
+    def buscar(self, origem=None, destino=None, aeroporto=None, data=None, tipo=None):
+        """
+        Códigos dos voos que atendem a todos os filtros informados, ordenados
+        pela partida. 'aeroporto' aceita voos que partem ou chegam nele;
+        'data' é o dia de partida programado (date).
+        """
+        filtros = {}
+        if origem:
+            filtros[0] = codigo_aeroporto(origem)
+        if destino:
+            filtros[1] = codigo_aeroporto(destino)
+        if data:
+            filtros[2] = data
+        if tipo:
+            filtros[3] = tipo.casefold()
+        aeroporto = codigo_aeroporto(aeroporto) if aeroporto else None
+
+        indices = (self._por_origem, self._por_destino, self._por_data, self._por_tipo)
+        with self._trava:
+            # Ponto de partida: o menor balde entre os filtros informados.
+            candidatos = [indices[posicao].get(chave, ()) for posicao, chave in filtros.items()]
+            if aeroporto:
+                # Partidas e chegadas do aeroporto, intercaladas pela partida. Um voo
+                # com origem igual ao destino está nos dois baldes: as entradas
+                # iguais saem vizinhas na intercalação e ficam só uma vez.
+                intercalados = []
+                for entrada in heapq.merge(self._por_origem.get(aeroporto, ()),
+                                           self._por_destino.get(aeroporto, ())):
+                    if not intercalados or intercalados[-1] != entrada:
+                        intercalados.append(entrada)
+                candidatos.append(intercalados)
+            balde = min(candidatos, key=len) if candidatos else self._todos
+
+            codigos = []
+            for _, codigo in balde:
+                chaves = self._indexado[codigo][1]
+                if any(chaves[posicao] != chave for posicao, chave in filtros.items()):
+                    continue
+                if aeroporto and aeroporto not in (chaves[0], chaves[1]):
+                    continue
+                codigos.append(codigo)
+        return codigos
+
+    def __len__(self):
+        return len(self._indexado)
+
+
+def status_corresponde(status, filtro):
+    """
+    Compara o status calculado com o filtro, sem diferenciar maiúsculas:
+    "Adiado - Embarcando" atende tanto a "Adiado" quanto a "Embarcando".
+    """
+    filtro = filtro.strip().casefold()
+    status = status.casefold()
+    return status == filtro or filtro in (parte.strip() for parte in status.split(" - "))
@@ -0,0 +1,178 @@
+import csv
+import json
+import logging
+import os
+import threading
+
+from metricas import METRICAS
+from resposta_status import CAMPOS_VOO
+
+# --- Ingestão de Escalas a partir de Arquivos ---
+# A operação publica a escala (ou só as alterações: atrasos, novos horários,
+# cancelamentos) em arquivos CSV ou JSON, e a API aplica sem reiniciar:
+#   - os arquivos são lidos em streaming, um voo de cada vez;
+#   - cada voo é comparado com o registro atual e só os que mudaram seguem
+#     adiante (um atraso numa escala de 100 mil voos compila um voo só);
+#   - as alterações de um arquivo entram na base em um único lote atômico
+#     (BaseVoos.aplicar), sem travar quem está lendo /status/*.
+# Os arquivos funcionam como "upsert": voos ausentes do arquivo continuam na base.
+# Para não ler um arquivo pela metade, a operação deve gravá-lo em um arquivo
+# temporário e renomeá-lo (a troca é atômica no mesmo disco).
+
+INGESTOES = METRICAS.contador(
+    "ingestao_arquivos_total", "Leituras de arquivos de escala, por resultado.", ("resultado",))
+VOOS_ALTERADOS = METRICAS.contador(
+    "ingestao_voos_alterados_total", "Voos novos ou alterados na base pelos arquivos de escala.")
+
+TAMANHO_BLOCO = 64 * 1024
+
+LOG = logging.getLogger(__name__)
+
+
+def ler_voos_csv(caminho):
+    """
+    Lê voos de um CSV com cabeçalho (colunas com os nomes dos campos de 'voos').
+    Células vazias viram None.
+    """
+    with open(caminho, encoding="utf-8-sig", newline="") as arquivo:
+        for linha in csv.DictReader(arquivo):
+            yield {campo: (valor.strip() or None) if isinstance(valor, str) else valor
+                   for campo, valor in linha.items() if campo is not None}
+
+
+def ler_voos_json(caminho):
+    """
+    Lê voos de um arquivo JSON, seja uma lista ([{...}, {...}]) ou JSON Lines,
+    decodificando um objeto de cada vez: o arquivo nunca é carregado inteiro.
+    """
+    decodificador = json.JSONDecoder()
+    with open(caminho, encoding="utf-8") as arquivo:
+        texto, posicao, fim_arquivo = "", 0, False
+        while True:
+            # Separadores entre os objetos: espaços, vírgulas e os colchetes da lista.
+            while posicao < len(texto) and texto[posicao] in " \t\r\n,[]":
+                posicao += 1
+            if posicao == len(texto):
+                if fim_arquivo:
+                    return
+                texto, posicao = arquivo.read(TAMANHO_BLOCO), 0
+                fim_arquivo = not texto
+                continue
+            try:
+                voo, posicao = decodificador.raw_decode(texto, posicao)
+            except json.JSONDecodeError:
+                # Objeto cortado no fim do bloco: lê mais e tenta de novo.
+                bloco = "" if fim_arquivo else arquivo.read(TAMANHO_BLOCO)
+                if not bloco:
+                    raise
+                texto, posicao = texto[posicao:] + bloco, 0
+                continue
+            yield voo
+
+
+def ler_arquivo_voos(caminho):
+    # O formato é escolhido pela extensão: .csv ou JSON (.json, .jsonl, .ndjson).
+    if caminho.lower().endswith(".csv"):
+        return ler_voos_csv(caminho)
+    return ler_voos_json(caminho)
+
+
+def _normalizar(voo):
+    normalizado = {campo: voo.get(campo) for campo in CAMPOS_VOO}
+    # Mesmo código do índice da base (e dos deltas do SSE): "ad4070 " vira "AD4070".
+    normalizado["codigo_voo"] = str(normalizado["codigo_voo"]).strip().upper()
+    return normalizado
+
+
+def alteracoes(base, voos):
+    """
+    Filtra, dos voos lidos, apenas os novos ou diferentes do registro atual.
+    """
+    for voo in voos:
+        if not isinstance(voo, dict) or not voo.get("codigo_voo"):
+            raise ValueError(f"Voo sem 'codigo_voo': {voo!r}")
+        voo = _normalizar(voo)
+        atual = base.obter(voo["codigo_voo"])
+        if atual is None or _normalizar(atual.dados) != voo:
+            yield voo
+
+
+def ingerir_arquivo(base, caminho):
+    """
+    Aplica na base, em um único lote, os voos do arquivo que mudaram.
+    Retorna a quantidade de voos alterados. Um arquivo inválido (JSON mal
+    formado, campo faltando, horário impossível) não altera nada.
+    """
+    try:
+        alterados = list(alteracoes(base, ler_arquivo_voos(caminho)))
+        base.aplicar(alterados)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        INGESTOES.inc("erro")
+        raise
+    INGESTOES.inc("aplicado")
+    VOOS_ALTERADOS.inc(quantidade=len(alterados))
+    return len(alterados)
+
+
+class MonitorArquivosVoos:
+    """
+    Observa arquivos de escala e reaplica cada um quando ele muda (data de
+    modificação ou tamanho). A primeira leitura é feita já na criação; depois
+    de iniciar(), uma thread de fundo verifica os arquivos a cada 'intervalo'
+    segundos.
+    """
+
+    def __init__(self, base, caminhos, intervalo=1.0):
+        self.base = base
+        self.caminhos = list(caminhos)
+        self.intervalo = intervalo
+        self.erros = {}             # caminho -> último erro de leitura (vazio se tudo certo; também vai para o log)
+        self._assinaturas = {}      # caminho -> (mtime_ns, tamanho) da última leitura
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._monitorar, name="monitor-voos", daemon=True)
+        self.verificar()
+
+    def iniciar(self):
+        self._thread.start()
+
+    @staticmethod
+    def _assinatura(caminho):
+        try:
+            estado = os.stat(caminho)
+        except FileNotFoundError:
+            return None
+        return estado.st_mtime_ns, estado.st_size
+
+    def verificar(self):
+        """
+        Reaplica os arquivos alterados desde a última leitura.
+        Retorna a quantidade de voos alterados na base.
+        """
+        total = 0
+        with self._trava:
+            for caminho in self.caminhos:
+                assinatura = self._assinatura(caminho)
+                if assinatura is None or assinatura == self._assinaturas.get(caminho):
+                    continue
+                try:
+                    total += ingerir_arquivo(self.base, caminho)
+                except (OSError, ValueError, KeyError, TypeError, AttributeError) as erro:
+                    # Mantém a base como estava; o arquivo é relido quando mudar de novo.
+                    self.erros[caminho] = f"{type(erro).__name__}: {erro}"
+                    LOG.warning("Escala %s não aplicada: %s", caminho, self.erros[caminho])
+                else:
+                    if self.erros.pop(caminho, None) is not None:
+                        LOG.info("Escala %s aplicada após erro anterior.", caminho)
+                # Assinatura de antes da leitura: se o arquivo mudou durante ela, é relido.
+                self._assinaturas[caminho] = assinatura
+        return total
+
+    def _monitorar(self):
+        while not self._parar.wait(self.intervalo):
+            self.verificar()
+
+    def fechar(self):
+        self._parar.set()
+        if self._thread.is_alive():
+            self._thread.join()
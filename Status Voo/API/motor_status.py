@@ -0,0 +1,188 @@
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+from base_voos import ROTULOS
+
+# --- Motor de Status em Lote (Vetorizado) ---
+# Em vez de chamar det_status() voo a voo, os limites já compilados da base
+# (instantes absolutos, em segundos UTC) são organizados em uma matriz NumPy e
+# todos os status são calculados de uma vez, com um único "agora" capturado
+# para a requisição inteira.
+
+# Tabela de rótulos: índices 0-4 para voos normais, 5-9 para voos adiados.
+_TABELA_ROTULOS = np.array(ROTULOS + ["Adiado - " + r for r in ROTULOS], dtype=object)
+
+
+class _Colunas:
+    """
+    Fotografia colunar da base em uma determinada versão.
+    """
+
+    def __init__(self, registros, limites, adiado, fixo, rotulo_fixo, linhas):
+        self.registros = registros
+        # Uma linha por voo: (P-30, P, max(P, C-30), C+30), em ordem crescente.
+        self.limites = limites
+        self.adiado = adiado
+        # Status fixos (ex.: "Cancelado") não dependem do horário.
+        self.fixo = fixo
+        self.rotulo_fixo = rotulo_fixo
+        self.linhas = linhas        # codigo -> linha
+
+    @classmethod
+    def montar(cls, registros):
+        n = len(registros)
+        return cls(
+            registros,
+            np.array([r.limites for r in registros], dtype=np.int64).reshape(n, 4),
+            np.fromiter((r.adiado for r in registros), dtype=bool, count=n),
+            np.fromiter((r.status_fixo is not None for r in registros), dtype=bool, count=n),
+            np.array([r.status_fixo for r in registros], dtype=object),
+            {r.codigo: i for i, r in enumerate(registros)},
+        )
+
+    def atualizar(self, alterados):
+        """
+        Nova fotografia com as linhas dos voos alterados substituídas (e os
+        voos novos acrescentados no fim, como na base). As colunas são copiadas
+        com memcpy; só os voos alterados passam pelo Python.
+        """
+        registros = list(self.registros)
+        linhas = self.linhas
+        indices = []
+        for registro in alterados:
+            linha = linhas.get(registro.codigo)
+            if linha is None:
+                if linhas is self.linhas:
+                    linhas = dict(linhas)
+                linha = linhas[registro.codigo] = len(registros)
+                registros.append(registro)
+            else:
+                registros[linha] = registro
+            indices.append(linha)
+
+        n = len(registros)
+        acrescimo = n - len(self.registros)
+        limites = np.concatenate((self.limites, np.zeros((acrescimo, 4), dtype=np.int64)))
+        adiado = np.concatenate((self.adiado, np.zeros(acrescimo, dtype=bool)))
+        fixo = np.concatenate((self.fixo, np.zeros(acrescimo, dtype=bool)))
+        rotulo_fixo = np.concatenate((self.rotulo_fixo, np.empty(acrescimo, dtype=object)))
+
+        indices = np.array(indices, dtype=np.intp)
+        limites[indices] = [r.limites for r in alterados]
+        adiado[indices] = [r.adiado for r in alterados]
+        fixo[indices] = [r.status_fixo is not None for r in alterados]
+        rotulo_fixo[indices] = [r.status_fixo for r in alterados]
+        return _Colunas(registros, limites, adiado, fixo, rotulo_fixo, linhas)
+
+
+class MotorStatus:
+    """
+    Calcula o status de todos os voos da base em uma única passada vetorizada.
+    As colunas só mudam quando a versão da base muda: os voos alterados desde
+    a última fotografia (avisados pela base) têm suas linhas substituídas, sem
+    remontar as colunas inteiras a cada atraso ou cancelamento.
+    """
+
+    # Acima desta fração de voos alterados, remontar é mais barato que remendar.
+    FRACAO_REMONTAR = 0.25
+
+    def __init__(self, base):
+        self.base = base
+        self._versao = None
+        self._colunas = None
+        self._pendentes = {}        # codigo -> registro alterado desde a última fotografia
+        self._trava = threading.Lock()
+        base.observar(self._ao_alterar)
+
+    def _ao_alterar(self, registro):
+        with self._trava:
+            self._pendentes[registro.codigo] = registro
+
+    def colunas(self):
+        versao = self.base.versao
+        colunas = self._colunas
+        if colunas is not None and self._versao == versao:
+            return colunas
+
+        with self._trava:
+            colunas = self._colunas
+            if colunas is not None and self._versao == versao:
+                return colunas
+            # A base avisa antes de incrementar a versão: os pendentes já
+            # incluem tudo o que foi alterado até 'versao'.
+            alterados = list(self._pendentes.values())
+            self._pendentes = {}
+            if colunas is None or len(alterados) > self.FRACAO_REMONTAR * len(colunas.registros):
+                colunas = _Colunas.montar(list(self.base))
+            elif alterados:
+                colunas = colunas.atualizar(alterados)
+            # Troca atômica: leitores concorrentes veem a fotografia antiga ou a nova.
+            self._colunas, self._versao = colunas, versao
+        return colunas
+
+    def codigos_status(self, colunas, agora):
+        """
+        Retorna um array com o código (0-4) do status de cada voo: a quantidade
+        de limites já alcançados, a mesma regra de calcular_status().
+        """
+        t = agora.timestamp()
+        return (colunas.limites <= t).sum(axis=1, dtype=np.int8)
+
+    def calcular(self, agora, colunas=None):
+        """
+        Retorna (registros, status) com os rótulos finais, na ordem da base.
+        """
+        if colunas is None:
+            colunas = self.colunas()
+        codigos = self.codigos_status(colunas, agora)
+        rotulos = _TABELA_ROTULOS[codigos + len(ROTULOS) * colunas.adiado]
+        rotulos[colunas.fixo] = colunas.rotulo_fixo[colunas.fixo]
+        return colunas.registros, rotulos.tolist()
+
+    def proxima_mudanca(self, colunas, agora):
+        """
+        Próximo instante em que o status de qualquer voo da base muda
+        (ou None se nenhum status mudar mais).
+        """
+        t = agora.timestamp()
+        limites = colunas.limites[~colunas.fixo]
+        futuros = limites[limites > t]
+        if not futuros.size:
+            return None
+        return datetime.fromtimestamp(int(futuros.min()), timezone.utc)
+
+
+class RodadaStatus:
+    """
+    Uma lista de cache.todos() (registros e status) em colunas NumPy: a
+    identidade de cada registro e o rótulo do status. Serve para comparar duas
+    rodadas sem percorrer os voos no Python (transmissão SSE, corpo de /status/all).
+    """
+
+    __slots__ = ("registros", "status", "ids", "rotulos")
+
+    def __init__(self, registros, status, anterior=None):
+        self.registros = registros
+        self.status = status
+        if anterior is not None and registros is anterior.registros:
+            self.ids = anterior.ids
+        else:
+            # Quem guarda a rodada mantém os registros vivos: os ids não se repetem.
+            self.ids = np.fromiter(map(id, registros), dtype=np.intp, count=len(registros))
+        self.rotulos = np.array(status, dtype=object)
+
+    def alterados(self, anterior):
+        """
+        Posições dos voos novos, editados ou com outro status desde a rodada
+        'anterior' (todas, se não houver rodada anterior comparável).
+        """
+        n, m = len(self.ids), len(anterior.ids) if anterior is not None else 0
+        if anterior is None or n < m:
+            return list(range(n))
+        # Voos novos entram no fim da lista (ver _Colunas.atualizar).
+        return np.concatenate((
+            np.flatnonzero((self.ids[:m] != anterior.ids) | (self.rotulos[:m] != anterior.rotulos)),
+            np.arange(m, n),
+        )).tolist()
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import threading
+
+from cache_status import TEMPO_ETAPA
+from motor_status import RodadaStatus
+
+# --- Respostas Pré-serializadas ---
+# O corpo JSON de /status/all é montado uma única vez por "época" de status
+# (isto é, enquanto o cache não muda) e servido como bytes prontos, sem passar
+# pela validação/serialização do Pydantic a cada requisição.
+# Cada voo é serializado à parte e os voos são agrupados em blocos: numa nova
+# época (uma fronteira de horário, um atraso), só os voos que mudaram são
+# serializados de novo e só os blocos deles são refeitos.
+# O ETag é derivado do conteúdo (do resumo de cada bloco): se uma nova época
+# gerar o mesmo JSON, os clientes continuam recebendo 304 Not Modified.
+
+# Mesmos campos (e na mesma ordem) do modelo Voo.
+CAMPOS_VOO = (
+    "codigo_voo", "origem", "destino", "voo", "dia_partida", "partida_programada",
+    "chegada_programada", "status", "nova_partida", "nova_chegada",
+)
+
+
+# Voos por bloco do corpo de /status/all.
+ITENS_POR_BLOCO = 1024
+
+
+def _item(registro, status_calculado):
+    # Mesmo formato de VooStatusResponse.
+    return {
+        "info_voo": {campo: registro.dados.get(campo) for campo in CAMPOS_VOO},
+        "status_calculado": status_calculado,
+    }
+
+
+def _itens(registros, status):
+    return [_item(registro, status_calculado) for registro, status_calculado in zip(registros, status)]
+
+
+def _serializar(documento):
+    return json.dumps(documento, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def serializar_status(registros, status):
+    return _serializar(_itens(registros, status))
+
+
+def serializar_pagina(total, pagina, por_pagina, registros, status):
+    """
+    Corpo de /status/busca: a página pedida e o total de voos encontrados.
+    """
+    documento = {
+        "total": total,
+        "pagina": pagina,
+        "por_pagina": por_pagina,
+        "voos": _itens(registros, status),
+    }
+    return _serializar(documento)
+
+
+def gerar_etag(corpo):
+    return '"' + hashlib.blake2b(corpo, digest_size=16).hexdigest() + '"'
+
+
+def etag_corresponde(if_none_match, etag):
+    """
+    Verifica o cabeçalho If-None-Match (aceita lista, '*' e ETags fracos).
+    """
+    if not if_none_match:
+        return False
+    for valor in if_none_match.split(","):
+        valor = valor.strip()
+        if valor == "*" or valor.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class RespostaStatusTodos:
+    """
+    Mantém o corpo serializado de /status/all e seu ETag, refeitos apenas
+    quando o cache de status entrega uma nova lista, e só nas partes que mudaram.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._ultima = None     # (rodada, partes, blocos, resumos, corpo, etag)
+        self._trava = threading.Lock()
+
+    def obter(self, agora):
+        registros, status = self.cache.todos(agora)
+        ultima = self._ultima
+        # O cache devolve a mesma lista enquanto a época não muda.
+        if ultima is not None and ultima[0].status is status:
+            return ultima[4], ultima[5]
+
+        with self._trava:
+            ultima = self._ultima
+            if ultima is not None and ultima[0].status is status:
+                return ultima[4], ultima[5]
+            with TEMPO_ETAPA.medir("serializacao"):
+                self._ultima = self._montar(registros, status, ultima)
+            return self._ultima[4], self._ultima[5]
+
+    @staticmethod
+    def _montar(registros, status, ultima):
+        anterior = ultima[0] if ultima is not None else None
+        rodada = RodadaStatus(registros, status, anterior)
+        alterados = rodada.alterados(anterior)
+        n = len(registros)
+        quantidade_blocos = -(-n // ITENS_POR_BLOCO)
+        if len(alterados) == n:
+            partes, blocos, resumos = [None] * n, [None] * quantidade_blocos, [None] * quantidade_blocos
+        else:
+            # Voos novos só entram no fim: as listas da época anterior são estendidas.
+            partes, blocos, resumos = (list(lista) for lista in ultima[1:4])
+            partes.extend([None] * (n - len(partes)))
+            blocos.extend([None] * (quantidade_blocos - len(blocos)))
+            resumos.extend([None] * (quantidade_blocos - len(resumos)))
+
+        for i in alterados:
+            partes[i] = _serializar(_item(registros[i], status[i]))
+        for bloco in sorted({i // ITENS_POR_BLOCO for i in alterados}):
+            inicio = bloco * ITENS_POR_BLOCO
+            blocos[bloco] = b",".join(partes[inicio:inicio + ITENS_POR_BLOCO])
+            resumos[bloco] = hashlib.blake2b(blocos[bloco], digest_size=16).digest()
+
+        corpo = b"[" + b",".join(blocos) + b"]"
+        return rodada, partes, blocos, resumos, corpo, gerar_etag(b"".join(resumos))
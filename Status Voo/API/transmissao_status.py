@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+from motor_status import RodadaStatus
+
+# --- Transmissão de Status (Server-Sent Events) ---
+# Em vez de cada painel consultar /status/all periodicamente, os clientes se
+# inscrevem em /status/stream. Uma única tarefa calcula os status quando um voo
+# cruza uma fronteira (ou tem o registro alterado) e envia apenas as diferenças,
+# já serializadas, para todos os inscritos. O custo é um cálculo por mudança,
+# independente do número de telas conectadas.
+
+
+def _evento(tipo, dados):
+    corpo = json.dumps(dados, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {tipo}\ndata: {corpo}\n\n".encode("utf-8")
+
+
+class TransmissorStatus:
+    """
+    Distribui um snapshot inicial e, depois, os deltas de status
+    (codigo_voo + status_calculado) para todos os clientes conectados.
+    """
+
+    def __init__(self, base, cache, keepalive=15.0, limite_fila=100):
+        self.base = base
+        self.cache = cache
+        self.keepalive = keepalive
+        self.limite_fila = limite_fila
+        self._assinantes = set()
+        self._rodada = None         # RodadaStatus da última rodada
+        self._snapshot = None       # (rodada, evento serializado)
+        self._loop = None
+        self._tarefa = None
+        self._alterado = None
+        # Avisado depois do incremento da versão: ao acordar, o cache já a enxerga.
+        base.observar(self._ao_alterar, apos_versao=True)
+
+    def _ao_alterar(self, registro):
+        # Pode ser chamado de outra thread (ex.: ingestão de arquivos).
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._alterado.set)
+
+    def _iniciar(self):
+        if self._tarefa is None or self._tarefa.done():
+            self._loop = asyncio.get_running_loop()
+            self._alterado = asyncio.Event()
+            self._atualizar(self.cache.relogio())
+            self._tarefa = self._loop.create_task(self._executar())
+
+    def _atualizar(self, agora):
+        """
+        Recalcula (via cache) e retorna a lista de deltas desde a última rodada.
+        A comparação com a rodada anterior é feita em colunas (ver RodadaStatus):
+        só os voos que mudaram passam pelo Python.
+        """
+        registros, status = self.cache.todos(agora)
+        anterior = self._rodada
+        if anterior is not None and status is anterior.status:
+            return []
+        rodada = RodadaStatus(registros, status, anterior)
+        alterados = rodada.alterados(anterior)
+        self._rodada = rodada
+        return [{"codigo_voo": registros[i].codigo, "status_calculado": status[i]} for i in alterados]
+
+    def _evento_snapshot(self):
+        # O snapshot fica guardado junto com a rodada de onde saiu.
+        rodada, snapshot = self._rodada, self._snapshot
+        if snapshot is None or snapshot[0] is not rodada:
+            snapshot = (rodada, _evento("snapshot", [
+                {"codigo_voo": registro.codigo, "status_calculado": status}
+                for registro, status in zip(rodada.registros, rodada.status)
+            ]))
+            self._snapshot = snapshot
+        return snapshot[1]
+
+    def _publicar(self, evento):
+        for fila in list(self._assinantes):
+            try:
+                fila.put_nowait(evento)
+            except asyncio.QueueFull:
+                # Cliente lento demais: é desconectado e recebe um snapshot ao reconectar.
+                self._assinantes.discard(fila)
+                while not fila.empty():
+                    fila.get_nowait()
+                fila.put_nowait(None)
+
+    async def _executar(self):
+        while True:
+            espera = self.keepalive
+            valido_ate = self.cache.valido_ate
+            if valido_ate is not None:
+                espera = min(espera, max((valido_ate - self.cache.relogio()).total_seconds(), 0))
+            ocioso = False
+            try:
+                await asyncio.wait_for(self._alterado.wait(), espera)
+            except asyncio.TimeoutError:
+                ocioso = espera == self.keepalive
+            self._alterado.clear()
+
+            # O recálculo (na virada de uma fronteira, a base inteira) roda fora do
+            # loop, para não atrasar os demais clientes e as rotas assíncronas.
+            deltas = await asyncio.to_thread(self._atualizar, self.cache.relogio())
+            if deltas:
+                self._publicar(_evento("status", deltas))
+            elif ocioso:
+                # Comentário SSE para manter a conexão aberta em proxies.
+                self._publicar(b": keepalive\n\n")
+
+    async def assinar(self):
+        """
+        Gerador assíncrono de eventos SSE para um cliente.
+        """
+        self._iniciar()
+        fila = asyncio.Queue(maxsize=self.limite_fila)
+        self._assinantes.add(fila)
+        try:
+            yield self._evento_snapshot()
+            while True:
+                evento = await fila.get()
+                if evento is None:
+                    break
+                yield evento
+        finally:
+            self._assinantes.discard(fila)
@@ -5,6 +5,10 @@ document.addEventListener('DOMContentLoaded', () => {
     const resultContainer = document.getElementById('flight-result-container');
     const allFlightsContainer = document.getElementById('all-flights-list-container'); // Novo container
 
+    // Painel de um aeroporto (ex.: index.html?aeroporto=VCP): a API devolve só as
+    // partidas e chegadas dele, em vez da malha inteira para filtrar aqui.
+    const airportFilter = new URLSearchParams(window.location.search).get('aeroporto');
+
     // --- FUNÇÃO PARA BUSCAR UM VOO ESPECÍFICO (poucas mudanças) ---
     const fetchFlightStatus = async () => {
         const flightCode = flightCodeInput.value.trim().toUpperCase();
@@ -26,11 +30,36 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     };
 
+    // Voos do aeroporto do painel, página a página, até chegar ao total informado pela API.
+    const AIRPORT_PAGE_SIZE = 500;
+    const fetchAirportFlights = async () => {
+        const flights = [];
+        for (let page = 1; ; page++) {
+            const apiUrl = `http://127.0.0.1:8000/status/busca?aeroporto=${encodeURIComponent(airportFilter)}`
+                + `&pagina=${page}&por_pagina=${AIRPORT_PAGE_SIZE}`;
+            const response = await fetch(apiUrl, { cache: 'no-cache' });
+            if (!response.ok) {
+                throw new Error('Não foi possível carregar a lista de voos.');
+            }
+            const data = await response.json();
+            flights.push(...data.voos);
+            if (data.voos.length === 0 || flights.length >= data.total) {
+                return flights;
+            }
+        }
+    };
+
     // --- NOVA FUNÇÃO PARA BUSCAR TODOS OS VOOS ---
     const fetchAllFlights = async () => {
         try {
+            if (airportFilter) {
+                displayAllFlights(await fetchAirportFlights());
+                return;
+            }
             const apiUrl = 'http://127.0.0.1:8000/status/all';
-            const response = await fetch(apiUrl);
+            // 'no-cache' revalida com o ETag: se nada mudou, a API responde 304
+            // e o navegador reaproveita a lista que já está em cache.
+            const response = await fetch(apiUrl, { cache: 'no-cache' });
 
             if (!response.ok) {
                 throw new Error('Não foi possível carregar a lista de voos.');
@@ -60,7 +89,7 @@ document.addEventListener('DOMContentLoaded', () => {
             const statusSlug = status_calculado.split(' ')[0].toLowerCase();
 
             const miniCardHtml = `
-                <div class="mini-flight-card">
+                <div class="mini-flight-card" data-codigo="${info_voo.codigo_voo}">
                     <div class="info">
                         <strong>${info_voo.codigo_voo}</strong>
                         <p>${info_voo.origem} → ${info_voo.destino}</p>
@@ -120,6 +149,55 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    // --- ATUALIZAÇÃO EM TEMPO REAL (Server-Sent Events) ---
+    // Em vez de buscar a lista inteira de novo, a API envia apenas os voos
+    // cujo status mudou. Só a etiqueta de status do card é atualizada.
+    // Retorna false se o voo ainda não tem card na tela.
+    const updateMiniStatus = ({ codigo_voo, status_calculado }) => {
+        const tag = allFlightsContainer.querySelector(`[data-codigo="${codigo_voo}"] .mini-status-tag`);
+        if (!tag) {
+            return false;
+        }
+        const statusSlug = status_calculado.split(' ')[0].toLowerCase();
+        tag.className = `mini-status-tag status-${statusSlug}`;
+        tag.textContent = status_calculado.replace('Adiado - ', '');
+        return true;
+    };
+
+    // Voos novos (ex.: uma escala inteira carregada de uma vez) pedem a lista
+    // completa de novo, mas uma única vez: as faltas de um evento (e de eventos
+    // seguidos) são agrupadas e a busca só sai depois de um intervalo sem novidades.
+    const REFETCH_DEBOUNCE_MS = 1000;
+    let refetchTimer = null;
+
+    const scheduleRefetch = () => {
+        clearTimeout(refetchTimer);
+        refetchTimer = setTimeout(() => {
+            refetchTimer = null;
+            fetchAllFlights();
+        }, REFETCH_DEBOUNCE_MS);
+    };
+
+    const applyStatusEvent = (event) => {
+        let missing = 0;
+        JSON.parse(event.data).forEach((delta) => {
+            if (!updateMiniStatus(delta)) {
+                missing += 1;
+            }
+        });
+        // No painel de um aeroporto, um voo sem card provavelmente é de outro aeroporto.
+        if (missing > 0 && !airportFilter) {
+            scheduleRefetch();
+        }
+    };
+
+    const subscribeToStatusStream = () => {
+        const source = new EventSource('http://127.0.0.1:8000/status/stream');
+        source.addEventListener('snapshot', applyStatusEvent);
+        source.addEventListener('status', applyStatusEvent);
+        // O EventSource reconecta sozinho em caso de queda.
+    };
+
     // --- RODA A FUNÇÃO PARA CARREGAR TODOS OS VOOS QUANDO A PÁGINA ABRIR ---
-    fetchAllFlights();
+    fetchAllFlights().then(subscribeToStatusStream);
 });
\ No newline at end of file
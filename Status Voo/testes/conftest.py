@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Os módulos da API se importam como vizinhos (sem pacote): basta pôr API/ no caminho.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "API"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Compartilhado"))
+# Gerador de dados sintéticos (Ferramentas/gerar_dados.py), usado como fonte de voos.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Ferramentas"))
@@ -0,0 +1,20 @@
+from collections import defaultdict
+
+from base_voos import codigo_aeroporto, compilar_voo
+from gerar_dados import gerar_voos
+
+
+def test_duracao_gerada_igual_nos_dois_sentidos():
+    # A chegada sai no relógio do destino: a API compila a mesma duração de ida e de volta.
+    duracoes = defaultdict(set)
+    for voo in gerar_voos(5000):
+        registro = compilar_voo(voo)
+        rota = (codigo_aeroporto(voo["origem"]), codigo_aeroporto(voo["destino"]))
+        duracoes[rota].add(registro.chegada - registro.partida)
+
+    for (origem, destino), ida in duracoes.items():
+        assert len(ida) == 1, (origem, destino, ida)
+        volta = duracoes.get((destino, origem))
+        if volta:
+            assert ida == volta, (origem, destino, ida, volta)
+    assert duracoes[("VCP", "ORY")] == duracoes[("ORY", "VCP")]
@@ -0,0 +1,33 @@
+from datetime import date
+
+from base_voos import BaseVoos
+from indices_voos import IndicesVoos
+
+
+def voo(codigo, origem, destino, partida, dia="18/10/2025", tipo="Nacional"):
+    return {
+        "codigo_voo": codigo, "origem": origem, "destino": destino, "voo": tipo,
+        "dia_partida": dia, "partida_programada": partida, "chegada_programada": "23:00",
+        "status": None, "nova_partida": None, "nova_chegada": None,
+    }
+
+
+def test_busca_por_aeroporto_ordena_pela_partida():
+    base = BaseVoos([
+        voo("AD1", "VCP (Campinas)", "SDU (Rio de Janeiro)", "10:00"),
+        voo("AD2", "GRU (Guarulhos)", "VCP (Campinas)", "08:00"),
+        voo("AD3", "GRU (Guarulhos)", "SDU (Rio de Janeiro)", "09:00"),
+        voo("AD4", "VCP (Campinas)", "MIA (Miami)", "07:00", dia="19/10/2025", tipo="Internacional"),
+    ])
+    indices = IndicesVoos(base)
+    assert indices.buscar(aeroporto="vcp") == ["AD2", "AD1", "AD4"]
+    assert indices.buscar(origem="VCP (Campinas)", data=date(2025, 10, 18)) == ["AD1"]
+    assert indices.buscar(tipo="internacional") == ["AD4"]
+
+
+def test_voo_editado_com_origem_igual_ao_destino_aparece_uma_vez():
+    base = BaseVoos([voo("AD1", "VCP (Campinas)", "SDU (Rio de Janeiro)", "10:00")])
+    indices = IndicesVoos(base)
+    base.inserir(voo("AD1", "VCP (Campinas)", "VCP (Campinas)", "10:00"))
+    assert indices.buscar(aeroporto="VCP") == ["AD1"]
+    assert indices.buscar(destino="SDU") == []
@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+
+import pytest
+
+import ingestao_voos
+from base_voos import BaseVoos
+from ingestao_voos import MonitorArquivosVoos, ingerir_arquivo, ler_voos_json
+
+VOO = {
+    "codigo_voo": "AD4070", "origem": "VCP (Campinas)", "destino": "SDU (Rio de Janeiro)",
+    "voo": "Nacional", "dia_partida": "21/10/2025", "partida_programada": "09:00", "chegada_programada": "10:05",
+    "status": None, "nova_partida": None, "nova_chegada": None,
+}
+
+
+def _voos(quantidade):
+    # Tamanhos variados: os cortes de bloco caem em pontos diferentes de cada objeto.
+    return [{**VOO, "codigo_voo": f"AD{10000 + numero}", "origem": "VCP (Campinas)" + " " * (numero % 97)}
+            for numero in range(quantidade)]
+
+
+def _gravar(caminho, texto):
+    caminho.write_text(texto, encoding="utf-8")
+    # Assinatura sempre diferente (mtime_ns), mesmo em gravações seguidas.
+    estado = os.stat(caminho)
+    os.utime(caminho, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.parametrize("formato", ["lista", "linhas"])
+def test_objetos_que_cruzam_a_fronteira_do_bloco(tmp_path, formato):
+    voos = _voos(2000)
+    caminho = tmp_path / "voos.json"
+    if formato == "lista":
+        caminho.write_text(json.dumps(voos, indent=1), encoding="utf-8")
+    else:
+        caminho.write_text("\n".join(json.dumps(voo) for voo in voos) + "\n", encoding="utf-8")
+    # Vários blocos de 64 KB: objetos cortados no meio precisam ser remontados.
+    assert caminho.stat().st_size > 4 * ingestao_voos.TAMANHO_BLOCO
+    assert list(ler_voos_json(str(caminho))) == voos
+
+
+def test_bloco_menor_que_um_objeto(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestao_voos, "TAMANHO_BLOCO", 7)
+    voos = _voos(5)
+    caminho = tmp_path / "voos.json"
+    caminho.write_text(json.dumps(voos), encoding="utf-8")
+    assert list(ler_voos_json(str(caminho))) == voos
+
+
+@pytest.mark.parametrize("texto", [
+    json.dumps([VOO])[:-20],                # arquivo truncado no meio de um objeto
+    '[{"codigo_voo": "AD1"}, {"codigo_voo": }]',
+    '{"codigo_voo": "AD1"} lixo',
+])
+def test_json_truncado_ou_malformado(tmp_path, texto):
+    caminho = tmp_path / "voos.json"
+    caminho.write_text(texto, encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(ler_voos_json(str(caminho)))
+
+
+def test_arquivo_invalido_nao_altera_a_base(tmp_path):
+    base = BaseVoos([VOO])
+    caminho = tmp_path / "voos.json"
+    caminho.write_text(json.dumps([{**VOO, "status": "Cancelado"}, {**VOO, "codigo_voo": "AD1", "dia_partida": "31/02/2025"}]),
+                       encoding="utf-8")
+    versao = base.versao
+    with pytest.raises(ValueError):
+        ingerir_arquivo(base, str(caminho))
+    assert base.versao == versao
+    assert base.obter("AD4070").status_fixo is None
+
+
+def test_codigo_em_minusculas_e_normalizado(tmp_path):
+    base = BaseVoos([VOO])
+    caminho = tmp_path / "voos.json"
+    caminho.write_text(json.dumps([{**VOO, "codigo_voo": " ad4070", "status": "Cancelado"}]), encoding="utf-8")
+    assert ingerir_arquivo(base, str(caminho)) == 1
+    registro = base.obter("AD4070")
+    # Mesmo código no índice e na resposta (o painel casa os deltas do SSE por ele).
+    assert registro.codigo == registro.dados["codigo_voo"] == "AD4070"
+    assert len(base) == 1
+    # Reaplicar o mesmo arquivo não conta o voo como alterado.
+    assert ingerir_arquivo(base, str(caminho)) == 0
+
+
+def test_monitor_reaplica_e_registra_erros(tmp_path, caplog):
+    base = BaseVoos([VOO])
+    caminho = tmp_path / "escala.csv"
+    cabecalho = ",".join(VOO) + "\n"
+
+    def linha(**campos):
+        return ",".join("" if valor is None else str(valor) for valor in {**VOO, **campos}.values()) + "\n"
+
+    _gravar(caminho, cabecalho + linha(status="Adiado", nova_partida="10:00", nova_chegada="11:05"))
+    monitor = MonitorArquivosVoos(base, [str(caminho), str(tmp_path / "ausente.json")], intervalo=0.05)
+    assert base.obter("AD4070").adiado
+    assert monitor.erros == {}
+    # Sem mudança no arquivo, nada é relido.
+    assert monitor.verificar() == 0
+
+    with caplog.at_level(logging.WARNING, logger="ingestao_voos"):
+        _gravar(caminho, cabecalho + linha(dia_partida="xx/10/2025"))
+        assert monitor.verificar() == 0
+    assert str(caminho) in monitor.erros
+    assert str(caminho) in caplog.text
+    assert base.obter("AD4070").adiado
+
+    _gravar(caminho, cabecalho + linha(status="Cancelado"))
+    monitor.iniciar()
+    try:
+        for _ in range(100):
+            if base.obter("AD4070").status_fixo == "Cancelado":
+                break
+            monitor._parar.wait(0.05)
+    finally:
+        monitor.fechar()
+    assert base.obter("AD4070").status_fixo == "Cancelado"
+    assert monitor.erros == {}
@@ -0,0 +1,77 @@
+import random
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi.testclient import TestClient
+
+import API_Status_Voo as api
+import resposta_status
+from base_voos import BaseVoos
+from cache_status import CacheStatus
+from motor_status import MotorStatus
+from resposta_status import RespostaStatusTodos, serializar_status
+
+SAO_PAULO = ZoneInfo("America/Sao_Paulo")
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    estado = {"agora": datetime(2025, 10, 18, 23, 0, tzinfo=SAO_PAULO)}
+    monkeypatch.setattr(api.cache_status, "relogio", lambda: estado["agora"])
+    return estado
+
+
+def test_etag_e_304_entre_epocas(relogio):
+    cliente = TestClient(api.app)
+    resposta = cliente.get("/status/all")
+    assert resposta.status_code == 200
+    etag = resposta.headers["etag"]
+    for if_none_match in (etag, "W/" + etag, f'"outro", {etag}', "*"):
+        assert cliente.get("/status/all", headers={"If-None-Match": if_none_match}).status_code == 304
+    assert cliente.get("/status/all", headers={"If-None-Match": '"outro"'}).status_code == 200
+
+    # Nova época (AD4400 começa a embarcar): outro conteúdo, outro ETag.
+    relogio["agora"] = datetime(2025, 10, 18, 23, 20, tzinfo=SAO_PAULO)
+    resposta = cliente.get("/status/all", headers={"If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert resposta.headers["etag"] != etag
+    status = {v["info_voo"]["codigo_voo"]: v["status_calculado"] for v in resposta.json()}
+    assert status["AD4400"] == "Embarcando"
+
+    # Nova versão da base com o mesmo conteúdo: o ETag se mantém.
+    etag = resposta.headers["etag"]
+    api.base_voos.inserir(dict(api.base_voos.obter("AD4070").dados))
+    assert cliente.get("/status/all", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_corpo_remendado_igual_ao_serializado_do_zero(monkeypatch):
+    # Blocos pequenos: as mudanças caem em blocos diferentes, inclusive no último (incompleto).
+    monkeypatch.setattr(resposta_status, "ITENS_POR_BLOCO", 7)
+    sorteio = random.Random(3)
+
+    def voo(numero, **campos):
+        return {
+            "codigo_voo": f"AD{20000 + numero}", "origem": "GRU (Guarulhos)", "destino": "LIS (Lisboa)",
+            "voo": "Internacional", "dia_partida": "18/10/2025",
+            "partida_programada": f"{sorteio.randrange(24):02d}:{sorteio.randrange(60):02d}",
+            "chegada_programada": f"{sorteio.randrange(24):02d}:{sorteio.randrange(60):02d}",
+            "status": None, "nova_partida": None, "nova_chegada": None, **campos,
+        }
+
+    base = BaseVoos([voo(numero) for numero in range(60)])
+    relogio = {"agora": datetime(2025, 10, 18, 6, 0, tzinfo=timezone.utc)}
+    cache = CacheStatus(base, MotorStatus(base), relogio=lambda: relogio["agora"])
+    resposta = RespostaStatusTodos(cache)
+
+    for rodada in range(40):
+        relogio["agora"] += timedelta(minutes=sorteio.randrange(5, 90))
+        if rodada % 4 == 1:
+            base.inserir(voo(sorteio.randrange(60), status="Cancelado"))
+        if rodada % 5 == 2:
+            base.inserir(voo(100 + rodada))
+        corpo, etag = resposta.obter(relogio["agora"])
+        registros, status = cache.todos(relogio["agora"])
+        assert corpo == serializar_status(registros, status)
+        # O ETag só depende do conteúdo: uma montagem do zero chega ao mesmo valor.
+        assert RespostaStatusTodos(cache).obter(relogio["agora"]) == (corpo, etag)
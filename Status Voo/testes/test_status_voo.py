@@ -0,0 +1,150 @@
+import random
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi.testclient import TestClient
+
+import API_Status_Voo as api
+from base_voos import BaseVoos, calcular_status, compilar_voo, proxima_mudanca
+from cache_status import CacheStatus
+from motor_status import MotorStatus
+
+SAO_PAULO = ZoneInfo("America/Sao_Paulo")
+
+
+def sp(dia, mes, hora, minuto, segundo=0):
+    return datetime(2025, mes, dia, hora, minuto, segundo, tzinfo=SAO_PAULO)
+
+
+def utc(dia, mes, hora, minuto, segundo=0):
+    return datetime(2025, mes, dia, hora, minuto, segundo, tzinfo=timezone.utc)
+
+
+def voo(codigo, origem, destino, dia, partida, chegada, status=None, nova_partida=None, nova_chegada=None):
+    return {
+        "codigo_voo": codigo, "origem": origem, "destino": destino, "voo": "Internacional",
+        "dia_partida": dia, "partida_programada": partida, "chegada_programada": chegada,
+        "status": status, "nova_partida": nova_partida, "nova_chegada": nova_chegada,
+    }
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    # Relógio fixo da API, ajustado pelo teste: relogio["agora"] = ...
+    estado = {"agora": sp(18, 10, 12, 0)}
+    monkeypatch.setattr(api.cache_status, "relogio", lambda: estado["agora"])
+    return estado
+
+
+def status_na_api(cliente, codigo):
+    return cliente.get(f"/status/{codigo}").json()["status_calculado"]
+
+
+def status_na_lista(cliente, codigo):
+    return {v["info_voo"]["codigo_voo"]: v["status_calculado"] for v in cliente.get("/status/all").json()}[codigo]
+
+
+# --- Voo noturno: AD4400 CNF 18/10 23:50 -> BSB 01:00 (do dia 19) ---
+
+@pytest.mark.parametrize("agora, esperado", [
+    (sp(18, 10, 23, 19, 59), "Programado"),
+    (sp(18, 10, 23, 20), "Embarcando"),
+    (sp(18, 10, 23, 50), "Decolado"),
+    (sp(19, 10, 0, 29, 59), "Decolado"),
+    (sp(19, 10, 0, 30), "Aterrissando"),
+    (sp(19, 10, 1, 29, 59), "Aterrissando"),
+    (sp(19, 10, 1, 30), "Aterrissado"),
+])
+def test_voo_noturno_ad4400(relogio, agora, esperado):
+    relogio["agora"] = agora
+    cliente = TestClient(api.app)
+    assert status_na_api(cliente, "AD4400") == esperado
+    assert status_na_lista(cliente, "AD4400") == esperado
+
+
+# --- Fusos diferentes na origem e no destino ---
+
+def test_gru_lisboa_chega_no_horario_local_de_lisboa():
+    # GRU 21:00 (UTC-3) -> LIS 11:00 do dia seguinte (UTC+1, horário de verão).
+    registro = compilar_voo(voo("AD9001", "GRU (Guarulhos)", "LIS (Lisboa)", "17/10/2025", "21:00", "11:00"))
+    assert registro.partida == utc(18, 10, 0, 0)
+    assert registro.chegada == utc(18, 10, 10, 0)
+    assert calcular_status(registro, utc(18, 10, 9, 29)) == "Decolado"
+    assert calcular_status(registro, utc(18, 10, 9, 30)) == "Aterrissando"
+    assert calcular_status(registro, utc(18, 10, 10, 30)) == "Aterrissado"
+
+
+def test_ssa_lisboa_atravessa_o_fim_do_horario_de_verao():
+    # AD8705: SSA 25/10 23:59 (UTC-3) -> LIS 10:00 de 26/10, já no horário de inverno (UTC+0).
+    registro = api.base_voos.obter("AD8705")
+    assert registro.partida == utc(26, 10, 2, 59)
+    assert registro.chegada == utc(26, 10, 10, 0)
+    assert calcular_status(registro, utc(26, 10, 2, 29)) == "Embarcando"
+    assert calcular_status(registro, utc(26, 10, 9, 29)) == "Decolado"
+    assert calcular_status(registro, utc(26, 10, 9, 30)) == "Aterrissando"
+    assert calcular_status(registro, utc(26, 10, 10, 30)) == "Aterrissado"
+
+
+def test_adiado_para_o_dia_seguinte():
+    # AD2523: programado 17/10 23:00, adiado para 08:00 -> 08:00 de 18/10.
+    registro = api.base_voos.obter("AD2523")
+    assert registro.partida == sp(18, 10, 8, 0)
+    assert calcular_status(registro, sp(18, 10, 7, 0)) == "Adiado - Programado"
+    assert calcular_status(registro, sp(18, 10, 7, 30)) == "Adiado - Embarcando"
+
+
+# --- Relógio que volta no tempo ---
+
+def test_relogio_que_volta_nao_serve_status_do_futuro(relogio):
+    cliente = TestClient(api.app)
+    relogio["agora"] = sp(19, 10, 0, 30)
+    assert status_na_lista(cliente, "AD4400") == "Aterrissando"
+    assert status_na_api(cliente, "AD5001") == "Adiado - Aterrissado"
+
+    relogio["agora"] = sp(18, 10, 22, 50)
+    for codigo in ("AD4400", "AD5001"):
+        esperado = api.det_status(api.base_voos.obter(codigo), relogio["agora"])
+        assert status_na_lista(cliente, codigo) == esperado
+        assert status_na_api(cliente, codigo) == esperado
+    assert status_na_lista(cliente, "AD4400") == "Programado"
+    assert status_na_api(cliente, "AD5001") == "Adiado - Decolado"
+
+
+# --- Paridade entre o cálculo escalar, o motor vetorizado e o cache ---
+
+def test_paridade_escalar_vetorizado_e_cache():
+    sorteio = random.Random(7)
+    aeroportos = ["VCP (Campinas)", "GRU (Guarulhos)", "SSA (Salvador)", "MAO (Manaus)",
+                  "MIA (Miami)", "LIS (Lisboa)", "ORY (Paris)", "PTY (Panamá)"]
+    voos = list(api.voos)
+    for numero in range(2000):
+        origem, destino = sorteio.sample(aeroportos, 2)
+        hora = lambda: f"{sorteio.randrange(24):02d}:{sorteio.randrange(60):02d}"
+        situacao = sorteio.random()
+        voos.append(voo(
+            f"AD{50000 + numero}", origem, destino, f"{sorteio.randint(17, 28)}/10/2025", hora(), hora(),
+            status="Cancelado" if situacao < 0.05 else "Adiado" if situacao < 0.2 else None,
+            nova_partida=hora() if 0.05 <= situacao < 0.2 else None,
+            nova_chegada=hora() if 0.05 <= situacao < 0.2 else None,
+        ))
+    base = BaseVoos(voos)
+    motor = MotorStatus(base)
+    cache = CacheStatus(base, motor)
+
+    inicio = utc(16, 10, 0, 0)
+    instantes = [inicio + timedelta(seconds=sorteio.randrange(15 * 86400)) for _ in range(200)]
+    # Inclui os próprios limites (onde um erro de < contra <= apareceria).
+    instantes += [datetime.fromtimestamp(r.limites[i], timezone.utc) for r in list(base)[:50] for i in range(4)]
+    # Ordem aleatória: o cache também precisa acertar quando o relógio volta.
+    sorteio.shuffle(instantes)
+
+    for agora in instantes:
+        registros, status = motor.calcular(agora)
+        escalar = [calcular_status(r, agora) for r in registros]
+        assert status == escalar
+        assert cache.todos(agora)[1] == escalar
+        for registro in registros[:100]:
+            assert cache.status(registro, agora) == calcular_status(registro, agora)
+        proximas = [m for m in (proxima_mudanca(r, agora) for r in registros) if m is not None]
+        assert motor.proxima_mudanca(motor.colunas(), agora) == (min(proximas) if proximas else None)
@@ -0,0 +1,73 @@
+import asyncio
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+from base_voos import BaseVoos, calcular_status
+from cache_status import CacheStatus
+from motor_status import MotorStatus
+from transmissao_status import TransmissorStatus
+
+AGORA = datetime(2025, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+VOO = {
+    "codigo_voo": "AD4070", "origem": "VCP (Campinas)", "destino": "SDU (Rio de Janeiro)",
+    "voo": "Nacional", "dia_partida": "21/10/2025", "partida_programada": "09:00", "chegada_programada": "10:05",
+    "status": None, "nova_partida": None, "nova_chegada": None,
+}
+
+
+def test_edicao_em_outra_thread_gera_delta_imediato():
+    base = BaseVoos([VOO])
+    cache = CacheStatus(base, MotorStatus(base), relogio=lambda: AGORA)
+    # Keepalive longo: se o delta só chegasse no keepalive, o teste estouraria o prazo.
+    transmissor = TransmissorStatus(base, cache, keepalive=30.0)
+
+    async def executar():
+        eventos = transmissor.assinar()
+        assert (await eventos.__anext__()).startswith(b"event: snapshot")
+        for rodada in range(12):
+            status = "Cancelado" if rodada % 2 == 0 else None
+            escritor = threading.Thread(target=base.inserir, args=({**VOO, "status": status},))
+            escritor.start()
+            evento = await asyncio.wait_for(eventos.__anext__(), 2.0)
+            escritor.join()
+            assert evento.startswith(b"event: status")
+            assert (b"Cancelado" if status else b"Programado") in evento
+        await eventos.aclose()
+
+    asyncio.run(executar())
+
+
+def test_deltas_sao_os_voos_alterados():
+    sorteio = random.Random(11)
+    voos = [
+        {**VOO, "codigo_voo": f"AD{1000 + numero}", "dia_partida": "18/10/2025",
+         "partida_programada": f"{sorteio.randrange(8, 20):02d}:{sorteio.randrange(60):02d}",
+         "chegada_programada": f"{sorteio.randrange(0, 24):02d}:{sorteio.randrange(60):02d}"}
+        for numero in range(300)
+    ]
+    base = BaseVoos(voos)
+    relogio = {"agora": AGORA}
+    cache = CacheStatus(base, MotorStatus(base), relogio=lambda: relogio["agora"])
+    transmissor = TransmissorStatus(base, cache)
+    assert len(transmissor._atualizar(AGORA)) == len(voos)
+
+    anteriores = {registro.codigo: calcular_status(registro, AGORA) for registro in base}
+    for minuto in range(1, 240, 7):
+        relogio["agora"] = agora = AGORA + timedelta(minutes=minuto)
+        editados = set()
+        if minuto % 3 == 0:
+            # Um cancelamento e um voo novo (que entra no fim da lista).
+            cancelado = sorteio.choice(voos)
+            base.inserir({**cancelado, "status": "Cancelado"})
+            novo = {**VOO, "codigo_voo": f"AD{5000 + minuto}", "dia_partida": "18/10/2025"}
+            base.inserir(novo)
+            editados |= {cancelado["codigo_voo"], novo["codigo_voo"]}
+
+        atuais = {registro.codigo: calcular_status(registro, agora) for registro in base}
+        esperados = {codigo for codigo, status in atuais.items() if anteriores.get(codigo) != status} | editados
+        deltas = transmissor._atualizar(agora)
+        assert {delta["codigo_voo"] for delta in deltas} == esperados
+        assert all(delta["status_calculado"] == atuais[delta["codigo_voo"]] for delta in deltas)
+        anteriores = atuais